@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, Enum, Float, ForeignKey, JSON, func
+from sqlalchemy import Column, Integer, BigInteger, String, Date, Boolean, DateTime, Enum, Float, ForeignKey, JSON, Index, func
 from database.database import Base
 from sqlalchemy.orm import relationship
 import enum
@@ -89,6 +89,19 @@ class Image(Base):
     status = Column(Enum("pending", "completed", name="statusenum"), nullable=False, default="pending")
     width = Column(Integer, nullable=False)
     height = Column(Integer, nullable=False)
+
+    # 검수 요약 (어노테이션 쓰기 시 같은 트랜잭션에서 갱신, domain/annotation/annotation_review.py)
+    active_annotation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    min_conf_score = Column(Float, nullable=True)  # 활성 어노테이션의 최저 conf_score
+    needs_review = Column(Boolean, nullable=False, default=False, server_default="0")  # 작업자 검수 대상 여부
+    review_boxes = Column(JSON, nullable=True)  # 화면 렌더링용 활성 박스 목록 (class_name, class_color 포함)
+    review_priority = Column(Integer, nullable=False, default=0, server_default="0")  # 검수 우선순위 (×1000 정수, 클수록 먼저)
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")  # 마지막 변경 시퀀스 (메인 화면 변경분 동기화용)
+    annotation_version = Column(Integer, nullable=False, default=0, server_default="0")  # 어노테이션이 바뀔 때마다 +1 (저장 충돌 감지)
+
+    # 작업 큐 리스 (domain/annotation/annotation_queue.py), 만료 시각이 지나면 다른 작업자가 가져갈 수 있음
+    lease_user_id = Column(Integer, ForeignKey("Users.user_id", ondelete="SET NULL"), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
     
     annotations = relationship(
     "Annotation",
@@ -98,6 +111,21 @@ class Image(Base):
 )
     camera = relationship("Camera", back_populates="images")
 
+    # 조회 패턴 기준 인덱스
+    __table_args__ = (
+        Index("ix_images_date", "date"),  # 실시간 탐지 이력: ORDER BY date DESC LIMIT n
+        Index("ix_images_status_date", "status", "date"),  # 결함 데이터 목록: status='completed' + 기간 + 최신순
+        Index("ix_images_camera_date", "camera_id", "date"),  # 메인 화면/카메라 필터: 할당 카메라 + 최신순
+        Index("ix_images_camera_review_date", "camera_id", "needs_review", "date"),  # 작업자 메인/관리자 할당 현황: 검수 대상만 범위 조회
+        Index("ix_images_camera_change_seq", "camera_id", "change_seq"),  # 메인 화면 변경분 동기화: 카메라별 cursor 이후 변경
+        # 작업 큐: 카메라별 검수 대기 + 리스 없음/만료 + 정렬 순 (유효한 리스가 걸린 행은 범위 밖)
+        Index("ix_images_lease_queue_confidence", "camera_id", "needs_review", "status", "lease_expires_at", "min_conf_score"),  # confidence 낮은 순
+        Index("ix_images_lease_queue_date", "camera_id", "needs_review", "status", "lease_expires_at", "date"),  # 오래된 순
+        Index("ix_images_lease_queue_priority", "camera_id", "needs_review", "status", "lease_expires_at", "review_priority"),  # 우선순위 높은 순
+        Index("ix_images_lease_user", "lease_user_id", "lease_expires_at"),  # 작업 큐: 본인의 유효한 리스
+        Index("ix_images_camera_review_priority", "camera_id", "needs_review", "review_priority"),  # 메인 화면 우선순위 정렬: top-K 역순 조회
+    )
+
 
 # 어노테이션 테이블 (defect_type 제거 → class_id로 대체)
 class Annotation(Base):
@@ -116,6 +144,13 @@ class Annotation(Base):
     defect_class = relationship("DefectClass", back_populates="annotations")
     user = relationship("User", backref="annotations")
 
+    # 조회 패턴 기준 인덱스 (커버링: 조인 후 테이블 행을 읽지 않도록 집계 컬럼 포함)
+    __table_args__ = (
+        Index("ix_annotations_image_active", "image_id", "is_active", "class_id", "conf_score"),  # 이미지별 활성 주석 집계
+        Index("ix_annotations_class_active", "class_id", "is_active", "image_id"),  # 결함 유형 필터
+        Index("ix_annotations_date_user", "date", "user_id", "image_id"),  # 작업자 현황: 작업 기간 필터
+    )
+
 
 # 결함 클래스 테이블
 class DefectClass(Base):
@@ -127,6 +162,7 @@ class DefectClass(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     is_active = Column(Boolean, nullable=False, default=True)
+    review_weight = Column(Float, nullable=False, default=1.0, server_default="1")  # 검수 우선순위 가중치 (희귀/치명 결함은 1보다 크게)
 
     annotations = relationship("Annotation", back_populates="defect_class")
 
@@ -138,6 +174,7 @@ class Camera(Base):
     camera_id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
     line_name = Column(String(50), nullable=False)
     is_active = Column(Boolean, nullable=False, default=True)
+    review_weight = Column(Float, nullable=False, default=1.0, server_default="1")  # 라인 중요도 (검수 우선순위에 곱함)
 
     images = relationship("Image", back_populates="camera")  # 🔹 Image와 연결
 
@@ -148,4 +185,43 @@ class Camera(Base):
     )
 
 
+# 일별 결함 집계 테이블 (completed 이미지의 활성 어노테이션 수, 쓰기 시점에 트랜잭션 내에서 갱신)
+class DefectDailyRollup(Base):
+    __tablename__ = "DefectDailyRollups"
+
+    day = Column(Date, primary_key=True)  # Images.date 기준 날짜
+    camera_id = Column(Integer, ForeignKey("Cameras.camera_id", ondelete="CASCADE"), primary_key=True)
+    class_id = Column(Integer, ForeignKey("DefectClasses.class_id", ondelete="CASCADE"), primary_key=True)
+    defect_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# 시간별 결함 집계 테이블 (시간 단위 통계용, 일별 집계와 같은 트랜잭션에서 갱신)
+class DefectHourlyRollup(Base):
+    __tablename__ = "DefectHourlyRollups"
 
+    hour = Column(DateTime, primary_key=True)  # Images.date를 정시로 내림한 시각
+    camera_id = Column(Integer, ForeignKey("Cameras.camera_id", ondelete="CASCADE"), primary_key=True)
+    class_id = Column(Integer, ForeignKey("DefectClasses.class_id", ondelete="CASCADE"), primary_key=True)
+    defect_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# 단조 증가 시퀀스 (이름별 1행, 쓰기 트랜잭션이 커밋 직전에 값을 할당 → 행 잠금으로 커밋 순서 = 시퀀스 순서)
+class ChangeSequence(Base):
+    __tablename__ = "ChangeSequences"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+# 삭제된 이미지 기록 (메인 화면 변경분 동기화에서 "removed"로 전달)
+class ImageTombstone(Base):
+    __tablename__ = "ImageTombstones"
+
+    image_id = Column(Integer, primary_key=True, autoincrement=False)
+    camera_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_image_tombstones_camera_change_seq", "camera_id", "change_seq"),
+    )
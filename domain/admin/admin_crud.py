@@ -4,9 +4,20 @@ from domain.admin.admin_schema import (
     TaskAssignmentStats, AnnotatorStats, UnassignedCameraStats, 
     UserCameraStats, CameraImageStats, CameraAssignment
 )
-from database.models import Camera, Image, User, annotator_camera_association, Annotation
+from database.models import Camera, Image, User, annotator_camera_association
 from fastapi import HTTPException
 from typing import Dict, List, Any
+from utils.response_cache import invalidate_after_commit, TAG_ASSIGNMENTS
+
+# 관리자 화면 기준 검수 대상 이미지: 활성 annotation이 있고 최저 conf_score < 0.75 (또는 null)
+# Images의 검수 요약 컬럼으로 판정 → (camera_id, needs_review, date) 인덱스 범위 조회, 집계 없음
+def _review_images_subquery(db: Session):
+    return (
+        db.query(Image.image_id, Image.camera_id, Image.min_conf_score.label("min_confidence"))
+        .filter(Image.needs_review == True, Image.active_annotation_count > 0)
+        .subquery()
+    )
+
 
 class AdminService:
     def __init__(self, db: Session):
@@ -14,23 +25,7 @@ class AdminService:
 
     def get_task_assignment_stats(self) -> TaskAssignmentStats:
         # 필터링된 이미지 서브쿼리: annotation이 있고 최저 conf_score < 0.75인 이미지만
-        filtered_images_subquery = (
-            self.db.query(
-                Image.image_id,
-                Image.camera_id,
-                func.min(Annotation.conf_score).label("min_confidence")
-            )
-            .join(Annotation, Image.image_id == Annotation.image_id)
-            .filter(Annotation.is_active == True)  # 활성 annotation만
-            .group_by(Image.image_id, Image.camera_id)
-            .having(
-                or_(
-                    func.min(Annotation.conf_score) < 0.75,
-                    func.min(Annotation.conf_score).is_(None)  # conf_score가 null인 경우도 포함
-                )
-            )
-            .subquery()
-        )
+        filtered_images_subquery = _review_images_subquery(self.db)
 
         # 1. 카메라 통계
         total_cameras = self.db.query(func.count(Camera.camera_id)).scalar()
@@ -96,23 +91,7 @@ class AdminService:
             return None
 
         # 필터링된 이미지 서브쿼리: annotation이 있고 최저 conf_score < 0.75인 이미지만
-        filtered_images_subquery = (
-            self.db.query(
-                Image.image_id,
-                Image.camera_id,
-                func.min(Annotation.conf_score).label("min_confidence")
-            )
-            .join(Annotation, Image.image_id == Annotation.image_id)
-            .filter(Annotation.is_active == True)  # 활성 annotation만
-            .group_by(Image.image_id, Image.camera_id)
-            .having(
-                or_(
-                    func.min(Annotation.conf_score) < 0.75,
-                    func.min(Annotation.conf_score).is_(None)  # conf_score가 null인 경우도 포함
-                )
-            )
-            .subquery()
-        )
+        filtered_images_subquery = _review_images_subquery(self.db)
 
         # 사용자에게 할당된 카메라와 각 카메라의 필터링된 이미지 개수 조회
         camera_stats = self.db.query(
@@ -186,6 +165,7 @@ class AdminService:
             )
             
         # 7. 변경사항 저장
+        invalidate_after_commit(self.db, TAG_ASSIGNMENTS)
         self.db.commit()
         
         # 8. 업데이트된 카메라 할당 정보 조회
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from domain.admin.admin_crud import AdminService
 from domain.admin.admin_schema import TaskAssignmentStats, UserCameraStats, CameraAssignment
 from database.database import get_db
+from utils.response_cache import cached_endpoint, response_cache, TAG_DEFECTS, TAG_ASSIGNMENTS
 
 router = APIRouter(
     prefix="/admin",
@@ -10,6 +11,7 @@ router = APIRouter(
 )
 
 @router.get("/main", response_model=TaskAssignmentStats)
+@cached_endpoint("admin.main", tags=(TAG_DEFECTS, TAG_ASSIGNMENTS), response_model=TaskAssignmentStats)
 def get_task_assignment_stats(db: Session = Depends(get_db)):
     admin_service = AdminService(db)
     return admin_service.get_task_assignment_stats()
@@ -33,4 +35,9 @@ def assign_cameras(
     except HTTPException as e:
         raise e
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 응답 캐시 상태 (엔드포인트별 적중률)
+@router.get("/cache-stats")
+def get_response_cache_stats():
+    return response_cache.stats()
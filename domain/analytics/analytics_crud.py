@@ -0,0 +1,124 @@
+import os
+import threading
+from datetime import date, timedelta
+from typing import List, Optional
+from fastapi import HTTPException
+from domain.analytics.analytics_snapshot import read_snapshot_meta, resolve_snapshot
+
+
+# 컬럼형 스냅샷(Parquet)을 DuckDB로 조회하는 장기 구간 통계
+# - duckdb 미설치 또는 스냅샷 미생성 시 503
+# - 요청마다 스냅샷 버전을 한 번 정해 그 버전의 파일만 읽음 (조회 중 스냅샷이 교체되어도 영향 없음)
+
+GRANULARITIES = ("day", "week", "month", "quarter", "year")
+GROUP_COLUMNS = {"line": "line_name", "camera": "camera_id"}
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def duckdb_available() -> bool:
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# 이번 요청이 읽을 스냅샷 (디렉터리, 메타데이터)
+def _snapshot():
+    if not duckdb_available():
+        raise HTTPException(status_code=503, detail="분석 엔진(duckdb)이 설치되어 있지 않습니다.")
+    snapshot = resolve_snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="분석 스냅샷이 없습니다. python -m scripts.build_analytics_snapshot 실행 필요")
+    return snapshot
+
+
+# 공유 인메모리 연결에서 요청마다 커서 생성 (DuckDB 커서는 스레드별로 사용)
+def _cursor():
+    global _connection
+    import duckdb
+    with _connection_lock:
+        if _connection is None:
+            _connection = duckdb.connect(database=":memory:")
+    return _connection.cursor()
+
+
+def _parquet(snapshot_dir: str, name: str) -> str:
+    return os.path.join(snapshot_dir, f"{name}.parquet").replace("'", "''")
+
+
+def _validate(start_date: date, end_date: date, granularity: Optional[str] = None, group_by: Optional[str] = None):
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date는 end_date보다 늦을 수 없습니다.")
+    if granularity is not None and granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity는 {', '.join(GRANULARITIES)} 중 하나여야 합니다.")
+    if group_by is not None and group_by not in GROUP_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"group_by는 {', '.join(GROUP_COLUMNS)} 중 하나여야 합니다.")
+
+
+def _rows(cursor, sql: str, params: list) -> List[dict]:
+    result = cursor.execute(sql, params)
+    columns = [c[0] for c in result.description]
+    return [dict(zip(columns, row)) for row in result.fetchall()]
+
+
+# 기간 단위별 불량률: (결함이 있는 completed 이미지 수) / (completed 이미지 수)
+def get_defect_rate(start_date: date, end_date: date, granularity: str = "month", group_by: Optional[str] = "line"):
+    _validate(start_date, end_date, granularity, group_by)
+    snapshot_dir, meta = _snapshot()
+    label = GROUP_COLUMNS[group_by] if group_by else "NULL"
+
+    sql = f"""
+        WITH defects AS (
+            SELECT image_id, count(*) AS defect_count
+            FROM read_parquet('{_parquet(snapshot_dir, "annotations")}')
+            WHERE captured_at >= ? AND captured_at < ?
+            GROUP BY image_id
+        )
+        SELECT
+            CAST(date_trunc('{granularity}', i.captured_at) AS DATE) AS bucket,
+            CAST({label} AS VARCHAR) AS label,
+            count(*) AS images,
+            count(d.image_id) AS defect_images,
+            coalesce(sum(d.defect_count), 0) AS defects,
+            round(count(d.image_id) / count(*), 4) AS defect_rate
+        FROM read_parquet('{_parquet(snapshot_dir, "images")}') i
+        LEFT JOIN defects d USING (image_id)
+        WHERE i.status = 'completed' AND i.captured_at >= ? AND i.captured_at < ?
+        GROUP BY ALL
+        ORDER BY bucket, label
+    """
+    start, end = start_date, end_date + timedelta(days=1)
+    return {"snapshot_built_at": meta.get("built_at", ""), "data": _rows(_cursor(), sql, [start, end, start, end])}
+
+
+# 카메라/라인별 결함 유형 구성비
+def get_class_mix(start_date: date, end_date: date, group_by: str = "camera", class_names: Optional[List[str]] = None):
+    _validate(start_date, end_date, group_by=group_by)
+    snapshot_dir, meta = _snapshot()
+    label = GROUP_COLUMNS[group_by]
+
+    params = [start_date, end_date + timedelta(days=1)]
+    class_filter = ""
+    if class_names:
+        class_filter = f"AND class_name IN ({', '.join('?' for _ in class_names)})"
+        params.extend(class_names)
+
+    sql = f"""
+        SELECT
+            CAST({label} AS VARCHAR) AS label,
+            class_name,
+            count(*) AS defects,
+            round(count(*) / sum(count(*)) OVER (PARTITION BY {label}), 4) AS share
+        FROM read_parquet('{_parquet(snapshot_dir, "annotations")}')
+        WHERE captured_at >= ? AND captured_at < ? {class_filter}
+        GROUP BY {label}, class_name
+        ORDER BY label, defects DESC
+    """
+    return {"snapshot_built_at": meta.get("built_at", ""), "data": _rows(_cursor(), sql, params)}
+
+
+def get_snapshot_info():
+    return {"available": duckdb_available(), "snapshot": read_snapshot_meta()}
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Query
+from typing import List, Optional
+from datetime import date
+from domain.analytics import analytics_crud, analytics_schema
+
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"]
+)
+
+# 장기 구간 통계는 DB가 아닌 컬럼형 스냅샷에서 조회 (스냅샷 생성 시각을 함께 반환)
+
+@router.get("/snapshot", response_model=analytics_schema.SnapshotInfoResponse)
+def get_snapshot_info():
+    return analytics_crud.get_snapshot_info()
+
+@router.get("/defect-rate", response_model=analytics_schema.DefectRateResponse)
+def get_defect_rate(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    granularity: str = Query("month", enum=list(analytics_crud.GRANULARITIES)),
+    group_by: Optional[str] = Query("line", enum=list(analytics_crud.GROUP_COLUMNS))
+):
+    return analytics_crud.get_defect_rate(start_date, end_date, granularity, group_by)
+
+@router.get("/class-mix", response_model=analytics_schema.ClassMixResponse)
+def get_class_mix(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    group_by: str = Query("camera", enum=list(analytics_crud.GROUP_COLUMNS)),
+    class_name: Optional[List[str]] = Query(default=None)
+):
+    return analytics_crud.get_class_mix(start_date, end_date, group_by, class_name)
@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+
+class SnapshotMeta(BaseModel):
+    built_at: str
+    images: int
+    annotations: int
+    build_seconds: float
+
+class SnapshotInfoResponse(BaseModel):
+    available: bool  # duckdb 설치 여부
+    snapshot: Optional[SnapshotMeta] = None
+
+
+# 기간 단위별 불량률
+class DefectRateItem(BaseModel):
+    bucket: date  # 기간 시작일
+    label: Optional[str] = None  # line_name / camera_id (group_by 없으면 null)
+    images: int
+    defect_images: int
+    defects: int
+    defect_rate: float
+
+class DefectRateResponse(BaseModel):
+    snapshot_built_at: str
+    data: List[DefectRateItem]
+
+
+# 결함 유형 구성비
+class ClassMixItem(BaseModel):
+    label: str  # line_name / camera_id
+    class_name: str
+    defects: int
+    share: float
+
+class ClassMixResponse(BaseModel):
+    snapshot_built_at: str
+    data: List[ClassMixItem]
@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from os import getenv
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database.models import Annotation, Camera, DefectClass, Image
+
+
+# 분석용 컬럼형 스냅샷 (Parquet)
+# - MySQL에서 서버 측 커서로 청크 단위로 읽어 images.parquet / annotations.parquet 생성
+# - 생성할 때마다 버전 디렉터리(ANALYTICS_DIR/<버전>)에 새로 만들고, 완성되면 current 포인터 파일을 원자적으로 교체
+#   → 조회 요청은 요청 시작 시 resolve_snapshot으로 경로를 한 번 정해 끝까지 같은 버전을 읽음 (교체 중 빈 구간 없음)
+# - 이전 버전은 SNAPSHOT_KEEP_VERSIONS개까지 남겨 두어 교체 직전에 시작한 조회도 끝까지 읽을 수 있음
+# - 장기 구간 통계는 이 스냅샷을 DuckDB로 조회 (OLTP DB는 수집/검수 작업에만 사용)
+
+ANALYTICS_DIR = getenv("ANALYTICS_DIR", "data/analytics")
+SNAPSHOT_CHUNK_SIZE = int(getenv("ANALYTICS_SNAPSHOT_CHUNK_SIZE", "50000"))
+SNAPSHOT_KEEP_VERSIONS = int(getenv("ANALYTICS_SNAPSHOT_KEEP_VERSIONS", "3"))
+SNAPSHOT_META_FILE = "snapshot.json"
+SNAPSHOT_POINTER_FILE = "current"
+SNAPSHOT_VERSION_PREFIX = "v"
+
+
+def _images_statement():
+    return (
+        select(Image.image_id, Image.date, Image.camera_id, Camera.line_name, Image.status)
+        .join(Camera, Camera.camera_id == Image.camera_id)
+        .order_by(Image.date, Image.image_id)  # 날짜순 정렬 → row group min/max로 기간 조회 시 건너뛰기 가능
+    )
+
+
+def _annotations_statement():
+    return (
+        select(
+            Annotation.annotation_id, Annotation.image_id, Image.date, Image.camera_id, Camera.line_name,
+            Annotation.class_id, DefectClass.class_name, Annotation.conf_score, Annotation.user_id
+        )
+        .join(Image, Image.image_id == Annotation.image_id)
+        .join(Camera, Camera.camera_id == Image.camera_id)
+        .join(DefectClass, DefectClass.class_id == Annotation.class_id)
+        .where(Annotation.is_active == True)
+        .order_by(Image.date, Annotation.image_id, Annotation.annotation_id)
+    )
+
+
+def _write_parquet(db: Session, statement, schema, path: str, chunk_size: int) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    result = db.execute(statement, execution_options={"stream_results": True, "max_row_buffer": chunk_size})
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for partition in result.partitions(chunk_size):
+            columns = list(zip(*partition))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            rows += len(partition)
+    return rows
+
+
+# 스냅샷 전체 재생성, 메타데이터 반환
+def build_snapshot(db: Session, target_dir: str = ANALYTICS_DIR, chunk_size: int = SNAPSHOT_CHUNK_SIZE) -> dict:
+    import pyarrow as pa
+
+    started = time.perf_counter()
+    version = SNAPSHOT_VERSION_PREFIX + datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    staging_dir = os.path.join(target_dir, version)
+    os.makedirs(staging_dir)
+
+    image_schema = pa.schema([
+        ("image_id", pa.int64()), ("captured_at", pa.timestamp("s")), ("camera_id", pa.int32()),
+        ("line_name", pa.string()), ("status", pa.string()),
+    ])
+    annotation_schema = pa.schema([
+        ("annotation_id", pa.int64()), ("image_id", pa.int64()), ("captured_at", pa.timestamp("s")),
+        ("camera_id", pa.int32()), ("line_name", pa.string()), ("class_id", pa.int32()),
+        ("class_name", pa.string()), ("conf_score", pa.float32()), ("user_id", pa.int32()),
+    ])
+
+    try:
+        image_rows = _write_parquet(db, _images_statement(), image_schema, os.path.join(staging_dir, "images.parquet"), chunk_size)
+        annotation_rows = _write_parquet(db, _annotations_statement(), annotation_schema, os.path.join(staging_dir, "annotations.parquet"), chunk_size)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)  # 미완성 버전은 포인터가 가리키지 않으므로 바로 삭제
+        raise
+    finally:
+        db.rollback()  # 읽기 트랜잭션 종료
+
+    meta = {
+        "version": version,
+        "built_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "images": image_rows,
+        "annotations": annotation_rows,
+        "build_seconds": round(time.perf_counter() - started, 2),
+    }
+    with open(os.path.join(staging_dir, SNAPSHOT_META_FILE), "w") as f:
+        json.dump(meta, f)
+
+    # 완성된 버전을 가리키도록 포인터 교체 (임시 파일 작성 후 os.replace → 원자적)
+    pointer_tmp = os.path.join(target_dir, f"{SNAPSHOT_POINTER_FILE}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(target_dir, SNAPSHOT_POINTER_FILE))
+
+    _prune_versions(target_dir)
+    return meta
+
+
+# 오래된 버전 디렉터리 정리 (최근 SNAPSHOT_KEEP_VERSIONS개 유지)
+def _prune_versions(target_dir: str):
+    versions = sorted(
+        name for name in os.listdir(target_dir)
+        if name.startswith(SNAPSHOT_VERSION_PREFIX) and os.path.isdir(os.path.join(target_dir, name))
+    )
+    for name in versions[:-max(SNAPSHOT_KEEP_VERSIONS, 1)]:
+        shutil.rmtree(os.path.join(target_dir, name), ignore_errors=True)
+
+
+# 현재 스냅샷 (디렉터리 경로, 메타데이터), 없으면 None — 조회 요청마다 한 번만 호출해 같은 버전을 사용
+def resolve_snapshot(target_dir: str = ANALYTICS_DIR):
+    try:
+        with open(os.path.join(target_dir, SNAPSHOT_POINTER_FILE)) as f:
+            snapshot_dir = os.path.join(target_dir, f.read().strip())
+        with open(os.path.join(snapshot_dir, SNAPSHOT_META_FILE)) as f:
+            return snapshot_dir, json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def read_snapshot_meta(target_dir: str = ANALYTICS_DIR):
+    snapshot = resolve_snapshot(target_dir)
+    return snapshot[1] if snapshot else None
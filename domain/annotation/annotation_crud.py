@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Date, and_, or_, desc, literal, String, case
+from sqlalchemy import func, cast, Date, and_, or_, desc, literal, String, case, select, insert
 from datetime import datetime, timedelta, time
-from database.models import Annotation, DefectClass, Image, Camera, User
+from database.models import Annotation, DefectClass, Image, Camera, User, DefectDailyRollup
 from database.models import annotator_camera_association
 from collections import defaultdict
 from domain.annotation import annotation_schema
@@ -11,14 +11,31 @@ from typing import List
 from fastapi import HTTPException
 from domain.annotation.annotation_schema import (
     AnnotationCreate, AnnotationUpdate, AnnotationResponse, 
-    AnnotationBulkUpdate
+    AnnotationBulkUpdate, AnnotationPatch, AnnotationPatchResult
 )
 from domain.annotation.annotation_schema import ThumbnailAnnotationResponse, ThumbnailBoundingBox, BoundingBox
 from sqlalchemy.orm import aliased
 import os
+import json
+import base64
+import zlib
 import boto3
 from urllib.parse import urlparse
 from dotenv import load_dotenv
+from utils.s3 import get_presigned_image_url
+from utils.fast_response import RawJSON
+from domain.annotation.annotation_rollup import add_image_contributions, remove_image_contributions, defect_summary_cache
+from domain.annotation.annotation_stats import get_defect_time_series
+from utils.response_cache import invalidate_after_commit, TAG_DEFECTS
+from utils.cache import run_after_commit
+from domain.annotation.annotation_feed import defect_feed
+from domain.annotation.annotation_heatmap import heatmap_cache
+from domain.annotation.annotation_review import refresh_image_summaries
+from domain.annotation.annotation_sync import touch_images, record_tombstones, current_change_seqs, tombstone_horizons, fetch_changes
+from domain.annotation.annotation_queue import WORK_QUEUE_LEASE_SECONDS, claim_images, renew_leases, release_leases, clear_leases, fetch_claimed
+from domain.annotation.annotation_main import (
+    MainScreenQuery, MAIN_PAGE_MAX, MAIN_CHANGES_DEFAULT, MAIN_CHANGES_MAX, MAIN_SCREEN_COLUMNS, fetch_main_screen, main_screen_sort_value, count_main_screen, get_assigned_camera_ids
+)
 
 
 # .env 로딩
@@ -29,6 +46,7 @@ AWS_REGION = os.getenv("AWS_REGION")
 S3_BUCKET = os.getenv("S3_BUCKET_NAME")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+BULK_STATUS_MAX = int(os.getenv("BULK_STATUS_MAX", "5000"))  # 일괄 상태 변경 1회 최대 이미지 수
 
 # boto3 client 구성
 s3 = boto3.client(
@@ -47,55 +65,38 @@ def extract_s3_key_from_url(url: str) -> str:
 # 금일 결함 개요 조회 함수
 def get_defect_summary(db: Session):
     today = datetime.today().date()
-    yesterday = today - timedelta(days=1)
+    # 공유 캐시: 같은 날짜 키는 TTL 동안 한 번만 조회, 집계 변경 커밋 시 즉시 무효화
+    return defect_summary_cache.get_or_compute(today.isoformat(), lambda: _compute_defect_summary(db, today))
 
-    # 날짜 범위 설정
-    today_start = datetime.combine(today, time.min)
-    today_end = datetime.combine(today + timedelta(days=1), time.min)
-    yesterday_start = datetime.combine(yesterday, time.min)
-    yesterday_end = datetime.combine(today, time.min)
 
-    # is_active=True인 class만 가져오기
-    class_rows = db.query(DefectClass.class_name, DefectClass.class_color).filter(DefectClass.is_active == True).all()
-    # class_name → class_color 매핑 미리 가져오기
-    class_colors = {row.class_name: row.class_color for row in class_rows}
-    active_class_names = set(class_colors.keys())  # 기준 class 목록
+def _compute_defect_summary(db: Session, today):
+    yesterday = today - timedelta(days=1)
 
-    # 오늘 결함 수 by class (Images.status='completed' + 날짜 기준은 Images.date + is_active=True 주석만)
-    today_data = (
+    # 활성 class 기준으로 오늘/어제 결함 수를 한 번에 조회 (일별 집계 테이블, 결함 없는 class는 0)
+    rows = (
         db.query(
             DefectClass.class_name,
-            func.count().label("count")
+            DefectClass.class_color,
+            func.coalesce(func.sum(case((DefectDailyRollup.day == today, DefectDailyRollup.defect_count), else_=0)), 0).label("today_count"),
+            func.coalesce(func.sum(case((DefectDailyRollup.day == yesterday, DefectDailyRollup.defect_count), else_=0)), 0).label("yesterday_count")
         )
-        .join(Annotation, Annotation.class_id == DefectClass.class_id)
-        .join(Image, Annotation.image_id == Image.image_id)
-        .filter(Annotation.is_active == True)  # 주석이 삭제되지 않은 것만
-        .filter(Image.date >= today_start)
-        .filter(Image.date < today_end)
-        .filter(Image.status == 'completed')
-        .group_by(DefectClass.class_id)
-        .all()
-    )
-
-    # 어제 결함 수 by class
-    yesterday_data = (
-        db.query(
-            DefectClass.class_name,
-            func.count().label("count")
+        .outerjoin(
+            DefectDailyRollup,
+            and_(
+                DefectDailyRollup.class_id == DefectClass.class_id,
+                DefectDailyRollup.day.in_([today, yesterday])
+            )
         )
-        .join(Annotation, Annotation.class_id == DefectClass.class_id)
-        .join(Image, Annotation.image_id == Image.image_id)
-        .filter(Annotation.is_active == True)  # 주석이 삭제되지 않은 것만
-        .filter(Image.date >= yesterday_start)
-        .filter(Image.date < yesterday_end)
-        .filter(Image.status == 'completed')
-        .group_by(DefectClass.class_id)
+        .filter(DefectClass.is_active == True)
+        .group_by(DefectClass.class_id, DefectClass.class_name, DefectClass.class_color)
         .all()
     )
 
     # 응답 데이터 구성
-    today_dict = {row.class_name: row.count for row in today_data}  # today_dict: count만 저장 (color는 class_colors에서 가져옴)
-    yesterday_dict = {row.class_name: row.count for row in yesterday_data}
+    class_colors = {row.class_name: row.class_color for row in rows}
+    active_class_names = set(class_colors.keys())  # 기준 class 목록
+    today_dict = {row.class_name: int(row.today_count) for row in rows if row.today_count}
+    yesterday_dict = {row.class_name: int(row.yesterday_count) for row in rows if row.yesterday_count}
 
     # total_defects 계산
     total_defects = sum(today_dict.values())
@@ -128,53 +129,61 @@ def get_defect_summary(db: Session):
     }
 
 
-# 결함 데이터 목록 조회를 위한 함수 (기본 전체 조회)
-def get_defect_data_list(db: Session):
-    result = (
-        db.query(
-            Image.image_id,
-            Image.file_path,
-            Image.date.label("captured_at"),
-            Camera.line_name,
-            Camera.camera_id,
-            DefectClass.class_name
-        )
-        .join(Camera, Camera.camera_id == Image.camera_id)
-        .join(Annotation, Annotation.image_id == Image.image_id)
-        .join(DefectClass, DefectClass.class_id == Annotation.class_id)
+DEFECT_DATA_PAGE_MAX = 500  # 페이지당 최대 이미지 수
+
+
+# 결함 데이터 목록 커서 인코딩: 마지막 항목의 (captured_at, image_id)
+def encode_defect_data_cursor(captured_at: datetime, image_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{captured_at.isoformat()}|{image_id}".encode()).decode()
+
+
+def decode_defect_data_cursor(cursor: str):
+    try:
+        captured_at, image_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(captured_at), int(image_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+
+
+# 1단계: 조건에 맞는 이미지 한 페이지 (date, image_id) 최신순 — (status, date) 인덱스를 역순으로 읽고 limit에서 멈춤
+def _defect_data_image_page(db: Session, filters: annotation_schema.DefectDataFilter, after, limit: int):
+    # 활성 어노테이션(클래스 필터 포함)이 있는 이미지만
+    active_annotations = db.query(Annotation.annotation_id).filter(
+        Annotation.image_id == Image.image_id,
+        Annotation.is_active == True
+    )
+    if filters.class_ids:
+        active_annotations = active_annotations.filter(Annotation.class_id.in_(filters.class_ids))
+
+    query = (
+        db.query(Image.image_id, Image.date)
         .filter(Image.status == 'completed')  # "pending" 제외! status="completed"인 이미지만 조회
-        .filter(Annotation.is_active == True)  # 주석이 삭제되지 않은 것만
-        .order_by(Image.date.desc())
-        .all()
+        .filter(active_annotations.exists())
     )
 
-    grouped = defaultdict(lambda: {
-        "image_id": None,
-        "file_path": None,
-        "line_name": None,
-        "camera_id": None,
-        "captured_at": None,
-        "defect_types": []
-    })
+    # 날짜 필터(start_date ~ end_date)
+    if filters.start_date and filters.end_date:
+        start_datetime = datetime.combine(filters.start_date, datetime.min.time())
+        end_datetime = datetime.combine(filters.end_date + timedelta(days=1), datetime.min.time())  # 포함 범위
+        query = query.filter(Image.date >= start_datetime, Image.date < end_datetime)
 
-    for row in result:
-        key = row.image_id
-        grouped[key]["image_id"] = row.image_id
-        grouped[key]["file_path"] = row.file_path
-        grouped[key]["line_name"] = row.line_name
-        grouped[key]["camera_id"] = row.camera_id
-        grouped[key]["captured_at"] = row.captured_at
-        grouped[key]["defect_types"].append(row.class_name)
+    # 카메라 ID 필터
+    if filters.camera_ids:
+        query = query.filter(Image.camera_id.in_(filters.camera_ids))
 
-    return list(grouped.values())
+    # 커서 이후 (최신순이므로 더 과거 방향)
+    if after:
+        after_date, after_image_id = after
+        query = query.filter(or_(
+            Image.date < after_date,
+            and_(Image.date == after_date, Image.image_id < after_image_id)
+        ))
 
+    return query.order_by(Image.date.desc(), Image.image_id.desc()).limit(limit).all()
 
-# 결함 데이터 목록 "필터링 조회"를 위한 함수
-def get_filtered_defect_data_list(db: Session, filters: annotation_schema.DefectDataFilter):
-    # 아무 필터도 없을 경우 전체 조회로 대체
-    if not (filters.start_date and filters.end_date) and not filters.class_ids and not filters.camera_ids:
-        return get_defect_data_list(db)  # 기존 전체 조회 함수 호출
 
+# 2단계: 페이지 이미지들의 카메라 정보 + 결함 유형 목록을 DB에서 이미지 단위로 집계
+def _defect_data_details(db: Session, image_ids: List[int], class_ids: Optional[List[int]]):
     query = (
         db.query(
             Image.image_id,
@@ -182,53 +191,65 @@ def get_filtered_defect_data_list(db: Session, filters: annotation_schema.Defect
             Image.date.label("captured_at"),
             Camera.line_name,
             Camera.camera_id,
-            DefectClass.class_name
+            func.json_arrayagg(DefectClass.class_name).label("defect_types")
         )
         .join(Camera, Camera.camera_id == Image.camera_id)
         .join(Annotation, Annotation.image_id == Image.image_id)
         .join(DefectClass, DefectClass.class_id == Annotation.class_id)
-        .filter(Image.status == 'completed')  # "pending" 제외! status="completed"인 이미지만 조회
+        .filter(Image.image_id.in_(image_ids))
         .filter(Annotation.is_active == True)  # 주석이 삭제되지 않은 것만
     )
+    if class_ids:
+        query = query.filter(Annotation.class_id.in_(class_ids))
+
+    rows = query.group_by(Image.image_id, Camera.camera_id).all()
+    return {row.image_id: row for row in rows}
+
+
+# 결함 데이터 목록 한 페이지 조회 (커서 기반)
+def get_defect_data_page(db: Session, filters: annotation_schema.DefectDataFilter, cursor: Optional[str] = None, limit: int = 50):
+    limit = max(1, min(limit, DEFECT_DATA_PAGE_MAX))
+    after = decode_defect_data_cursor(cursor) if cursor else None
+
+    page = _defect_data_image_page(db, filters, after, limit + 1)  # 1건 더 읽어 다음 페이지 유무 판단
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    details = _defect_data_details(db, [row.image_id for row in page], filters.class_ids) if page else {}
+    items = []
+    for row in page:
+        detail = details.get(row.image_id)
+        if detail is None:
+            continue  # 두 조회 사이에 삭제/변경된 이미지
+        defect_types = detail.defect_types
+        items.append({
+            "image_id": detail.image_id,
+            "file_path": get_presigned_image_url(detail.file_path),
+            "line_name": detail.line_name,
+            "camera_id": detail.camera_id,
+            "captured_at": detail.captured_at,
+            "defect_types": json.loads(defect_types) if isinstance(defect_types, str) else defect_types
+        })
 
-    # 날짜 필터(start_date ~ end_date)
-    if filters.start_date and filters.end_date:
-        start_datetime = datetime.combine(filters.start_date, datetime.min.time())
-        end_datetime = datetime.combine(filters.end_date + timedelta(days=1), datetime.min.time())  # 포함 범위
-        query = query.filter(Image.date >= start_datetime, Image.date < end_datetime)
-
-    # 결함 클래스 필터
-    if filters.class_ids:
-        query = query.filter(Annotation.class_id.in_(filters.class_ids))
-
-    # 카메라 ID 필터
-    if filters.camera_ids:
-        query = query.filter(Image.camera_id.in_(filters.camera_ids))
-
-    # 최신순 정렬
-    query = query.order_by(Image.date.desc())
+    next_cursor = encode_defect_data_cursor(page[-1].date, page[-1].image_id) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
 
-    rows = query.all()
 
-    grouped = defaultdict(lambda: {
-        "image_id": None,
-        "file_path": None,
-        "line_name": None,
-        "camera_id": None,
-        "captured_at": None,
-        "defect_types": []
-    })
+# 결함 데이터 목록 전체를 페이지 단위로 순회 (스트리밍 응답용, 메모리는 페이지 크기만큼만 사용)
+def iter_defect_data(db: Session, filters: annotation_schema.DefectDataFilter, page_size: int = DEFECT_DATA_PAGE_MAX):
+    cursor = None
+    while True:
+        page = get_defect_data_page(db, filters, cursor, page_size)
+        yield from page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return
 
-    for row in rows:
-        key = row.image_id
-        grouped[key]["image_id"] = row.image_id
-        grouped[key]["file_path"] = row.file_path
-        grouped[key]["line_name"] = row.line_name
-        grouped[key]["camera_id"] = row.camera_id
-        grouped[key]["captured_at"] = row.captured_at
-        grouped[key]["defect_types"].append(row.class_name)
 
-    return list(grouped.values())
+# 결함 데이터 목록 "필터링 조회" (구 /defect-data/list): 전체를 메모리에 올리지 않고 첫 페이지(최대 DEFECT_DATA_PAGE_MAX건)만
+# 나머지는 반환된 next_cursor로 /defect-data/page에서 이어 받거나 /defect-data/stream으로 전체 수신
+def get_filtered_defect_data_list(db: Session, filters: annotation_schema.DefectDataFilter):
+    return get_defect_data_page(db, filters, None, DEFECT_DATA_PAGE_MAX)
 
 
 # 결함 개요 조회를 위한 함수
@@ -237,10 +258,11 @@ def get_defect_class_summary(db: Session):
         db.query(
             DefectClass.class_name,
             DefectClass.class_color,
-            func.count(Annotation.annotation_id).label("count")
+            func.sum(DefectDailyRollup.defect_count).label("count")
         )
-        .join(Annotation, Annotation.class_id == DefectClass.class_id)
+        .join(DefectDailyRollup, DefectDailyRollup.class_id == DefectClass.class_id)
         .group_by(DefectClass.class_id, DefectClass.class_name, DefectClass.class_color)
+        .having(func.sum(DefectDailyRollup.defect_count) > 0)  # 차감되어 0이 된 집계 행만 남은 클래스는 제외
         .all()
     )
 
@@ -248,7 +270,7 @@ def get_defect_class_summary(db: Session):
         annotation_schema.DefectClassSummaryResponse(
             class_name=row.class_name,
             class_color=row.class_color,
-            count=row.count
+            count=int(row.count)
         ) for row in results
     ]
 
@@ -273,6 +295,7 @@ def get_recent_defect_checks(db: Session, limit: int = 10):
     # 이미지 ID를 기준으로 결함 유형(class_name)을 그룹화해서 조회
     result = (
         db.query(
+            subquery.c.image_id,
             subquery.c.file_path.label("image_url"),
             subquery.c.line_name,
             subquery.c.camera_id,
@@ -288,41 +311,49 @@ def get_recent_defect_checks(db: Session, limit: int = 10):
     return result
 
 
-def get_annotation_details_by_image_id(db: Session, image_id: int):
+# 이미지 여러 건의 상세 정보를 쿼리 2번으로 조회 → {image_id: 상세}
+# 1) 이미지 + last_annotation_id (MAX(PK)는 인덱스 끝 값만 읽으므로 테이블 스캔 없음)
+# 2) 해당 이미지들의 활성 어노테이션 + 클래스 이름/색상
+def _load_annotation_details(db: Session, image_ids: List[int]) -> dict:
+    image_ids = list(set(image_ids))
+    if not image_ids:
+        return {}
+
+    last_annotation_id = select(func.max(Annotation.annotation_id)).scalar_subquery()
+    images = (
+        db.query(Image, last_annotation_id.label("last_annotation_id"))
+        .filter(Image.image_id.in_(image_ids))
+        .all()
+    )
+    if not images:
+        return {}
+
+    details = {}
+    for image_info, last_id in images:
+        details[image_info.image_id] = {
+            "image_id": image_info.image_id,
+            "file_path": get_presigned_image_url(image_info.file_path),
+            "date": image_info.date,
+            "camera_id": image_info.camera_id,
+            "dataset_id": image_info.dataset_id,
+            "status": image_info.status,
+            "width": image_info.width,
+            "height": image_info.height,
+            "last_annotation_id": last_id or 0,  # 데이터베이스에서 가장 마지막(최대) annotation_id 값
+            "version": image_info.annotation_version,
+            "defects": []
+        }
+
     annotations = (
         db.query(Annotation, DefectClass.class_name, DefectClass.class_color)
         .join(DefectClass, Annotation.class_id == DefectClass.class_id)
-        .filter(Annotation.image_id == image_id)
+        .filter(Annotation.image_id.in_(list(details)))
         .filter(Annotation.is_active == True)  # is_active=True인 어노테이션만 조회
+        .order_by(Annotation.image_id, Annotation.annotation_id)
         .all()
     )
-
-    image_info = db.query(Image).filter(Image.image_id == image_id).first()
-
-    if not image_info:
-        return None
-
-    # 데이터베이스에서 가장 마지막(최대) annotation_id 값 조회
-    last_annotation_id = (
-        db.query(func.max(Annotation.annotation_id))
-        .scalar() or 0
-    )
-
-    result = {
-        "image_id": image_info.image_id,
-        "file_path": image_info.file_path,
-        "date": image_info.date,
-        "camera_id": image_info.camera_id,
-        "dataset_id": image_info.dataset_id,
-        "status": image_info.status,
-        "width": image_info.width,
-        "height": image_info.height,
-        "last_annotation_id": last_annotation_id,
-        "defects": []
-    }
-
     for annotation, class_name, class_color in annotations:
-        defect_data = {
+        details[annotation.image_id]["defects"].append({
             "annotation_id": annotation.annotation_id,
             "class_id": annotation.class_id,
             "class_name": class_name,
@@ -331,123 +362,44 @@ def get_annotation_details_by_image_id(db: Session, image_id: int):
             "bounding_box": annotation.bounding_box,
             "user_id": annotation.user_id,
             "is_active": annotation.is_active  # is_active 값 추가
-        }
-        result["defects"].append(defect_data)
+        })
+
+    return details
 
-    return result
+
+def get_annotation_details_by_image_id(db: Session, image_id: int):
+    return _load_annotation_details(db, [image_id]).get(image_id)
 
 
+# 요청 순서대로 상세 반환 (없는 이미지는 제외), 이미지 수와 관계없이 쿼리 2번
 def get_annotation_details_by_image_ids(db: Session, image_ids: List[int]):
-    result = []
-    for image_id in image_ids:
-        detail = get_annotation_details_by_image_id(db, image_id)
-        if detail is not None:
-            result.append(detail)
-    return {"details": result}
+    details = _load_annotation_details(db, image_ids)
+    return {"details": [details[image_id] for image_id in image_ids if image_id in details]}
 
 
-def get_main_data(db: Session, user_id: int, filters: Optional[annotation_schema.MainScreenFilter] = None):
-    # 1. 현재 로그인된 사용자의 profile_image 가져오기
-    user = db.query(User).filter(User.user_id == user_id).first()
-    if not user:
-        return None
+# 조회 결과 → 메인 화면 이미지 항목
+# raw_boxes=True: 박스 JSON 문자열을 파싱하지 않고 RawJSON으로 전달 (fast_response 전용)
+def _main_screen_item(img, raw_boxes: bool = False) -> dict:
+    boxes = img.review_boxes or "[]"
+    return {
+        "camera_id": img.camera_id,
+        "image_id": img.image_id,
+        "file_path": get_presigned_image_url(img.file_path),
+        "width": img.width,
+        "height": img.height,
+        "confidence": float(img.confidence) if img.confidence else None,
+        "count": img.count,
+        "status": img.status,
+        "bounding_boxes": RawJSON(boxes) if raw_boxes else json.loads(boxes),  # 검수 요약에 미리 계산된 박스 (class_name, class_color 포함)
+        "priority": img.priority
+    }
 
-    # 2. 이미지 목록 조회 - 기본 쿼리 구성
-    query = (
-        db.query(
-            Image.camera_id,
-            Image.image_id,
-            Image.file_path,
-            Image.width,
-            Image.height,
-            Image.status,
-            func.count(Annotation.annotation_id).label("count"),
-            func.min(Annotation.conf_score).label("confidence")
-        )
-        .outerjoin(Annotation, Image.image_id == Annotation.image_id)
-    )
-    
-    # is_active=True인 어노테이션만 카운트하도록 수정
-    query = query.filter(or_(Annotation.is_active == True, Annotation.annotation_id == None))
-    
-    # 클래스 이름 필터가 있을 경우, DefectClass 조인
-    defect_class_joined = False
-    if filters and filters.class_names:
-        query = query.join(DefectClass, Annotation.class_id == DefectClass.class_id)
-        defect_class_joined = True
-
-    # 3. 필터 적용
-    if filters:
-        if filters.status:
-            query = query.filter(Image.status == filters.status)
-        if filters.class_names:
-            query = query.filter(DefectClass.class_name.in_(filters.class_names))
-        
-    # 마지막에 그룹화
-    query = query.group_by(Image.image_id)
-    
-    # Confidence 필터는 그룹화 후 적용
-    if filters:
-        if filters.min_confidence is not None:
-            # min_confidence가 0이면 annotation이 없는 이미지들도 포함
-            if filters.min_confidence == 0:
-                query = query.having(
-                    or_(
-                        func.min(Annotation.conf_score) >= filters.min_confidence,
-                        func.min(Annotation.conf_score).is_(None)  # annotation이 없는 이미지도 포함
-                    )
-                )
-            else:
-                query = query.having(func.min(Annotation.conf_score) >= filters.min_confidence)
-        if filters.max_confidence is not None:
-            query = query.having(func.min(Annotation.conf_score) <= filters.max_confidence)
-
-    # 4. 결과 조회
-    images = query.all()
-
-    # 5. 바운딩 박스 정보 조회
-    image_ids = [img.image_id for img in images]
-    
-    # 바운딩 박스 조회를 위한 서브쿼리
-    bounding_boxes_query = (
-        db.query(
-            Annotation.image_id,
-            func.json_arrayagg(
-                func.json_object(
-                    'bounding_box', Annotation.bounding_box,
-                    'class_name', DefectClass.class_name,
-                    'is_active', Annotation.is_active
-                )
-            ).label('boxes')
-        )
-        .join(DefectClass, Annotation.class_id == DefectClass.class_id)
-        .filter(Annotation.image_id.in_(image_ids))
-        .filter(Annotation.is_active == True)  # is_active=True인 어노테이션만 포함
-        .group_by(Annotation.image_id)
-    )
-    
-    # 실행
-    bounding_boxes = bounding_boxes_query.all()
-
-    # 6. 바운딩 박스 정보를 딕셔너리로 변환
-    bbox_dict = {row.image_id: row.boxes for row in bounding_boxes}
-
-    # 7. 응답 데이터 구성
-    image_list = []
-    for img in images:
-        image_list.append({
-            "camera_id": img.camera_id,
-            "image_id": img.image_id,
-            "file_path": img.file_path,
-            "width": img.width,
-            "height": img.height,
-            "confidence": float(img.confidence) if img.confidence else None,
-            "count": img.count,
-            "status": img.status,
-            "bounding_boxes": bbox_dict.get(img.image_id, [])
-        })
 
-    # 8. 전체 통계 계산
+# 조회 결과 → 메인 화면 응답
+def _main_screen_response(user: User, images, raw_boxes: bool = False):
+    image_list = [_main_screen_item(img, raw_boxes) for img in images]
+
+    # 전체 통계 계산
     total_images = len(image_list)
     pending_images = sum(1 for img in image_list if img["status"] == "pending")
     completed_images = sum(1 for img in image_list if img["status"] == "completed")
@@ -461,7 +413,30 @@ def get_main_data(db: Session, user_id: int, filters: Optional[annotation_schema
     }
 
 
-def get_main_data_filtered(db: Session, user_id: int):
+# 요청 필터 → 메인 화면 조회 조건
+def _main_screen_query(filters: Optional[annotation_schema.MainScreenFilter], **options) -> MainScreenQuery:
+    if filters is None:
+        return MainScreenQuery(**options)
+    return MainScreenQuery(
+        status=filters.status or None,
+        class_names=tuple(filters.class_names or ()),
+        min_confidence=filters.min_confidence,
+        max_confidence=filters.max_confidence,
+        **options
+    )
+
+
+def get_main_data(db: Session, user_id: int, filters: Optional[annotation_schema.MainScreenFilter] = None):
+    # 1. 현재 로그인된 사용자의 profile_image 가져오기
+    user = db.query(User).filter(User.user_id == user_id).first()
+    if not user:
+        return None
+
+    # 2. 전체 이미지 조회 (count/confidence는 이미지의 활성 어노테이션 전체 기준)
+    return _main_screen_response(user, fetch_main_screen(db, _main_screen_query(filters)))
+
+
+def get_main_data_filtered(db: Session, user_id: int, raw_boxes: bool = False):
     """
     메인 화면 데이터 조회 (필터링 적용) - annotation이 없는 이미지와 최저 conf_score가 0.75 이상인 이미지 제외
     사용자에게 할당된 카메라의 이미지만 조회
@@ -471,98 +446,12 @@ def get_main_data_filtered(db: Session, user_id: int):
     if not user:
         return None
 
-    # 2. 사용자에게 할당된 카메라의 이미지 목록 조회 - annotation이 있는 이미지만, 최저 conf_score < 0.75인 이미지만
-    query = (
-        db.query(
-            Image.camera_id,
-            Image.image_id,
-            Image.file_path,
-            Image.width,
-            Image.height,
-            Image.status,
-            Image.date,  # 정렬을 위해 date 필드 추가
-            func.sum(case((Annotation.is_active == True, 1), else_=0)).label("count"),
-            func.min(case((and_(Annotation.is_active == True, Annotation.conf_score.isnot(None)), Annotation.conf_score))).label("confidence")
-        )
-        .join(Annotation, Image.image_id == Annotation.image_id)  # INNER JOIN으로 annotation이 있는 이미지만 (is_active 조건 제거)
-        .join(Camera, Image.camera_id == Camera.camera_id)  # 카메라 테이블 JOIN
-        .join(                                              # 사용자-카메라 할당 테이블 JOIN
-            annotator_camera_association,
-            Camera.camera_id == annotator_camera_association.c.camera_id
-        )
-        .filter(annotator_camera_association.c.user_id == user_id)  # 사용자에게 할당된 카메라만 필터링
-        .group_by(Image.image_id)
-    )
-    
-    # 3. 최저 conf_score가 0.75 미만인 이미지만 필터링 (활성 어노테이션 기준)
-    query = query.having(
-        or_(
-            func.min(case((and_(Annotation.is_active == True, Annotation.conf_score.isnot(None)), Annotation.conf_score))) < 0.75,
-            func.min(case((and_(Annotation.is_active == True, Annotation.conf_score.isnot(None)), Annotation.conf_score))).is_(None)  # 활성 어노테이션이 없는 경우도 포함
-        )
-    )
-    
-    # 4. 최신 날짜 순으로 정렬
-    query = query.order_by(Image.date.desc())
-    
-    images = query.all()
-
-    # 5. 바운딩 박스 정보 조회
-    image_ids = [img.image_id for img in images]
-    
-    if image_ids:  # 이미지가 있을 때만 바운딩 박스 조회
-        bounding_boxes_query = (
-            db.query(
-                Annotation.image_id,
-                func.json_arrayagg(
-                    func.json_object(
-                        'bounding_box', Annotation.bounding_box,
-                        'class_name', DefectClass.class_name,
-                        'is_active', Annotation.is_active
-                    )
-                ).label('boxes')
-            )
-            .join(DefectClass, Annotation.class_id == DefectClass.class_id)
-            .filter(Annotation.image_id.in_(image_ids))
-            .filter(Annotation.is_active == True)  # is_active=True인 어노테이션만 포함
-            .group_by(Annotation.image_id)
-        )
-        
-        bounding_boxes = bounding_boxes_query.all()
-        bbox_dict = {row.image_id: row.boxes for row in bounding_boxes}
-    else:
-        bbox_dict = {}
-
-    # 6. 응답 데이터 구성
-    image_list = []
-    for img in images:
-        image_list.append({
-            "camera_id": img.camera_id,
-            "image_id": img.image_id,
-            "file_path": img.file_path,
-            "width": img.width,
-            "height": img.height,
-            "confidence": float(img.confidence) if img.confidence else None,
-            "count": img.count,
-            "status": img.status,
-            "bounding_boxes": bbox_dict.get(img.image_id, [])
-        })
-
-    # 7. 전체 통계 계산
-    total_images = len(image_list)
-    pending_images = sum(1 for img in image_list if img["status"] == "pending")
-    completed_images = sum(1 for img in image_list if img["status"] == "completed")
-
-    return {
-        "profile_image": user.profile_image,
-        "total_images": total_images,
-        "pending_images": pending_images,
-        "completed_images": completed_images,
-        "image_list": image_list
-    }
+    # 2. 사용자에게 할당된 카메라의 검수 대상 이미지를 최신순으로 조회
+    images = fetch_main_screen(db, MainScreenQuery(review_only=True), get_assigned_camera_ids(db, user_id))
+    return _main_screen_response(user, images, raw_boxes)
 
 
-def get_main_data_filtered_with_filters(db: Session, user_id: int, filters: Optional[annotation_schema.MainScreenFilter] = None):
+def get_main_data_filtered_with_filters(db: Session, user_id: int, filters: Optional[annotation_schema.MainScreenFilter] = None, raw_boxes: bool = False):
     """
     메인 화면 데이터 조회 (필터링 적용 + 추가 필터) - annotation이 없는 이미지와 최저 conf_score가 0.75 이상인 이미지 제외
     사용자에게 할당된 카메라의 이미지만 조회
@@ -572,158 +461,195 @@ def get_main_data_filtered_with_filters(db: Session, user_id: int, filters: Opti
     if not user:
         return None
 
-    # 2. 사용자에게 할당된 카메라의 이미지 목록 조회 - annotation이 있는 이미지만
-    query = (
-        db.query(
-            Image.camera_id,
-            Image.image_id,
-            Image.file_path,
-            Image.width,
-            Image.height,
-            Image.status,
-            Image.date,  # 정렬을 위해 date 필드 추가
-            func.count(Annotation.annotation_id).label("count"),
-            func.min(Annotation.conf_score).label("confidence")
-        )
-        .join(Annotation, Image.image_id == Annotation.image_id)  # INNER JOIN으로 annotation이 있는 이미지만
-        .join(Camera, Image.camera_id == Camera.camera_id)  # 카메라 테이블 JOIN
-        .join(                                              # 사용자-카메라 할당 테이블 JOIN
-            annotator_camera_association,
-            Camera.camera_id == annotator_camera_association.c.camera_id
-        )
-        .filter(annotator_camera_association.c.user_id == user_id)  # 사용자에게 할당된 카메라만 필터링
-        .filter(Annotation.is_active == True)  # 활성 annotation만
-        .filter(Annotation.conf_score.isnot(None))  # conf_score가 null이 아닌 annotation만
-    )
-    
-    # 클래스 이름 필터가 있을 경우, DefectClass 조인
-    if filters and filters.class_names:
-        query = query.join(DefectClass, Annotation.class_id == DefectClass.class_id)
-
-    # 3. 필터 적용
-    if filters:
-        if filters.status:
-            query = query.filter(Image.status == filters.status)
-        if filters.class_names:
-            query = query.filter(DefectClass.class_name.in_(filters.class_names))
-        
-    # 마지막에 그룹화
-    query = query.group_by(Image.image_id)
-    
-    # 4. 최저 conf_score가 0.75 미만인 이미지만 필터링
-    having_conditions = [func.min(Annotation.conf_score) < 0.75]
-    
-    # Confidence 필터는 그룹화 후 적용
-    if filters:
-        if filters.min_confidence is not None:
-            having_conditions.append(func.min(Annotation.conf_score) >= filters.min_confidence)
-        if filters.max_confidence is not None:
-            having_conditions.append(func.min(Annotation.conf_score) <= filters.max_confidence)
-
-    # 모든 HAVING 조건 적용
-    query = query.having(and_(*having_conditions))
-    
-    # 5. 최신 날짜 순으로 정렬
-    query = query.order_by(Image.date.desc())
-    
-    images = query.all()
-
-    # 6. 바운딩 박스 정보 조회
-    image_ids = [img.image_id for img in images]
-    
-    if image_ids:  # 이미지가 있을 때만 바운딩 박스 조회
-        bounding_boxes_query = (
-            db.query(
-                Annotation.image_id,
-                func.json_arrayagg(
-                    func.json_object(
-                        'bounding_box', Annotation.bounding_box,
-                        'class_name', DefectClass.class_name,
-                        'is_active', Annotation.is_active
-                    )
-                ).label('boxes')
-            )
-            .join(DefectClass, Annotation.class_id == DefectClass.class_id)
-            .filter(Annotation.image_id.in_(image_ids))
-            .filter(Annotation.is_active == True)  # is_active=True인 어노테이션만 포함
-            .group_by(Annotation.image_id)
-        )
-        
-        bounding_boxes = bounding_boxes_query.all()
-        bbox_dict = {row.image_id: row.boxes for row in bounding_boxes}
-    else:
-        bbox_dict = {}
-
-    # 7. 응답 데이터 구성
-    image_list = []
-    for img in images:
-        image_list.append({
-            "camera_id": img.camera_id,
-            "image_id": img.image_id,
-            "file_path": img.file_path,
-            "width": img.width,
-            "height": img.height,
-            "confidence": float(img.confidence) if img.confidence else None,
-            "count": img.count,
-            "status": img.status,
-            "bounding_boxes": bbox_dict.get(img.image_id, [])
-        })
+    # 2. 할당된 카메라의 검수 대상 중 conf_score가 있는 이미지 + 추가 필터
+    query = _main_screen_query(filters, review_only=True, scored_only=True)
+    return _main_screen_response(user, fetch_main_screen(db, query, get_assigned_camera_ids(db, user_id)), raw_boxes)
 
-    # 8. 전체 통계 계산
-    total_images = len(image_list)
-    pending_images = sum(1 for img in image_list if img["status"] == "pending")
-    completed_images = sum(1 for img in image_list if img["status"] == "completed")
+
+# 메인 화면 한 페이지 조회 (keyset: 직전 페이지 마지막 이미지의 date, image_id)
+def get_main_page(db: Session, user_id: int, request: annotation_schema.MainScreenPageRequest, raw_boxes: bool = False):
+    if not db.query(User.user_id).filter(User.user_id == user_id).first():
+        return None
+
+    if request.order not in ("latest", "priority"):
+        raise HTTPException(status_code=400, detail="order는 latest 또는 priority만 가능합니다.")
+    by_priority = request.order == "priority"
+    limit = max(1, min(request.limit, MAIN_PAGE_MAX))
+
+    after = None
+    if request.cursor:
+        after = _decode_priority_cursor(request.cursor) if by_priority else decode_defect_data_cursor(request.cursor)
+
+    camera_ids = get_assigned_camera_ids(db, user_id)
+    if request.camera_ids:
+        requested = set(request.camera_ids)
+        camera_ids = [camera_id for camera_id in camera_ids if camera_id in requested]  # 할당된 카메라 중에서만
+
+    query = _main_screen_query(request, review_only=True, scored_only=request.scored_only, by_priority=by_priority)
+    rows = fetch_main_screen(db, query, camera_ids, after=after, limit=limit)
+
+    next_cursor = None
+    if len(rows) == limit:
+        encode = _encode_priority_cursor if by_priority else encode_defect_data_cursor
+        next_cursor = encode(main_screen_sort_value(query, rows[-1]), rows[-1].image_id)
+    return {"items": [_main_screen_item(row, raw_boxes) for row in rows], "next_cursor": next_cursor}
+
+
+# 우선순위 정렬 페이지 cursor: "p|review_priority|image_id"
+def _encode_priority_cursor(priority: int, image_id: int) -> str:
+    return base64.urlsafe_b64encode(f"p|{priority}|{image_id}".encode()).decode()
+
+
+def _decode_priority_cursor(cursor: str):
+    try:
+        prefix, priority, image_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if prefix != "p":
+            raise ValueError(prefix)
+        return int(priority), int(image_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+
+
+# 메인 화면 변경분 동기화 cursor: "할당 카메라 목록 해시|camera_id:change_seq:image_id,..." (카메라별 위치)
+def _encode_sync_cursor(positions: dict, cameras_key: int) -> str:
+    body = ",".join(f"{camera_id}:{seq}:{image_id}" for camera_id, (seq, image_id) in sorted(positions.items()))
+    return base64.urlsafe_b64encode(f"{cameras_key}|{body}".encode()).decode()
+
+
+def _decode_sync_cursor(cursor: str):
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if len(parts) == 3:
+            return {}, None  # 카메라별 시퀀스 이전 형식 ("change_seq|image_id|해시") → reset
+        cameras_key, body = parts
+        positions = {}
+        for part in filter(None, body.split(",")):
+            camera_id, seq, image_id = map(int, part.split(":"))
+            positions[camera_id] = (seq, image_id)
+        return positions, int(cameras_key)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+
+
+# 메인 화면 변경분 조회: cursor 이후 추가/변경(upserted)되거나 화면에서 빠진(removed) 이미지만
+# - cursor가 없거나, 카메라 할당이 바뀌었거나, 보관 기간이 지나 정리된 삭제 기록보다 오래된 cursor이면
+#   reset=True + 현재 시점 cursor → 클라이언트는 전체 목록을 다시 받은 뒤 이 cursor로 이어감
+# - 카메라마다 limit을 나눠 읽으므로 변경이 많은 카메라가 다른 카메라를 밀어내지 않음
+def get_main_changes(db: Session, user_id: int, cursor: Optional[str] = None, limit: int = MAIN_CHANGES_DEFAULT, raw_boxes: bool = False):
+    if not db.query(User.user_id).filter(User.user_id == user_id).first():
+        return None
+
+    limit = max(1, min(limit, MAIN_CHANGES_MAX))
+    camera_ids = get_assigned_camera_ids(db, user_id)
+    cameras_key = zlib.crc32(",".join(map(str, camera_ids)).encode())
+
+    positions = None
+    if cursor:
+        decoded, cursor_cameras_key = _decode_sync_cursor(cursor)
+        if cursor_cameras_key == cameras_key and set(decoded) == set(camera_ids):
+            horizons = tombstone_horizons(db, camera_ids)
+            if all(decoded[camera_id][0] > horizons[camera_id] for camera_id in camera_ids):
+                positions = decoded
+
+    if positions is None:
+        # 카메라별 (현재 시퀀스 + 1, 0) 이후 = 현재까지 커밋된 변경 이후
+        current = current_change_seqs(db, camera_ids)
+        return {
+            "reset": True,
+            "upserted": [],
+            "removed": [],
+            "cursor": _encode_sync_cursor({camera_id: (seq + 1, 0) for camera_id, seq in current.items()}, cameras_key),
+            "has_more": False
+        }
+
+    per_camera = max(1, limit // max(1, len(camera_ids)))
+    changes = fetch_changes(db, positions, per_camera, MAIN_SCREEN_COLUMNS + (Image.needs_review,))
+
+    upserted, removed = [], []
+    for camera_id, items in changes.items():
+        for _, image_id, row in items:
+            if row is not None and row.needs_review:
+                upserted.append(_main_screen_item(row, raw_boxes))
+            else:
+                removed.append(image_id)  # 삭제되었거나 검수 대상에서 빠진 이미지
+        if items:
+            positions[camera_id] = (items[-1][0], items[-1][1])
 
     return {
-        "profile_image": user.profile_image,
-        "total_images": total_images,
-        "pending_images": pending_images,
-        "completed_images": completed_images,
-        "image_list": image_list
+        "reset": False,
+        "upserted": upserted,
+        "removed": removed,
+        "cursor": _encode_sync_cursor(positions, cameras_key),
+        "has_more": any(len(items) == per_camera for items in changes.values())
     }
 
 
-# 결함 유형별 통계를 위한 함수
-def get_defect_type_statistics(db: Session):
-    # 전체 결함 주석 개수 구하기
-    total_count = (
-        db.query(func.count(Annotation.annotation_id))
-        .join(Image, Annotation.image_id == Image.image_id)
-        .join(DefectClass, Annotation.class_id == DefectClass.class_id)
-        .filter(Image.status == 'completed',
-                DefectClass.is_active == True,
-                Annotation.is_active == True  # 삭제되지 않은 주석만 포함
-        )
-        .scalar()
-    )
+# 작업 큐에서 검수할 이미지 임대 (본인의 유효한 리스 포함, 만료 시각 연장)
+def claim_work(db: Session, user_id: int, request: annotation_schema.WorkQueueClaimRequest, raw_boxes: bool = False):
+    if not db.query(User.user_id).filter(User.user_id == user_id).first():
+        return None
 
-    if total_count == 0:
-        return []
+    camera_ids = get_assigned_camera_ids(db, user_id)
+    if request.camera_ids:
+        requested = set(request.camera_ids)
+        camera_ids = [camera_id for camera_id in camera_ids if camera_id in requested]  # 할당된 카메라 중에서만
+
+    now = datetime.utcnow()
+    image_ids = claim_images(db, user_id, camera_ids, request.count, request.order, now)
+    db.commit()  # 행 잠금은 여기서 해제, 리스 값으로 다른 작업자와 구분
+
+    rows = fetch_claimed(db, image_ids)
+    return {
+        "items": [_main_screen_item(row, raw_boxes) for row in rows],
+        "lease_expires_at": now + timedelta(seconds=WORK_QUEUE_LEASE_SECONDS)
+    }
+
+
+# 작업 중인 이미지 리스 연장
+def renew_work(db: Session, user_id: int, image_ids: List[int]):
+    now = datetime.utcnow()
+    renewed = renew_leases(db, user_id, image_ids, now)
+    db.commit()
+    return {
+        "image_ids": renewed,
+        "lease_expires_at": now + timedelta(seconds=WORK_QUEUE_LEASE_SECONDS) if renewed else None
+    }
 
-    # 클래스별 주석 개수 집계
+
+# 작업하지 않을 이미지를 큐로 반납
+def release_work(db: Session, user_id: int, image_ids: List[int]):
+    released = release_leases(db, user_id, image_ids)
+    db.commit()
+    return {"image_ids": released, "lease_expires_at": None}
+
+
+# 결함 유형별 통계를 위한 함수
+def get_defect_type_statistics(db: Session):
+    # 클래스별 주석 개수 집계 (일별 집계 테이블 합산, 활성 클래스만)
     results = (
         db.query(
             DefectClass.class_name,
             DefectClass.class_color,
-            func.count(Annotation.annotation_id).label("count")
-        )
-        .join(Annotation, Annotation.class_id == DefectClass.class_id)
-        .join(Image, Annotation.image_id == Image.image_id)
-        .filter(Image.status == 'completed',
-                DefectClass.is_active == True,
-                Annotation.is_active == True  # 삭제되지 않은 주석만 포함
+            func.sum(DefectDailyRollup.defect_count).label("count")
         )
+        .join(DefectDailyRollup, DefectDailyRollup.class_id == DefectClass.class_id)
+        .filter(DefectClass.is_active == True)
         .group_by(DefectClass.class_id)
         .all()
     )
 
+    # 전체 결함 주석 개수 구하기
+    total_count = sum(int(r.count) for r in results)
+    if total_count == 0:
+        return []
+
     # 비율 계산 및 리스트 변환
     return [
         {
             "class_name": r.class_name,
             "class_color": r.class_color,
-            "count": r.count,
-            "percentage": round((r.count / total_count) * 100, 1)
+            "count": int(r.count),
+            "percentage": round((int(r.count) / total_count) * 100, 1)
         }
         for r in results
     ]
@@ -735,21 +661,18 @@ def get_weekday_defect_summary(db: Session):
 
     raw = (
         db.query(
-            func.date(Image.date).label("date"),  # 날짜 기준으로 group
+            DefectDailyRollup.day.label("date"),  # 날짜 기준으로 group
             DefectClass.class_name,
             DefectClass.class_color,
-            func.count(Annotation.annotation_id).label("count")
+            func.sum(DefectDailyRollup.defect_count).label("count")
         )
-        .join(Image, Annotation.image_id == Image.image_id)
-        .join(DefectClass, Annotation.class_id == DefectClass.class_id)
+        .join(DefectClass, DefectDailyRollup.class_id == DefectClass.class_id)
         .filter(
-            Image.status == "completed",
             DefectClass.is_active == True,
-            Annotation.is_active == True,  # 삭제되지 않은 주석만 포함
-            func.date(Image.date) >= seven_days_ago,  # 시작 날짜
-            func.date(Image.date) <= today            # 끝 날짜 (오늘 포함)
+            DefectDailyRollup.day >= seven_days_ago,  # 시작 날짜
+            DefectDailyRollup.day <= today            # 끝 날짜 (오늘 포함)
         )
-        .group_by(func.date(Image.date), DefectClass.class_id)  # 정확한 날짜 단위로 그룹
+        .group_by(DefectDailyRollup.day, DefectClass.class_id)  # 정확한 날짜 단위로 그룹
         .all()
     )
 
@@ -770,7 +693,7 @@ def get_weekday_defect_summary(db: Session):
     # 쿼리 결과 가공: 날짜 → 요일로 변환
     for date, class_name, class_color, count in raw:
         day_str = date.strftime("%a")
-        print(f"[DEBUG] {date} → {day_str}")  # 디버깅용 출력
+        count = int(count)
 
         if day_str in result_dict:
             result_dict[day_str]["total"] += count
@@ -795,114 +718,43 @@ def get_defect_statistics_by_period(
     defect_types: Optional[List[str]] = None,
     camera_ids: Optional[List[int]] = None
 ):
-    # 필터 충돌 방지
-    if defect_types and camera_ids:
-        raise ValueError("defect_type과 camera_id는 동시에 필터링할 수 없습니다.")
-
-    # 집계 단위에 따라 날짜 포맷 결정
+    # 집계 단위에 따라 버킷 결정
     if unit in ("week", "month", "custom"):  # 일별
-        date_format = "%Y-%m-%d"
+        granularity = "day"
     elif unit == "year":  # 월별
-        date_format = "%Y-%m"
+        granularity = "month"
     else:
         raise ValueError("unit은 'week', 'month', 'year', 'custom' 중 하나여야 합니다.")
 
-    # 기본 쿼리 시작
-    query = db.query(
-        func.date_format(Image.date, date_format).label("period"),
-        func.count().label("defect_count")
-    ).select_from(Annotation).join(Image, Annotation.image_id == Image.image_id)
-
-    # 결함 유형 필터
+    # 라벨 기준: 결함 유형 필터가 있으면 유형별, 카메라 필터만 있으면 카메라별 (두 필터 동시 적용 가능)
     if defect_types:
-        query = query.join(
-            DefectClass, Annotation.class_id == DefectClass.class_id
-        ).filter(
-            DefectClass.class_name.in_(defect_types)
-        ).add_columns(
-            DefectClass.class_name.label("label"),
-            DefectClass.class_color.label("class_color")
-        )
-        group_by_cols = ["period", "label", "class_color"]
-
-    # 카메라 ID 필터
+        group_by = "class"
     elif camera_ids:
-        query = query.filter(
-            Image.camera_id.in_(camera_ids)
-        ).add_columns(
-            func.cast(Image.camera_id, String).label("label"),
-            literal(None).label("class_color")  # 그대로 null 유지
-        )
-        group_by_cols = ["period", "label"]
-
-    # 전체 집계 (필터 없음)
+        group_by = "camera"
     else:
-        query = query.add_columns(
-            literal(None).label("label"),
-            literal(None).label("class_color")
-        )
-        group_by_cols = ["period"]
-
-    # completed 상태 + 삭제되지 않은 주석만 집계
-    query = query.filter(
-        Image.status == 'completed',
-        Annotation.is_active == True  # 삭제되지 않은 주석만 포함
+        group_by = None
+
+    stats = get_defect_time_series(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
+        defect_types=defect_types,
+        camera_ids=camera_ids,
+        group_by=group_by
     )
 
-    # 날짜 필터링
-    query = query.filter(Image.date >= start_date, Image.date < end_date + timedelta(days=1))  # 🔧 수정
-    query = query.group_by(*group_by_cols).order_by("period", "label")
-
-    result = query.all()
-
-    # 1. label → class_color 맵 생성 & data_map 구성
-    label_color_map = {}
-    data_map = {}
-    for row in result:
-        label = getattr(row, "label", None)
-        color = getattr(row, "class_color", None)
-        key = (row.period, label)
-        data_map[key] = {
-            "defect_count": row.defect_count,
-            "class_color": color,
-        }
-        if label is not None and color is not None:
-            label_color_map[label] = color
-
-    # 2. label_list 생성
-    label_list = list(set(label for (_, label) in data_map.keys()))
-    if not label_list:
-        label_list = [None]
-
-    # 3. 모든 기간 내 날짜 리스트 생성
-    def generate_date_range(start: date, end: date, unit: str):
-        current = start
-        dates = []
-        while current <= end:
-            if unit in ("week", "month", "custom"):
-                dates.append(current.strftime("%Y-%m-%d"))
-                current += timedelta(days=1)
-            elif unit == "year":
-                dates.append(current.strftime("%Y-%m"))
-                # 다음 달로 이동
-                current = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
-        return dates
-
-    date_list = generate_date_range(start_date, end_date, unit)
-
-    # 5. 응답 리스트 구성
+    # 응답 리스트 구성 (날짜 × 라벨)
     final_result = []
-    for date_str in date_list:
-        for label in label_list:
-            key = (date_str, label)
-            data = data_map.get(key, {"defect_count": 0, "class_color": None})
+    for i, date_str in enumerate(stats["buckets"]):
+        for series in stats["series"]:
             entry = {
                 "date": date_str,
-                "defect_count": data["defect_count"]
+                "defect_count": series["counts"][i]
             }
-            if label is not None:
-                entry["label"] = label
-                entry["class_color"] = data["class_color"] or label_color_map.get(label)
+            if series["label"] is not None:
+                entry["label"] = series["label"]
+                entry["class_color"] = series["class_color"]
             final_result.append(entry)
 
     return final_result
@@ -931,10 +783,17 @@ def delete_images(db: Session, image_ids: List[int]):
         except Exception as e:
             s3_errors.append(f"S3 Error for image {image.image_id}: {str(e)}")
 
+    # 일별 집계에서 삭제 대상 이미지의 기여분 차감, 메인 화면 동기화용 삭제 기록
+    remove_image_contributions(db, existing_image_ids)
+    record_tombstones(db, existing_image_ids)
+
     # 이미지 삭제 (CASCADE로 인해 관련 어노테이션도 자동 삭제)
     for image in existing_images:
         db.delete(image)
 
+    invalidate_after_commit(db, TAG_DEFECTS)
+    run_after_commit(db, lambda: defect_feed.discard(existing_image_ids))
+    run_after_commit(db, heatmap_cache.invalidate)  # 삭제된 박스는 증분 반영이 불가능하므로 재계산
     db.commit()
 
     # S3 오류가 있다면 경고 메시지 추가
@@ -949,26 +808,53 @@ def delete_images(db: Session, image_ids: List[int]):
     }
 
 
-def update_image_status(db: Session, image_id: int, status: str):
-    # 유효한 상태 값인지 확인
-    if status not in ["pending", "completed"]:
+IMAGE_STATUSES = ("pending", "completed")
+
+
+def _validate_status(status: str):
+    if status not in IMAGE_STATUSES:
         raise HTTPException(
             status_code=400,
             detail="Invalid status. Status must be either 'pending' or 'completed'"
         )
 
-    # 이미지 존재 여부 확인
-    image = db.query(Image).filter(Image.image_id == image_id).first()
-    if not image:
+
+# 이미지 상태 변경 (커밋은 호출자가 수행)
+# - 대상 행을 잠그고 상태가 다른 이미지만 UPDATE 1회로 변경, 집계/동기화 시퀀스/캐시 무효화는 배치당 1회
+# 반환: (변경된 image_id 목록, 이미 같은 상태인 image_id 목록) — 없는 이미지는 어느 쪽에도 없음
+def _transition_image_status(db: Session, image_ids: List[int], status: str):
+    rows = db.execute(
+        select(Image.image_id, Image.status).where(Image.image_id.in_(image_ids)).with_for_update()
+    ).all() if image_ids else []
+    changed = [row.image_id for row in rows if row.status != status]
+    unchanged = [row.image_id for row in rows if row.status == status]
+    if not changed:
+        return changed, unchanged
+
+    # completed 진입/이탈 시 일별 집계도 같은 트랜잭션에서 반영
+    if status != "completed":
+        remove_image_contributions(db, changed)
+    db.query(Image).filter(Image.image_id.in_(changed)).update({Image.status: status}, synchronize_session=False)
+    if status == "completed":
+        add_image_contributions(db, changed)
+        clear_leases(db, changed)  # 작업 완료 → 작업 큐 리스 해제
+    touch_images(db, changed)
+    invalidate_after_commit(db, TAG_DEFECTS)
+    return changed, unchanged
+
+
+def update_image_status(db: Session, image_id: int, status: str):
+    # 유효한 상태 값인지 확인
+    _validate_status(status)
+
+    # 이미지 존재 여부 확인 + 상태 업데이트
+    changed, unchanged = _transition_image_status(db, [image_id], status)
+    if not (changed or unchanged):
         raise HTTPException(
             status_code=404,
             detail=f"Image with ID {image_id} not found"
         )
-
-    # 상태 업데이트
-    image.status = status
     db.commit()
-    db.refresh(image)
 
     return {
         "success": True,
@@ -978,6 +864,49 @@ def update_image_status(db: Session, image_id: int, status: str):
     }
 
 
+# 이미지 상태 일괄 변경 (image_ids 또는 filter 조건), 이미지별 결과 반환
+# - filter는 대상 상태가 아닌 이미지만 최신순 최대 BULK_STATUS_MAX건 처리 → truncated면 같은 요청을 반복해 나머지 처리
+def bulk_update_image_status(db: Session, request: annotation_schema.BulkImageStatusRequest):
+    _validate_status(request.status)
+    if (request.image_ids is None) == (request.filter is None):
+        raise HTTPException(status_code=400, detail="image_ids와 filter 중 하나만 지정해야 합니다.")
+
+    truncated = False
+    if request.image_ids is not None:
+        image_ids = list(dict.fromkeys(request.image_ids))  # 중복 제거, 순서 유지
+        if len(image_ids) > BULK_STATUS_MAX:
+            raise HTTPException(status_code=400, detail=f"한 번에 최대 {BULK_STATUS_MAX}건까지 변경할 수 있습니다.")
+    elif request.filter.status == request.status:
+        image_ids = []  # 이미 대상 상태인 이미지만 고르는 조건
+    else:
+        filters = request.filter
+        other_status = next(status for status in IMAGE_STATUSES if status != request.status)
+        query = _main_screen_query(filters, review_only=filters.review_only)._replace(status=other_status)
+        rows = fetch_main_screen(db, query, filters.camera_ids, limit=BULK_STATUS_MAX + 1)
+        truncated = len(rows) > BULK_STATUS_MAX
+        image_ids = [row.image_id for row in rows[:BULK_STATUS_MAX]]
+
+    changed, unchanged = _transition_image_status(db, image_ids, request.status)
+    db.commit()
+
+    changed, unchanged = set(changed), set(unchanged)
+    results = [
+        {
+            "image_id": image_id,
+            "outcome": "updated" if image_id in changed else "unchanged" if image_id in unchanged else "not_found"
+        }
+        for image_id in image_ids
+    ]
+    return {
+        "new_status": request.status,
+        "updated": len(changed),
+        "unchanged": len(unchanged),
+        "not_found": len(image_ids) - len(changed) - len(unchanged),
+        "truncated": truncated,
+        "results": results
+    }
+
+
 # 작업 기록 조회 함수
 def get_annotation_history(db: Session, filters: annotation_schema.AnnotationHistoryFilter):
     # 서브쿼리: 이미지별 주석 중 대표 주석 1건을 선택하기 위한 row_number 부여
@@ -1037,81 +966,255 @@ class AnnotationService:
     def __init__(self, db: Session):
         self.db = db
 
-    def update_image_annotations(self, image_id: int, user_id: int, data: AnnotationBulkUpdate) -> List[AnnotationResponse]:
-        # 1. 기존 annotation ID 목록 조회
-        existing_annotation_ids = set(
-            ann.annotation_id for ann in self.db.query(Annotation)
-            .filter(Annotation.image_id == image_id)
-            .all()
+    # 이미지 행을 잠그고 버전 확인 (같은 이미지 동시 저장은 여기서 직렬화), 현재 버전 반환
+    # expected_version이 None이면 확인 생략 (버전을 보내지 않는 기존 클라이언트)
+    def _lock_image(self, image_id: int, expected_version: Optional[int]) -> int:
+        row = (
+            self.db.query(Image.annotation_version)
+            .filter(Image.image_id == image_id)
+            .with_for_update()
+            .first()
         )
-        
-        # 2. 업데이트할 annotation ID 목록
-        update_annotation_ids = set(
-            ann.annotation_id for ann in data.existing_annotations
-        )
-        
-        # 3. 삭제할 annotation ID 목록 (기존에 있지만 업데이트 목록에 없는 것)
-        delete_annotation_ids = existing_annotation_ids - update_annotation_ids
-        
-        # 4. 소프트 삭제 처리 (is_active = False로 설정)
-        if delete_annotation_ids:
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"Image with ID {image_id} not found")
+        if expected_version is not None and row.annotation_version != expected_version:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "message": "다른 사용자가 먼저 저장했습니다. 최신 어노테이션을 다시 불러오세요.",
+                    "current_version": row.annotation_version
+                }
+            )
+        return row.annotation_version
+
+    # 이미지의 활성 어노테이션 {annotation_id: Annotation} (annotation_ids를 주면 해당 행만)
+    def _active_annotations(self, image_id: int, annotation_ids=None) -> dict:
+        query = self.db.query(Annotation).filter(Annotation.image_id == image_id, Annotation.is_active == True)
+        if annotation_ids is not None:
+            if not annotation_ids:
+                return {}
+            query = query.filter(Annotation.annotation_id.in_(annotation_ids))
+        return {ann.annotation_id: ann for ann in query.all()}
+
+    # 변경분만 반영: 소프트 삭제 1회, 변경 행 bulk UPDATE 1회, 새 행 multi-row INSERT 1회
+    # updates: {annotation_id: {"class_id", "bounding_box"}}, inserts: [{"class_id", "bounding_box"}]
+    # 반환: 새로 생성된 annotation_id 목록 (inserts 순서)
+    def _apply_changes(self, image_id: int, user_id: int, now: datetime, deletes: set, updates: dict, inserts: list) -> List[int]:
+        if deletes:
             self.db.query(Annotation).filter(
-                Annotation.annotation_id.in_(delete_annotation_ids)
+                Annotation.annotation_id.in_(deletes)
             ).update({'is_active': False}, synchronize_session=False)
-        
-        # 5. 업데이트 처리 (conf_score는 그대로 유지)
-        for update_data in data.existing_annotations:
-            self.db.query(Annotation).filter(
-                Annotation.annotation_id == update_data.annotation_id
-            ).update({
-                'class_id': update_data.class_id,
-                'bounding_box': update_data.bounding_box.dict(),  # BoundingBox 객체를 dict로 변환
-                'date': datetime.utcnow(),
-                'user_id': user_id
-                # conf_score는 업데이트하지 않음 (기존 값 유지)
-            })
-        
-        # 6. 새로운 annotation 생성 (conf_score는 null)
-        new_annotations = []
-        for create_data in data.annotations:
-            new_annotation = Annotation(
-                image_id=image_id,
-                class_id=create_data.class_id,
-                bounding_box=create_data.bounding_box.dict(),  # BoundingBox 객체를 dict로 변환
-                date=datetime.utcnow(),
-                conf_score=None,  # 새로 추가되는 어노테이션은 conf_score를 null로 설정
-                user_id=user_id,
-                is_active=True  # 새로 생성하는 어노테이션은 활성 상태
-            )
-            self.db.add(new_annotation)
-            new_annotations.append(new_annotation)
-        
-        # 7. 변경사항 저장
+
+        if updates:
+            # conf_score는 그대로 유지
+            self.db.bulk_update_mappings(Annotation, [
+                {"annotation_id": annotation_id, **values, "date": now, "user_id": user_id}
+                for annotation_id, values in updates.items()
+            ])
+
+        if not inserts:
+            return []
+        # 새로 추가되는 어노테이션은 conf_score를 null, 활성 상태로 생성
+        result = self.db.execute(insert(Annotation).values([
+            {**values, "image_id": image_id, "date": now, "conf_score": None, "user_id": user_id, "is_active": True}
+            for values in inserts
+        ]))
+        # 이미지 행을 잠근 상태이므로 이 이미지에 방금 생긴 행은 이번 INSERT 결과뿐
+        return self.db.execute(
+            select(Annotation.annotation_id)
+            .where(Annotation.image_id == image_id, Annotation.annotation_id >= result.lastrowid)
+            .order_by(Annotation.annotation_id)
+        ).scalars().all()
+
+    # 집계/검수 요약 반영 후 커밋 (검수 요약 갱신 시 버전 +1)
+    # existing_changed: 기존 박스를 수정/삭제했는지 (추가만 했으면 히트맵은 다음 조회 때 증분 반영)
+    def _commit_changes(self, image_id: int, existing_changed: bool):
+        add_image_contributions(self.db, [image_id])
+        refresh_image_summaries(self.db, [image_id])
+        invalidate_after_commit(self.db, TAG_DEFECTS)
+        if existing_changed:
+            run_after_commit(self.db, heatmap_cache.invalidate)  # 기존 박스 수정/삭제 → 히트맵 재계산
         self.db.commit()
-        
-        # 8. 업데이트된 annotation 목록 조회
-        updated_annotations = self.db.query(Annotation).filter(
-            Annotation.image_id == image_id,
-            Annotation.is_active == True
-        ).all()
-        
-        return [AnnotationResponse.from_orm(ann) for ann in updated_annotations]
+
+    # 전체 목록 저장: 저장된 행과 비교해 실제로 바뀐 행만 반영, 반환 (활성 어노테이션 목록, 새 버전)
+    def update_image_annotations(self, image_id: int, user_id: int, data: AnnotationBulkUpdate):
+        # 0. 이미지 잠금 + 버전 확인 (stale write면 409)
+        version = self._lock_image(image_id, data.version)
+
+        # 1. 저장된 활성 어노테이션과 요청 비교
+        stored = self._active_annotations(image_id)
+        unknown_ids = {ann.annotation_id for ann in data.existing_annotations} - set(stored)
+        if unknown_ids:
+            self.db.rollback()  # 이미지 행 잠금 즉시 해제
+            raise ValueError(f"이미지 {image_id}의 활성 어노테이션이 아닙니다: {sorted(unknown_ids)}")
+
+        updates = {}
+        for update_data in data.existing_annotations:
+            current = stored[update_data.annotation_id]
+            values = {"class_id": update_data.class_id, "bounding_box": update_data.bounding_box.dict()}
+            if current.class_id != values["class_id"] or not _same_box(current.bounding_box, values["bounding_box"]):
+                updates[update_data.annotation_id] = values
+
+        # 2. 요청에 없는 기존 어노테이션은 삭제
+        deletes = set(stored) - {ann.annotation_id for ann in data.existing_annotations}
+        inserts = [{"class_id": ann.class_id, "bounding_box": ann.bounding_box.dict()} for ann in data.annotations]
+
+        if not (deletes or updates or inserts):
+            result = [AnnotationResponse.from_orm(ann) for ann in stored.values()]
+            self.db.rollback()  # 변경 없음: 쓰기 없이 잠금만 해제
+            return result, version
+
+        # 3. 변경 전 기여분을 일별 집계에서 차감 (completed 이미지인 경우에만 값이 있음) 후 변경분 반영
+        now = datetime.utcnow()
+        remove_image_contributions(self.db, [image_id])
+        new_ids = self._apply_changes(image_id, user_id, now, deletes, updates, inserts)
+
+        # 4. 응답은 커밋 전에 메모리에서 구성 (재조회 없음)
+        result = [
+            _merged_response(ann, updates.get(annotation_id), user_id, now)
+            for annotation_id, ann in stored.items()
+            if annotation_id not in deletes
+        ]
+        result += [
+            AnnotationResponse(annotation_id=annotation_id, date=now, conf_score=None, user_id=user_id, **values)
+            for annotation_id, values in zip(new_ids, inserts)
+        ]
+
+        self._commit_changes(image_id, bool(deletes or updates))
+        return result, version + 1
+
+    # 변경 작업 목록 적용 (PATCH): 같은 대상 작업은 합친 뒤 한 트랜잭션으로 반영
+    # 반환: {"version", "upserted": 추가/변경된 어노테이션, "removed": 삭제된 annotation_id}
+    def patch_image_annotations(self, image_id: int, user_id: int, patch: AnnotationPatch) -> dict:
+        # 0. 작업 검증/병합 (잘못된 요청은 잠그기 전에 400)
+        changes, added = _coalesce_operations(patch.operations)
+        version = self._lock_image(image_id, patch.version)
+
+        # 1. 대상 어노테이션만 조회
+        stored = self._active_annotations(image_id, list(changes))
+        unknown_ids = set(changes) - set(stored)
+        if unknown_ids:
+            self.db.rollback()
+            raise ValueError(f"이미지 {image_id}의 활성 어노테이션이 아닙니다: {sorted(unknown_ids)}")
+
+        deletes = {annotation_id for annotation_id, values in changes.items() if values is None}
+        updates = {}
+        for annotation_id, values in changes.items():
+            if values is None:
+                continue
+            current = stored[annotation_id]
+            merged = {
+                "class_id": values.get("class_id", current.class_id),
+                "bounding_box": values.get("bounding_box", current.bounding_box),
+            }
+            if merged["class_id"] != current.class_id or not _same_box(current.bounding_box, merged["bounding_box"]):
+                updates[annotation_id] = merged
+        inserts = [values for values in added.values() if values is not None]
+        refs = [key if isinstance(key, str) else None for key, values in added.items() if values is not None]
+
+        if not (deletes or updates or inserts):
+            self.db.rollback()  # 변경 없음 (원래 위치로 되돌린 이동, add 후 remove 등): 버전 유지
+            return {"version": version, "upserted": [], "removed": []}
+
+        # 2. 기여분 차감 후 변경분 반영
+        now = datetime.utcnow()
+        remove_image_contributions(self.db, [image_id])
+        new_ids = self._apply_changes(image_id, user_id, now, deletes, updates, inserts)
+
+        # 3. 바뀐 행만 응답 (커밋 전에 메모리에서 구성)
+        upserted = [
+            AnnotationPatchResult(**_merged_response(stored[annotation_id], values, user_id, now).dict())
+            for annotation_id, values in updates.items()
+        ]
+        upserted += [
+            AnnotationPatchResult(annotation_id=annotation_id, date=now, conf_score=None, user_id=user_id, ref=ref, **values)
+            for annotation_id, ref, values in zip(new_ids, refs, inserts)
+        ]
+
+        self._commit_changes(image_id, bool(deletes or updates))
+        return {"version": version + 1, "upserted": upserted, "removed": sorted(deletes)}
+
+
+PATCH_OPERATIONS = ("add", "move", "resize", "reclassify", "remove")
+
+
+# 작업 목록 검증 + 같은 대상 작업 병합 (자동 저장으로 드래그 중 move가 여러 번 쌓여도 행당 UPDATE 1회)
+# - 기존 어노테이션: 마지막 bounding_box / class_id만 남기고, remove가 있으면 삭제
+# - 같은 요청에서 add한 어노테이션(ref로 참조): 후속 작업을 add 값에 합치고, remove되면 아무것도 쓰지 않음
+# 반환: ({annotation_id: 변경 값 dict 또는 None(삭제)}, {ref 또는 작업 순번: 새 어노테이션 값 또는 None})
+def _coalesce_operations(operations) -> tuple:
+    changes, added = {}, {}
+    for index, operation in enumerate(operations):
+        if operation.op not in PATCH_OPERATIONS:
+            raise ValueError(f"{index}번째 작업: 지원하지 않는 op '{operation.op}' ({', '.join(PATCH_OPERATIONS)})")
+
+        if operation.op == "add":
+            if operation.class_id is None or operation.bounding_box is None:
+                raise ValueError(f"{index}번째 작업: add에는 class_id와 bounding_box가 필요합니다")
+            key = operation.ref if operation.ref is not None else index
+            if key in added:
+                raise ValueError(f"{index}번째 작업: 중복된 ref '{key}'")
+            added[key] = {"class_id": operation.class_id, "bounding_box": operation.bounding_box.dict()}
+            continue
+
+        if (operation.annotation_id is None) == (operation.ref is None):
+            raise ValueError(f"{index}번째 작업: annotation_id와 ref 중 하나만 지정해야 합니다")
+        if operation.ref is not None:
+            if operation.ref not in added:
+                raise ValueError(f"{index}번째 작업: 앞에서 add하지 않은 ref '{operation.ref}'")
+            target, key = added, operation.ref
+        else:
+            target, key = changes, operation.annotation_id
+        if key in target and target[key] is None:
+            raise ValueError(f"{index}번째 작업: 이미 remove한 대상입니다")
+
+        if operation.op == "remove":
+            target[key] = None
+        elif operation.op == "reclassify":
+            if operation.class_id is None:
+                raise ValueError(f"{index}번째 작업: reclassify에는 class_id가 필요합니다")
+            target.setdefault(key, {})["class_id"] = operation.class_id
+        else:  # move / resize
+            if operation.bounding_box is None:
+                raise ValueError(f"{index}번째 작업: {operation.op}에는 bounding_box가 필요합니다")
+            target.setdefault(key, {})["bounding_box"] = operation.bounding_box.dict()
+
+    return changes, added
+
+
+# 저장된 어노테이션 + 변경 값 → 응답 (변경이 없으면 저장된 값 그대로)
+def _merged_response(ann: Annotation, changed: Optional[dict], user_id: int, now: datetime) -> AnnotationResponse:
+    if changed is None:
+        return AnnotationResponse.from_orm(ann)
+    return AnnotationResponse(
+        annotation_id=ann.annotation_id,
+        date=now,
+        conf_score=ann.conf_score,  # conf_score는 그대로 유지
+        user_id=user_id,
+        **changed
+    )
+
+
+# 저장된 박스와 요청 박스가 같은지 (좌표 4개 비교)
+def _same_box(stored: dict, requested: dict) -> bool:
+    if isinstance(stored, str):
+        stored = json.loads(stored)
+    return all(stored.get(key) == requested[key] for key in ("x_center", "y_center", "w", "h"))
 
 
 def get_task_summary_data(db: Session, user_id: int):
     """
     작업 요약 데이터 조회 - main API와 동일한 조회 조건 사용
     """
-    # Main API와 동일한 데이터 조회
-    main_data = get_main_data_filtered(db, user_id)
-    if main_data is None:
+    if not db.query(User.user_id).filter(User.user_id == user_id).first():
         return None
 
-    # Main API에서 이미 계산된 통계 반환
+    # Main API와 동일한 조건으로 상태별 개수만 집계 (이미지 목록은 읽지 않음)
+    counts = count_main_screen(db, MainScreenQuery(review_only=True), get_assigned_camera_ids(db, user_id))
     return {
-        "total_images": main_data["total_images"],
-        "pending_images": main_data["pending_images"],
-        "completed_images": main_data["completed_images"]
+        "total_images": sum(counts.values()),
+        "pending_images": counts.get("pending", 0),
+        "completed_images": counts.get("completed", 0)
     }
 
 
@@ -1141,6 +1244,7 @@ def create_annotation(
         is_active=True
     )
     db.add(annotation)
+    refresh_image_summaries(db, [image_id])
     db.commit()
     db.refresh(annotation)
     return annotation
@@ -1179,7 +1283,7 @@ def get_thumbnail_annotation(db: Session, image_id: int) -> ThumbnailAnnotationR
 
     return ThumbnailAnnotationResponse(
         image_id=image.image_id,
-        file_path=image.file_path,
+        file_path=get_presigned_image_url(image.file_path),
         width=image.width,
         height=image.height,
         annotations=annotations
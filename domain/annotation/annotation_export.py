@@ -0,0 +1,174 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from os import getenv
+from typing import Iterator, List
+from sqlalchemy import select, and_
+from sqlalchemy.orm import Session
+from database.models import Annotation, Camera, DefectClass, Image
+from domain.annotation import annotation_schema
+
+
+# 결함 레코드(어노테이션 단위) 내보내기
+# - 서버 측 커서(stream_results)로 EXPORT_CHUNK_SIZE 행씩 읽어 바로 직렬화 → 전체 결과를 메모리에 올리지 않음
+# - 형식: csv / ndjson / parquet(pyarrow 필요, 청크마다 row group 1개)
+
+EXPORT_CHUNK_SIZE = int(getenv("EXPORT_CHUNK_SIZE", "5000"))
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_COLUMNS = [
+    "image_id", "captured_at", "camera_id", "line_name", "file_path",
+    "annotation_id", "class_id", "class_name", "conf_score",
+    "x_center", "y_center", "w", "h", "user_id", "annotated_at",
+]
+
+
+# completed 이미지의 활성 어노테이션 (Images (status, date) 인덱스 순서로 읽어 정렬 비용 없음)
+def _export_statement(filters: annotation_schema.DefectDataFilter):
+    stmt = (
+        select(
+            Image.image_id, Image.date, Image.camera_id, Camera.line_name, Image.file_path,
+            Annotation.annotation_id, Annotation.class_id, DefectClass.class_name, Annotation.conf_score,
+            Annotation.bounding_box, Annotation.user_id, Annotation.date
+        )
+        .join(Camera, Camera.camera_id == Image.camera_id)
+        .join(Annotation, and_(Annotation.image_id == Image.image_id, Annotation.is_active == True))
+        .join(DefectClass, DefectClass.class_id == Annotation.class_id)
+        .where(Image.status == "completed")
+    )
+
+    if filters.start_date and filters.end_date:
+        start_datetime = datetime.combine(filters.start_date, datetime.min.time())
+        end_datetime = datetime.combine(filters.end_date + timedelta(days=1), datetime.min.time())  # 포함 범위
+        stmt = stmt.where(Image.date >= start_datetime, Image.date < end_datetime)
+    if filters.class_ids:
+        stmt = stmt.where(Annotation.class_id.in_(filters.class_ids))
+    if filters.camera_ids:
+        stmt = stmt.where(Image.camera_id.in_(filters.camera_ids))
+
+    return stmt.order_by(Image.date, Image.image_id, Annotation.annotation_id)
+
+
+def _flatten(row) -> tuple:
+    box = row[9]
+    if isinstance(box, str):
+        box = json.loads(box)
+    if isinstance(box, dict):
+        coords = (box.get("x_center"), box.get("y_center"), box.get("w"), box.get("h"))
+    else:
+        coords = (None, None, None, None)
+    return (row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], *coords, row[10], row[11])
+
+
+# 서버 측 커서로 chunk_size 행씩 읽기
+def iter_export_chunks(db: Session, filters: annotation_schema.DefectDataFilter, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[tuple]]:
+    result = db.execute(
+        _export_statement(filters),
+        execution_options={"stream_results": True, "max_row_buffer": chunk_size}
+    )
+    try:
+        for partition in result.partitions(chunk_size):
+            yield [_flatten(row) for row in partition]
+    finally:
+        result.close()
+
+
+def _csv_stream(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")  # BOM: 엑셀에서 한글 깨짐 방지
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [row[0], row[1].isoformat(sep=" "), *row[2:14], row[14].isoformat(sep=" ") if row[14] else None]
+            for row in chunk
+        )
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_stream(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False, default=str) + "\n"
+            for row in chunk
+        ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 청크마다 꺼내 보내는 출력 대상"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet_stream(chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("image_id", pa.int64()), ("captured_at", pa.timestamp("s")), ("camera_id", pa.int32()),
+        ("line_name", pa.string()), ("file_path", pa.string()), ("annotation_id", pa.int64()),
+        ("class_id", pa.int32()), ("class_name", pa.string()), ("conf_score", pa.float32()),
+        ("x_center", pa.float32()), ("y_center", pa.float32()), ("w", pa.float32()), ("h", pa.float32()),
+        ("user_id", pa.int32()), ("annotated_at", pa.timestamp("s")),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()  # footer 기록
+    yield sink.drain()
+
+
+# pyarrow가 없으면 parquet 내보내기 불가
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# 형식별 바이트 스트림
+def export_defect_records(db: Session, filters: annotation_schema.DefectDataFilter, fmt: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    chunks = iter_export_chunks(db, filters, chunk_size)
+    if fmt == "csv":
+        return _csv_stream(chunks)
+    if fmt == "ndjson":
+        return _ndjson_stream(chunks)
+    if fmt == "parquet":
+        return _parquet_stream(chunks)
+    raise ValueError(f"format은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다.")
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import count
+from os import getenv
+from typing import Iterable, List, Optional
+from database.database import SessionLocal
+from database.models import Camera
+from utils.s3 import get_presigned_image_url
+
+
+# 실시간 결함 탐지 피드 (인메모리)
+# - 업로드 경로가 커밋 후 탐지 이벤트를 1회 publish → 카메라별 링 버퍼에 저장 + 구독자에게 push
+# - 새 구독자는 링 버퍼의 최근 이벤트를 DB 조회 없이 받음
+# - 프로세스 단위 버퍼이므로 업로드와 구독이 같은 워커 프로세스에서 처리되는 배포(uvicorn 단일 워커)를 전제로 함
+
+FEED_BUFFER_SIZE = int(getenv("REALTIME_FEED_BUFFER_SIZE", "50"))  # 카메라별 보관 이벤트 수
+FEED_SUBSCRIBER_QUEUE_SIZE = int(getenv("REALTIME_FEED_QUEUE_SIZE", "500"))  # 느린 구독자는 오래된 이벤트부터 버림
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, camera_ids: Optional[set], line_names: Optional[set]):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=FEED_SUBSCRIBER_QUEUE_SIZE)
+        self.camera_ids = camera_ids
+        self.line_names = line_names
+
+    def accepts(self, event: dict) -> bool:
+        if self.camera_ids and event["camera_id"] not in self.camera_ids:
+            return False
+        if self.line_names and event["line_name"] not in self.line_names:
+            return False
+        return True
+
+    # 이벤트 루프 스레드에서 실행
+    def offer(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class DefectFeed:
+    def __init__(self, buffer_size: int = FEED_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._buffers: dict[int, deque] = {}  # camera_id → 최근 이벤트
+        self._subscribers: set = set()
+        self._sequence = count(1)
+        self._line_names: dict[int, str] = {}
+        self._warmed = False
+
+    # 업로드 경로에서 호출 (커밋 이후, 임의의 스레드)
+    def publish(self, image_id: int, camera_id: int, file_path: str, captured_at: datetime, class_names: Iterable[str]):
+        class_names = list(class_names)
+        if not class_names:
+            return  # 결함이 탐지된 이미지만 피드에 노출 (기존 realtime-check와 동일)
+
+        try:
+            line_name = self._line_name(camera_id)
+        except Exception as e:
+            print(f"⚠️ 카메라 라인 조회 실패 (camera_id={camera_id}): {e}")
+            line_name = ""
+        with self._lock:
+            event = {
+                "seq": next(self._sequence),
+                "image_id": image_id,
+                "camera_id": camera_id,
+                "line_name": line_name,
+                "file_path": file_path,
+                "captured_at": captured_at,
+                "types": class_names,
+            }
+            self._buffer(camera_id).append(event)
+            subscribers = [s for s in self._subscribers if s.accepts(event)]
+
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+            except RuntimeError:
+                pass  # 이벤트 루프가 이미 종료된 구독자
+
+    # 최근 이벤트 (오래된 순), after_seq를 주면 그 이후 이벤트만 (재연결 시 Last-Event-ID)
+    def snapshot(self, camera_ids: Optional[set] = None, line_names: Optional[set] = None, limit: int = 10, after_seq: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            events = [
+                event
+                for camera_id, buffer in self._buffers.items()
+                if not camera_ids or camera_id in camera_ids
+                for event in buffer
+                if (after_seq is None or event["seq"] > after_seq)
+                and (not line_names or event["line_name"] in line_names)
+            ]
+        events.sort(key=lambda e: (e["seq"], e["captured_at"]))
+        return events[-limit:] if limit else events
+
+    # 삭제된 이미지는 이후 스냅샷에서 제외
+    def discard(self, image_ids: Iterable[int]):
+        image_ids = set(image_ids)
+        with self._lock:
+            for camera_id, buffer in self._buffers.items():
+                self._buffers[camera_id] = deque((e for e in buffer if e["image_id"] not in image_ids), maxlen=self.buffer_size)
+
+    def subscribe(self, camera_ids: Optional[set] = None, line_names: Optional[set] = None) -> _Subscriber:
+        subscriber = _Subscriber(asyncio.get_running_loop(), camera_ids, line_names)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    # 서버 시작 후 첫 조회 시 1회만 DB에서 최근 이력을 채움
+    def warm(self):
+        if self._warmed:
+            return
+        from domain.annotation.annotation_crud import get_recent_defect_checks
+
+        db = SessionLocal()
+        try:
+            rows = get_recent_defect_checks(db, limit=self.buffer_size)
+        finally:
+            db.close()
+
+        with self._lock:
+            if self._warmed:
+                return
+            # 최신 이력부터 버퍼 앞쪽에 채움 (시작 후 publish된 이벤트가 항상 뒤에 오도록)
+            for row in sorted(rows, key=lambda r: r.time, reverse=True):
+                self._line_names.setdefault(row.camera_id, row.line_name)
+                buffer = self._buffer(row.camera_id)
+                if len(buffer) >= self.buffer_size or any(e["image_id"] == row.image_id for e in buffer):
+                    continue
+                buffer.appendleft({
+                    "seq": 0,  # 시작 전 이력: Last-Event-ID 재전송 대상 아님
+                    "image_id": row.image_id,
+                    "camera_id": row.camera_id,
+                    "line_name": row.line_name,
+                    "file_path": row.image_url,
+                    "captured_at": row.time,
+                    "types": row.types.split(",") if row.types else [],
+                })
+            self._warmed = True
+
+    def _buffer(self, camera_id: int) -> deque:
+        buffer = self._buffers.get(camera_id)
+        if buffer is None:
+            buffer = self._buffers[camera_id] = deque(maxlen=self.buffer_size)
+        return buffer
+
+    # 카메라 라인 이름 (카메라당 최초 1회만 조회)
+    def _line_name(self, camera_id: int) -> str:
+        line_name = self._line_names.get(camera_id)
+        if line_name is None:
+            db = SessionLocal()
+            try:
+                camera = db.query(Camera.line_name).filter(Camera.camera_id == camera_id).first()
+            finally:
+                db.close()
+            line_name = self._line_names[camera_id] = camera.line_name if camera else ""
+        return line_name
+
+
+defect_feed = DefectFeed()
+
+
+# 피드 이벤트 → 기존 realtime-check 응답 형식 (+ 순번/시각 원본)
+def to_realtime_item(event: dict) -> dict:
+    return {
+        "seq": event["seq"],
+        "image_id": event["image_id"],
+        "image_url": get_presigned_image_url(event["file_path"]),
+        "line_name": event["line_name"],
+        "camera_id": event["camera_id"],
+        "time": event["captured_at"].strftime("PM %I:%M:%S"),
+        "captured_at": event["captured_at"].isoformat(),
+        "type": event["types"],
+    }
@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from os import getenv
+from typing import List, Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from database.models import Annotation, Image
+
+
+# 결함 위치 히트맵 (정규화 좌표 0~1의 박스 중심점 밀도)
+# - 박스 좌표를 청크 단위로 배열에 올려 bincount 한 번으로 격자에 누적
+# - 파라미터 조합별로 격자를 캐시 → 이후 요청은 새로 추가된 어노테이션만 읽어 더함
+# - annotation_id는 INSERT 시점에 할당되고 커밋 순서는 다르므로 (버퍼 flush, /upload, 스트리밍, 검수 저장이 동시에 커밋)
+#   현재 최대 id보다 HEATMAP_SETTLE_IDS만큼 아래(stable)까지만 확정 구간으로 보고 좌표만 청크 단위로 읽어 집계,
+#   그 위의 꼬리 구간은 매 요청 다시 읽고 이미 더한 id와 칸 번호(recent)를 기억해 중복 가산을 막음
+#   → 늦게 커밋된 낮은 id도 뒤 요청에서 반영됨 (INSERT 후 그 뒤로 HEATMAP_SETTLE_IDS개 id가 할당되기 전에 커밋된다는 가정)
+#   → 파이썬 루프와 recent 크기는 꼬리 구간(대략 HEATMAP_SETTLE_IDS건)에 비례, 전체 박스 수와 무관
+# - 기존 어노테이션이 수정/삭제되면 (검수 저장의 수정/삭제, 이미지 삭제) 커밋 후 캐시 전체를 비워 다음 요청에서 재계산
+
+HEATMAP_MAX_BINS = 256
+HEATMAP_CHUNK_SIZE = int(getenv("HEATMAP_CHUNK_SIZE", "200000"))
+HEATMAP_CACHE_ENTRIES = int(getenv("HEATMAP_CACHE_ENTRIES", "64"))
+HEATMAP_SETTLE_IDS = int(getenv("HEATMAP_SETTLE_IDS", "10000"))
+
+
+class _HeatmapEntry:
+    __slots__ = ("grid", "stable", "watermark", "recent", "lock")
+
+    def __init__(self, bins: int):
+        self.grid = np.zeros(bins * bins, dtype=np.int64)
+        self.stable = 0  # 이 id 이하는 모두 격자에 반영된 것으로 간주 (다시 읽지 않음)
+        self.watermark = 0  # 마지막 조회 시점의 최대 annotation_id
+        self.recent = {}  # stable 초과 구간에서 이미 반영한 annotation_id → 칸 번호 (좌표가 없으면 -1)
+        self.lock = threading.Lock()
+
+
+class HeatmapCache:
+    def __init__(self, max_entries: int = HEATMAP_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _HeatmapEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def entry(self, key: tuple, bins: int) -> _HeatmapEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _HeatmapEntry(bins)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+
+heatmap_cache = HeatmapCache()
+
+
+def _box_statement(camera_ids, class_ids, start_date, end_date, after_id: int, upto_id: Optional[int] = None):
+    x = (func.json_extract(Annotation.bounding_box, "$.x_center") + 0).label("x")
+    y = (func.json_extract(Annotation.bounding_box, "$.y_center") + 0).label("y")
+    if upto_id is None:  # 꼬리 구간: 중복 확인용 id 포함
+        stmt = select(Annotation.annotation_id, x, y).where(Annotation.annotation_id > after_id)
+    else:  # 확정 구간: 좌표만
+        stmt = select(x, y).where(Annotation.annotation_id > after_id, Annotation.annotation_id <= upto_id)
+    stmt = stmt.where(Annotation.is_active == True)
+
+    if camera_ids or start_date or end_date:
+        stmt = stmt.join(Image, Image.image_id == Annotation.image_id)
+    if camera_ids:
+        stmt = stmt.where(Image.camera_id.in_(camera_ids))
+    if start_date:
+        stmt = stmt.where(Image.date >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        stmt = stmt.where(Image.date < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    if class_ids:
+        stmt = stmt.where(Annotation.class_id.in_(class_ids))
+    return stmt
+
+
+# 좌표 배열 → 박스별 격자 칸 번호 (좌표가 없으면 -1)
+def _cells(x: np.ndarray, y: np.ndarray, bins: int) -> np.ndarray:
+    valid = ~(np.isnan(x) | np.isnan(y))
+    ix = np.clip(np.where(valid, x, 0) * bins, 0, bins - 1).astype(np.int64)
+    iy = np.clip(np.where(valid, y, 0) * bins, 0, bins - 1).astype(np.int64)
+    return np.where(valid, iy * bins + ix, -1)
+
+
+# 칸 번호 배열 → 칸별 개수 (한 번의 벡터 연산)
+def _bin_counts(cells: np.ndarray, bins: int) -> np.ndarray:
+    return np.bincount(cells[cells >= 0], minlength=bins * bins)
+
+
+def get_defect_heatmap(
+    db: Session,
+    bins: int = 64,
+    camera_ids: Optional[List[int]] = None,
+    class_ids: Optional[List[int]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    if not 1 <= bins <= HEATMAP_MAX_BINS:
+        raise ValueError(f"bins는 1~{HEATMAP_MAX_BINS} 사이여야 합니다.")
+    if start_date and end_date and start_date > end_date:
+        raise ValueError("start_date는 end_date보다 늦을 수 없습니다.")
+
+    key = (bins, tuple(sorted(set(camera_ids or []))), tuple(sorted(set(class_ids or []))), start_date, end_date)
+    entry = heatmap_cache.entry(key, bins)
+
+    # 같은 파라미터의 동시 요청은 한 번만 DB를 읽음
+    with entry.lock:
+        top = db.execute(select(func.max(Annotation.annotation_id))).scalar() or 0
+        settle_to = max(entry.stable, top - HEATMAP_SETTLE_IDS)
+
+        # 1. 새로 확정된 구간 (stable, settle_to]: 좌표만 청크 단위로 배열에 올려 집계
+        #    이 구간에서 이전 요청이 꼬리로 이미 더한 박스는 기억해 둔 칸 번호로 다시 뺌
+        if settle_to > entry.stable:
+            result = db.execute(
+                _box_statement(camera_ids, class_ids, start_date, end_date, entry.stable, settle_to),
+                execution_options={"stream_results": True, "max_row_buffer": HEATMAP_CHUNK_SIZE}
+            )
+            for partition in result.partitions(HEATMAP_CHUNK_SIZE):
+                coords = np.array(partition, dtype=np.float64).reshape(-1, 2)  # NULL → NaN
+                entry.grid += _bin_counts(_cells(coords[:, 0], coords[:, 1], bins), bins)
+
+            settled = [annotation_id for annotation_id in entry.recent if annotation_id <= settle_to]
+            if settled:
+                entry.grid -= _bin_counts(np.array([entry.recent.pop(annotation_id) for annotation_id in settled]), bins)
+            entry.stable = settle_to
+
+        # 2. 꼬리 구간 (settle_to 초과, 대략 HEATMAP_SETTLE_IDS건): 아직 더하지 않은 박스만 가산
+        tail = db.execute(_box_statement(camera_ids, class_ids, start_date, end_date, entry.stable)).all()
+        fresh = [row for row in tail if row[0] not in entry.recent]
+        if fresh:
+            rows = np.array(fresh, dtype=np.float64).reshape(-1, 3)
+            cells = _cells(rows[:, 1], rows[:, 2], bins)
+            entry.grid += _bin_counts(cells, bins)
+            entry.recent.update(zip(rows[:, 0].astype(np.int64).tolist(), cells.tolist()))
+
+        entry.watermark = max(entry.watermark, top)
+        grid = entry.grid.reshape(bins, bins).copy()
+        watermark = entry.watermark
+
+    return {
+        "bins": bins,
+        "total": int(grid.sum()),
+        "max": int(grid.max()) if grid.size else 0,
+        "watermark": watermark,
+        "grid": grid.tolist()  # grid[row=y][col=x], 좌상단이 (0, 0)
+    }
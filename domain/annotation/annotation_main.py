@@ -0,0 +1,180 @@
+import heapq
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+from sqlalchemy import Integer, Text, and_, bindparam, exists, func, or_, select, type_coerce
+from sqlalchemy.orm import Session
+from database.models import Annotation, DefectClass, Image, annotator_camera_association
+from domain.annotation.annotation_review import REVIEW_CONFIDENCE_THRESHOLD
+
+
+# 작업자 메인 화면 이미지 목록 조회 빌더
+# - 필터 조합(상태, 결함 유형, confidence 범위, 카메라)을 하나의 빌더로 구성, (date, image_id) 최신순 keyset 페이지네이션
+# - 필터 "구조"별로 bindparam 자리표시자를 둔 SELECT를 한 번만 만들어 재사용 → 요청마다 식 재구성 없이 컴파일 캐시 적중
+# - 카메라별로 (camera_id, needs_review, date) 인덱스를 역순으로 읽어 limit에서 멈춘 뒤 병합 → 첫 페이지 비용이 백로그 크기와 무관
+# - by_priority: (review_priority, image_id) 높은 순 (camera_id, needs_review, review_priority) 인덱스로 같은 방식의 top-K 조회
+
+MAIN_PAGE_DEFAULT = 50
+MAIN_PAGE_MAX = 200
+MAIN_CHANGES_DEFAULT = 200  # 변경분 동기화 1회 응답 최대 건수 기본값
+MAIN_CHANGES_MAX = 1000
+
+
+# 메인 화면 조회 조건
+class MainScreenQuery(NamedTuple):
+    review_only: bool = False  # 검수 대상(needs_review) 이미지만
+    scored_only: bool = False  # 최저 conf_score가 있는(모델 탐지 박스가 있는) 이미지만
+    status: Optional[str] = None
+    class_names: Tuple[str, ...] = ()
+    min_confidence: Optional[float] = None
+    max_confidence: Optional[float] = None
+    by_priority: bool = False  # 검수 우선순위 높은 순 (기본: 최신순)
+
+
+# SELECT 구조를 결정하는 값 (파라미터 값은 제외) — 구조가 같으면 같은 statement 객체를 재사용
+class _StatementShape(NamedTuple):
+    by_camera: bool
+    review_only: bool
+    scored_only: bool
+    status: bool
+    class_names: bool
+    min_confidence: bool
+    min_includes_null: bool
+    max_confidence: bool
+    keyset: bool
+    limited: bool
+    by_priority: bool
+
+
+# 메인 화면 이미지 항목 컬럼 (Images의 검수 요약 컬럼만 읽음, 어노테이션 집계 없음)
+MAIN_SCREEN_COLUMNS = (
+    Image.camera_id,
+    Image.image_id,
+    Image.file_path,
+    Image.width,
+    Image.height,
+    Image.status,
+    Image.date,
+    Image.active_annotation_count.label("count"),
+    Image.min_conf_score.label("confidence"),
+    Image.review_priority.label("priority"),
+    type_coerce(Image.review_boxes, Text).label("review_boxes")  # JSON 문자열 그대로 (응답 직렬화 시 재파싱 생략 가능)
+)
+
+
+@lru_cache(maxsize=None)
+def _statement(shape: _StatementShape):
+    stmt = select(*MAIN_SCREEN_COLUMNS)
+
+    if shape.by_camera:
+        stmt = stmt.where(Image.camera_id == bindparam("camera_id"))
+    if shape.review_only:
+        stmt = stmt.where(Image.needs_review == True)
+    if shape.scored_only:
+        stmt = stmt.where(Image.min_conf_score < REVIEW_CONFIDENCE_THRESHOLD)  # NULL(수동 박스만 있는 이미지) 제외
+    if shape.status:
+        stmt = stmt.where(Image.status == bindparam("status"))
+    if shape.class_names:
+        # 지정한 결함 유형의 활성 어노테이션이 있는 이미지
+        stmt = stmt.where(
+            exists()
+            .where(Annotation.image_id == Image.image_id, Annotation.is_active == True)
+            .where(DefectClass.class_id == Annotation.class_id)
+            .where(DefectClass.class_name.in_(bindparam("class_names", expanding=True)))
+        )
+    if shape.min_confidence:
+        condition = Image.min_conf_score >= bindparam("min_confidence")
+        if shape.min_includes_null:
+            condition = or_(condition, Image.min_conf_score.is_(None))  # min_confidence=0이면 annotation이 없는 이미지도 포함
+        stmt = stmt.where(condition)
+    if shape.max_confidence:
+        stmt = stmt.where(Image.min_conf_score <= bindparam("max_confidence"))
+    order_column = Image.review_priority if shape.by_priority else Image.date
+    if shape.keyset:
+        after_value = bindparam("after_value", type_=order_column.type)
+        stmt = stmt.where(or_(
+            order_column < after_value,
+            and_(order_column == after_value, Image.image_id < bindparam("after_id"))
+        ))
+
+    stmt = stmt.order_by(order_column.desc(), Image.image_id.desc())
+    if shape.limited:
+        stmt = stmt.limit(bindparam("limit", type_=Integer))
+    return stmt
+
+
+def _shape_and_params(query: MainScreenQuery, by_camera: bool, after, limit: Optional[int]):
+    shape = _StatementShape(
+        by_camera=by_camera,
+        review_only=query.review_only,
+        scored_only=query.scored_only,
+        status=bool(query.status),
+        class_names=bool(query.class_names),
+        min_confidence=query.min_confidence is not None,
+        min_includes_null=query.min_confidence == 0 and not query.scored_only,
+        max_confidence=query.max_confidence is not None,
+        keyset=after is not None,
+        limited=limit is not None,
+        by_priority=query.by_priority
+    )
+    params = {
+        "status": query.status,
+        "class_names": list(query.class_names) or None,
+        "min_confidence": query.min_confidence,
+        "max_confidence": query.max_confidence,
+        "limit": limit,
+    }
+    if after is not None:
+        params["after_value"], params["after_id"] = after
+    return shape, {key: value for key, value in params.items() if value is not None}
+
+
+# 정렬 기준 값 (다음 페이지 cursor에도 사용)
+def main_screen_sort_value(query: MainScreenQuery, row):
+    return row.priority if query.by_priority else row.date
+
+
+# 작업자에게 할당된 카메라 목록
+def get_assigned_camera_ids(db: Session, user_id: int) -> List[int]:
+    return db.execute(
+        select(annotator_camera_association.c.camera_id)
+        .where(annotator_camera_association.c.user_id == user_id)
+        .order_by(annotator_camera_association.c.camera_id)
+    ).scalars().all()
+
+
+# 조건에 맞는 이미지를 최신순(by_priority면 우선순위 높은 순)으로 조회
+# - camera_ids=None: 전체 카메라, 빈 목록: 결과 없음
+# - after: 직전 페이지 마지막 행의 (date 또는 priority, image_id), limit=None이면 전체
+def fetch_main_screen(
+    db: Session,
+    query: MainScreenQuery,
+    camera_ids: Optional[List[int]] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None
+):
+    if camera_ids is None:
+        shape, params = _shape_and_params(query, False, after, limit)
+        return db.execute(_statement(shape), params).all()
+
+    # 카메라별 인덱스 범위에서 최대 limit건씩 읽고 (date 또는 priority, image_id) 역순 병합
+    shape, params = _shape_and_params(query, True, after, limit)
+    statement = _statement(shape)
+    per_camera = [
+        db.execute(statement, {**params, "camera_id": camera_id}).all()
+        for camera_id in sorted(set(camera_ids))
+    ]
+    merged = heapq.merge(*per_camera, key=lambda row: (main_screen_sort_value(query, row), row.image_id), reverse=True)
+    return list(merged) if limit is None else [row for _, row in zip(range(limit), merged)]
+
+
+# 조건에 맞는 이미지의 상태별 개수 (작업 요약용, 목록은 읽지 않음)
+def count_main_screen(db: Session, query: MainScreenQuery, camera_ids: Optional[List[int]] = None) -> dict:
+    shape, params = _shape_and_params(query, False, None, None)
+    filtered = _statement(shape).where(Image.camera_id.in_(camera_ids)) if camera_ids is not None else _statement(shape)
+    filtered = filtered.order_by(None).subquery()
+
+    rows = db.execute(
+        select(filtered.c.status, func.count()).group_by(filtered.c.status),
+        params
+    ).all()
+    return {status: count for status, count in rows}
@@ -0,0 +1,153 @@
+import heapq
+from datetime import datetime, timedelta
+from os import getenv
+from typing import List, Optional
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+from database.models import Image
+from domain.annotation.annotation_main import MAIN_SCREEN_COLUMNS
+
+
+# 작업자 작업 큐 (리스 기반)
+# - claim: 할당 카메라의 검수 대기(pending + needs_review) 이미지를 우선순위 순으로 N건 임대
+#   카메라별 큐 인덱스 범위를 SELECT ... FOR UPDATE SKIP LOCKED로 최대 N건만 읽음 → 비용은 백로그가 아닌 N에 비례,
+#   다른 작업자가 잠근 행은 기다리지 않고 건너뜀
+# - 큐 인덱스는 (camera_id, needs_review, status, lease_expires_at, 정렬 컬럼) 순서
+#   → 리스가 없는 행(lease_expires_at IS NULL)과 만료된 리스(< now)를 따로 읽어 합침
+#   → 유효한 리스가 걸린 행은 읽는 범위에 들어오지 않으므로 임대 중인 이미지가 많아도 비용이 늘지 않음
+# - 리스는 lease_expires_at이 지나면 다른 작업자가 다시 가져갈 수 있음 (별도 회수 작업 없음)
+# - 본인의 유효한 리스는 claim 시 먼저(count에 포함) 반환되고 만료 시각이 연장됨 (재접속/새로고침 시 같은 작업 유지)
+#   남은 건수만 새로 임대
+# - 이미지가 completed가 되면 리스 해제
+
+WORK_QUEUE_LEASE_SECONDS = int(getenv("WORK_QUEUE_LEASE_SECONDS", "600"))
+WORK_QUEUE_CLAIM_MAX = int(getenv("WORK_QUEUE_CLAIM_MAX", "50"))
+
+# 정렬 기준: (정렬 컬럼, 내림차순 여부) — 인덱스 ix_images_lease_queue_priority / _confidence / _date 순서와 일치
+QUEUE_ORDERS = {
+    "priority": ((Image.review_priority, Image.image_id), True),  # 검수 우선순위 높은 순
+    "confidence": ((Image.min_conf_score, Image.image_id), False),  # 최저 confidence 낮은 순 (수동 박스만 있는 이미지 먼저)
+    "oldest": ((Image.date, Image.image_id), False),  # 오래된 순
+}
+
+
+def _queued(camera_id: int):
+    return and_(Image.camera_id == camera_id, Image.needs_review == True, Image.status == "pending")
+
+
+def _own_lease(user_id: int, now: datetime):
+    return and_(
+        Image.needs_review == True,
+        Image.status == "pending",
+        Image.lease_user_id == user_id,
+        Image.lease_expires_at >= now
+    )
+
+
+def _sort_key(row):
+    # NULL(min_conf_score 없음)을 DB 정렬(ASC에서 NULL 먼저)과 같게 맞춤
+    first, image_id = row[1], row[2]
+    return (first is not None, first, image_id)
+
+
+# 할당 카메라에서 최대 count건 임대 (커밋은 호출자가 수행)
+# 반환: 본인의 유효한 리스(정렬 순) 다음에 새로 임대한 이미지(정렬 순)를 이은 image_id 목록
+def claim_images(db: Session, user_id: int, camera_ids: List[int], count: int, order: str = "priority", now: Optional[datetime] = None) -> List[int]:
+    if order not in QUEUE_ORDERS:
+        raise ValueError(f"지원하지 않는 정렬 기준: {order} ({', '.join(QUEUE_ORDERS)})")
+    count = max(1, min(count, WORK_QUEUE_CLAIM_MAX))
+    now = now or datetime.utcnow()
+    columns, descending = QUEUE_ORDERS[order]
+    order_by = [column.desc() for column in columns] if descending else columns
+
+    camera_ids = sorted(set(camera_ids))
+    if not camera_ids:
+        return []
+
+    # 본인의 유효한 리스 먼저 (ix_images_lease_user 범위 조회, 본인 것이므로 다른 작업자와 경합하지 않음)
+    image_ids = db.execute(
+        select(Image.image_id)
+        .where(_own_lease(user_id, now), Image.camera_id.in_(camera_ids))
+        .order_by(*order_by)
+        .limit(count)
+        .with_for_update()
+    ).scalars().all()
+
+    # 남은 건수만 카메라별로 잠금 가능한 상위 행을 잠금 (SKIP LOCKED: 다른 작업자가 잡고 있는 행은 건너뜀)
+    # 리스 없는 행(IS NULL 동등 조건 → 정렬 컬럼 순 인덱스 범위)과 만료된 리스(회수 안 된 행만)를 각각 읽음
+    remaining = count - len(image_ids)
+    if remaining > 0:
+        per_camera = [
+            db.execute(
+                select(Image.image_id, *columns)
+                .where(_queued(camera_id), lease)
+                .order_by(*order_by)
+                .limit(remaining)
+                .with_for_update(skip_locked=True)
+            ).all()
+            for camera_id in camera_ids
+            for lease in (Image.lease_expires_at.is_(None), Image.lease_expires_at < now)
+        ]
+        merged = heapq.merge(*per_camera, key=_sort_key, reverse=descending)
+        image_ids += [row.image_id for _, row in zip(range(remaining), merged)]
+    if not image_ids:
+        return []
+
+    db.query(Image).filter(Image.image_id.in_(image_ids)).update(
+        {Image.lease_user_id: user_id, Image.lease_expires_at: now + timedelta(seconds=WORK_QUEUE_LEASE_SECONDS)},
+        synchronize_session=False
+    )
+    return image_ids
+
+
+# 본인 리스 연장 (작업 중 heartbeat), 연장된 image_id 목록 반환
+def renew_leases(db: Session, user_id: int, image_ids: List[int], now: Optional[datetime] = None) -> List[int]:
+    if not image_ids:
+        return []
+    now = now or datetime.utcnow()
+    owned = and_(
+        Image.image_id.in_(image_ids),
+        Image.lease_user_id == user_id,
+        Image.lease_expires_at >= now,  # 이미 만료된 리스는 다른 작업자가 가져갔을 수 있으므로 다시 claim해야 함
+        Image.status == "pending"
+    )
+    renewed = db.execute(select(Image.image_id).where(owned).with_for_update()).scalars().all()
+    if renewed:
+        db.query(Image).filter(Image.image_id.in_(renewed)).update(
+            {Image.lease_expires_at: now + timedelta(seconds=WORK_QUEUE_LEASE_SECONDS)},
+            synchronize_session=False
+        )
+    return renewed
+
+
+# 본인 리스 반납 (작업하지 않고 큐로 되돌림), 반납된 image_id 목록 반환
+def release_leases(db: Session, user_id: int, image_ids: List[int]) -> List[int]:
+    if not image_ids:
+        return []
+    owned = and_(Image.image_id.in_(image_ids), Image.lease_user_id == user_id)
+    released = db.execute(select(Image.image_id).where(owned).with_for_update()).scalars().all()
+    if released:
+        db.query(Image).filter(Image.image_id.in_(released)).update(
+            {Image.lease_user_id: None, Image.lease_expires_at: None},
+            synchronize_session=False
+        )
+    return released
+
+
+# 작업이 끝난(completed) 이미지의 리스 해제 (상태 변경과 같은 트랜잭션에서 호출)
+def clear_leases(db: Session, image_ids: List[int]):
+    if not image_ids:
+        return
+    db.query(Image).filter(
+        Image.image_id.in_(image_ids),
+        Image.lease_user_id.isnot(None)
+    ).update({Image.lease_user_id: None, Image.lease_expires_at: None}, synchronize_session=False)
+
+
+# 임대한 이미지의 메인 화면 항목 (image_ids 순서 유지)
+def fetch_claimed(db: Session, image_ids: List[int]):
+    if not image_ids:
+        return []
+    rows = db.execute(select(*MAIN_SCREEN_COLUMNS).where(Image.image_id.in_(image_ids))).all()
+    by_id = {row.image_id: row for row in rows}
+    return [by_id[image_id] for image_id in image_ids if image_id in by_id]
@@ -0,0 +1,118 @@
+from typing import Iterable
+from sqlalchemy import and_, case, exists, func, or_, select
+from sqlalchemy.orm import Session
+from database.models import Annotation, Camera, DefectClass, Image
+from domain.annotation.annotation_sync import touch_images
+
+
+# 이미지별 검수 요약 (Images.active_annotation_count / min_conf_score / needs_review / review_boxes) 유지 함수 모음
+# - 메인 화면/관리자 화면은 GROUP BY ... HAVING 없이 Images 인덱스 범위 조회만 하도록 요약 컬럼을 사용
+# - 어노테이션을 쓰는 경로에서 커밋 전에 refresh_image_summaries를 호출하면 같은 트랜잭션에서 요약이 맞춰짐
+# - 검수 대상(needs_review): 어노테이션이 1건 이상 있고, 활성 어노테이션의 최저 conf_score가 기준 미만이거나 없음
+# - 검수 우선순위(review_priority, 검수 대상만): 라인 가중치 × (불확실도 + 결함 유형 보너스), ×1000 정수로 저장
+#   불확실도: conf_score가 기준값에 가장 가까운 박스 기준 1(기준값과 같음) ~ 0(기준값과 차이가 기준값 이상), 점수 없으면 0
+#   결함 유형 보너스: 활성 박스 클래스 중 가장 큰 DefectClasses.review_weight - 1 (기본 1 → 0)
+#   라인 가중치: Cameras.review_weight
+
+REVIEW_CONFIDENCE_THRESHOLD = 0.75
+REVIEW_PRIORITY_SCALE = 1000
+
+
+# Images.image_id에 상관된 요약 값 서브쿼리 (UPDATE ... SET 컬럼 = (SELECT ...))
+def _summary_values() -> dict:
+    active = and_(Annotation.image_id == Image.image_id, Annotation.is_active == True)
+
+    min_conf = select(func.min(Annotation.conf_score)).where(active).scalar_subquery()
+    boxes = (
+        select(func.json_arrayagg(func.json_object(
+            "bounding_box", Annotation.bounding_box,
+            "class_name", DefectClass.class_name,
+            "class_color", DefectClass.class_color,
+            "is_active", Annotation.is_active
+        )))
+        .join(DefectClass, DefectClass.class_id == Annotation.class_id)
+        .where(active)
+        .scalar_subquery()
+    )
+    has_annotations = exists().where(Annotation.image_id == Image.image_id)
+    needs_review = and_(has_annotations, or_(min_conf.is_(None), min_conf < REVIEW_CONFIDENCE_THRESHOLD))
+
+    return {
+        Image.active_annotation_count: select(func.count()).where(active).scalar_subquery(),
+        Image.min_conf_score: min_conf,
+        Image.needs_review: case((needs_review, True), else_=False),
+        Image.review_priority: case((needs_review, _priority(active)), else_=0),
+        Image.review_boxes: func.coalesce(boxes, func.json_array()),
+    }
+
+
+# 검수 우선순위 식 (모듈 상단 설명 참고)
+def _priority(active):
+    margin = (
+        select(func.min(func.abs(Annotation.conf_score - REVIEW_CONFIDENCE_THRESHOLD)))
+        .where(active, Annotation.conf_score.isnot(None))
+        .scalar_subquery()
+    )
+    uncertainty = 1 - func.least(func.coalesce(margin, REVIEW_CONFIDENCE_THRESHOLD) / REVIEW_CONFIDENCE_THRESHOLD, 1)
+    class_weight = (
+        select(func.max(DefectClass.review_weight))
+        .join(Annotation, Annotation.class_id == DefectClass.class_id)
+        .where(active)
+        .scalar_subquery()
+    )
+    line_weight = select(Camera.review_weight).where(Camera.camera_id == Image.camera_id).scalar_subquery()
+    score = func.coalesce(line_weight, 1) * (uncertainty + func.coalesce(class_weight, 1) - 1)
+    return func.round(score * REVIEW_PRIORITY_SCALE)
+
+
+# 어노테이션이 바뀐 이미지들의 요약 재계산 (커밋은 호출자가 수행)
+# bump_version=False: 어노테이션은 그대로이고 요약만 다시 계산하는 경우 (편집 중인 작업자에게 409가 나지 않도록)
+def refresh_image_summaries(db: Session, image_ids: Iterable[int], bump_version: bool = True):
+    image_ids = list(set(image_ids))
+    if not image_ids:
+        return
+
+    db.flush()  # autoflush=False이므로 추가/수정한 어노테이션을 먼저 반영
+    values = _summary_values()
+    if bump_version:
+        values[Image.annotation_version] = Image.annotation_version + 1  # 어노테이션 저장 충돌 감지용 버전
+    db.query(Image).filter(Image.image_id.in_(image_ids)).update(values, synchronize_session=False)
+    touch_images(db, image_ids)  # 메인 화면 변경분 동기화 대상
+
+
+# 결함 클래스 이름/색상/가중치 변경 시 해당 클래스 박스를 가진 이미지의 렌더링 정보/우선순위 재계산
+# bump_version: 이름/색상 변경처럼 편집 화면의 박스 표시가 바뀌는 경우에만 True (가중치만 바뀌면 False)
+def refresh_class_summaries(db: Session, class_id: int, bump_version: bool = True):
+    db.flush()
+    affected = db.execute(
+        select(Annotation.image_id).where(Annotation.class_id == class_id, Annotation.is_active == True).distinct()
+    ).scalars().all()
+    refresh_image_summaries(db, affected, bump_version=bump_version)
+
+
+# 라인 가중치 변경 시 해당 카메라의 검수 대상 이미지 우선순위 재계산
+def refresh_camera_priorities(db: Session, camera_id: int):
+    db.flush()
+    affected = db.execute(
+        select(Image.image_id).where(Image.camera_id == camera_id, Image.needs_review == True)
+    ).scalars().all()
+    if not affected:
+        return
+    db.query(Image).filter(Image.image_id.in_(affected)).update(_summary_values(), synchronize_session=False)
+    touch_images(db, affected)
+
+
+# 전체 이미지 요약 재계산 (마이그레이션 직후 백필/복구용), 검수 대상 이미지 수 반환
+def rebuild_review_summaries(db: Session, chunk_size: int = 5000) -> int:
+    last_id = 0
+    while True:
+        image_ids = db.execute(
+            select(Image.image_id).where(Image.image_id > last_id).order_by(Image.image_id).limit(chunk_size)
+        ).scalars().all()
+        if not image_ids:
+            break
+        refresh_image_summaries(db, image_ids, bump_version=False)
+        db.commit()  # 청크마다 커밋해 잠금 시간을 짧게 유지
+        last_id = image_ids[-1]
+
+    return db.query(func.count(Image.image_id)).filter(Image.needs_review == True).scalar()
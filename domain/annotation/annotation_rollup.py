@@ -0,0 +1,132 @@
+from collections import defaultdict
+from os import getenv
+from typing import Iterable
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+from database.models import Annotation, Image, DefectDailyRollup, DefectHourlyRollup
+from utils.cache import TTLCache, run_after_commit
+from utils.response_cache import invalidate_after_commit, TAG_DEFECTS
+
+
+# 일별/시간별 결함 집계(DefectDailyRollups, DefectHourlyRollups) 유지 함수 모음
+# - 집계 대상: status='completed' 이미지의 is_active=True 어노테이션
+# - 쓰기 경로에서 변경 "전"에 remove, 변경 "후"에 add를 호출하면 같은 트랜잭션 안에서 집계가 맞춰짐
+# - SessionLocal은 autoflush=False이므로 add 전에 반드시 flush 필요 (함수 내부에서 처리)
+# - 실제 증감분이 있을 때만 커밋 후 금일 개요 캐시와 응답 캐시(TAG_DEFECTS)를 무효화
+#   → pending으로 들어오는 업로드 프레임은 대시보드 캐시를 비우지 않음
+
+
+# 금일 결함 개요(/annotations/summary) 공유 캐시: 모든 대시보드가 TTL당 1회만 조회
+# 집계가 바뀌는 트랜잭션(이미지 completed 전환 등)이 커밋되면 즉시 무효화
+DEFECT_SUMMARY_CACHE_TTL = float(getenv("DEFECT_SUMMARY_CACHE_TTL", "5"))
+defect_summary_cache = TTLCache(DEFECT_SUMMARY_CACHE_TTL)
+
+
+# Images.date를 정시로 내림한 시각 (시간별 집계 키)
+def _hour_bucket(column):
+    return func.date_format(column, "%Y-%m-%d %H:00:00")
+
+
+# 이미지 목록이 현재 집계에 기여하는 (hour, camera_id, class_id, count) 조회
+def _image_contributions(db: Session, image_ids: Iterable[int]):
+    image_ids = list(set(image_ids))
+    if not image_ids:
+        return []
+
+    hour = _hour_bucket(Image.date)
+    return (
+        db.query(
+            hour.label("hour"),
+            Image.camera_id,
+            Annotation.class_id,
+            func.count().label("count")
+        )
+        .join(Annotation, Annotation.image_id == Image.image_id)
+        .filter(
+            Image.image_id.in_(image_ids),
+            Image.status == "completed",
+            Annotation.is_active == True
+        )
+        .group_by(hour, Image.camera_id, Annotation.class_id)
+        .all()
+    )
+
+
+# 집계 테이블에 증감분을 반영 (없으면 생성)
+def _upsert_counts(db: Session, model, values: list):
+    stmt = mysql_insert(model).values(values)
+    stmt = stmt.on_duplicate_key_update(
+        defect_count=model.defect_count + stmt.inserted.defect_count
+    )
+    db.execute(stmt)
+
+
+# 시간별 기여분을 시간별/일별 집계에 함께 반영
+def _apply_delta(db: Session, rows, sign: int):
+    if not rows:
+        return
+
+    hourly_values = []
+    daily_counts = defaultdict(int)
+    for row in rows:
+        hourly_values.append({"hour": row.hour, "camera_id": row.camera_id, "class_id": row.class_id, "defect_count": sign * row.count})
+        daily_counts[(row.hour[:10], row.camera_id, row.class_id)] += sign * row.count  # "YYYY-MM-DD HH:00:00" → 날짜
+
+    daily_values = [
+        {"day": day, "camera_id": camera_id, "class_id": class_id, "defect_count": count}
+        for (day, camera_id, class_id), count in daily_counts.items()
+    ]
+
+    _upsert_counts(db, DefectHourlyRollup, hourly_values)
+    _upsert_counts(db, DefectDailyRollup, daily_values)
+    run_after_commit(db, defect_summary_cache.invalidate)
+    invalidate_after_commit(db, TAG_DEFECTS)
+
+
+# 변경 전 호출: 이미지들의 현재 기여분을 집계에서 차감
+def remove_image_contributions(db: Session, image_ids: Iterable[int]):
+    db.flush()
+    _apply_delta(db, _image_contributions(db, image_ids), -1)
+
+
+# 변경 후 호출: 이미지들의 새 기여분을 집계에 가산
+def add_image_contributions(db: Session, image_ids: Iterable[int]):
+    db.flush()
+    _apply_delta(db, _image_contributions(db, image_ids), 1)
+
+
+# 집계 테이블 전체 재생성 (복구용), 재생성된 일별 집계 행 수 반환
+def rebuild_defect_rollup(db: Session) -> int:
+    hour = _hour_bucket(Image.date)
+    hourly_source = (
+        select(hour, Image.camera_id, Annotation.class_id, func.count())
+        .join(Annotation, Annotation.image_id == Image.image_id)
+        .where(Image.status == "completed", Annotation.is_active == True)
+        .group_by(hour, Image.camera_id, Annotation.class_id)
+    )
+
+    db.query(DefectHourlyRollup).delete(synchronize_session=False)
+    db.query(DefectDailyRollup).delete(synchronize_session=False)
+    db.execute(
+        insert(DefectHourlyRollup).from_select(
+            ["hour", "camera_id", "class_id", "defect_count"], hourly_source
+        )
+    )
+
+    # 일별 집계는 방금 만든 시간별 집계에서 다시 합산
+    day = func.date(DefectHourlyRollup.hour)
+    daily_source = (
+        select(day, DefectHourlyRollup.camera_id, DefectHourlyRollup.class_id, func.sum(DefectHourlyRollup.defect_count))
+        .group_by(day, DefectHourlyRollup.camera_id, DefectHourlyRollup.class_id)
+    )
+    db.execute(
+        insert(DefectDailyRollup).from_select(
+            ["day", "camera_id", "class_id", "defect_count"], daily_source
+        )
+    )
+    run_after_commit(db, defect_summary_cache.invalidate)
+    invalidate_after_commit(db, TAG_DEFECTS)
+    db.commit()
+
+    return db.query(func.count()).select_from(DefectDailyRollup).scalar()
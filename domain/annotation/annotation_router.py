@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from database.database import get_db
+from database.database import get_db, SessionLocal
+from fastapi.encoders import jsonable_encoder
 from domain.annotation import annotation_crud, annotation_schema
 from typing import List, Optional
 from domain.annotation.annotation_schema import MainScreenResponse, ImageSummary, AnnotationBulkUpdate, AnnotationResponse
 from datetime import date, timedelta
 from domain.annotation.annotation_crud import AnnotationService
 import json  # JSON 파싱을 위한 모듈 추가
-from database.models import DefectClass  # DefectClass 모델 추가
 from domain.annotation.annotation_schema import ThumbnailAnnotationResponse
+from utils.s3 import get_presigned_image_url
+from domain.annotation.annotation_stats import get_defect_time_series
+from utils.response_cache import cached_endpoint, TAG_DEFECTS, TAG_CLASSES
+from utils.fast_response import fast_response
+from domain.annotation.annotation_feed import defect_feed, to_realtime_item, FEED_BUFFER_SIZE
+from domain.annotation.annotation_heatmap import get_defect_heatmap, HEATMAP_MAX_BINS
+from domain.annotation.annotation_export import EXPORT_FORMATS, export_defect_records, parquet_available
 
 
 router = APIRouter(
@@ -17,35 +27,171 @@ router = APIRouter(
 )
 
 @router.get("/summary", response_model=annotation_schema.DefectSummaryResponse)
+@cached_endpoint("annotations.summary", tags=(TAG_DEFECTS, TAG_CLASSES), response_model=annotation_schema.DefectSummaryResponse)
 def get_defect_summary_with_change(db: Session = Depends(get_db)):
     return annotation_crud.get_defect_summary(db)
 
+# 결함 데이터 목록 (구 API, 응답 형식 유지): 최신순 첫 페이지만 반환
+# 더 있으면 X-Next-Cursor 헤더의 cursor로 /defect-data/page에서 이어 받음 (전체는 /defect-data/stream)
 @router.post("/defect-data/list", response_model=List[annotation_schema.DefectDataItem])
 def get_defect_data_list_api(
     filters: annotation_schema.DefectDataFilter,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    return annotation_crud.get_filtered_defect_data_list(db, filters)
+    page = annotation_crud.get_filtered_defect_data_list(db, filters)
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
+
+# 결함 데이터 목록 페이지 조회 (최신순, next_cursor로 다음 페이지 요청)
+@router.post("/defect-data/page", response_model=annotation_schema.DefectDataPage)
+def get_defect_data_page_api(
+    request: annotation_schema.DefectDataPageRequest,
+    db: Session = Depends(get_db)
+):
+    return annotation_crud.get_defect_data_page(db, request, request.cursor, request.limit)
+
+# 결함 데이터 목록 스트리밍 (NDJSON: 한 줄에 이미지 1건, 페이지 단위로 조회하며 바로 전송)
+@router.post("/defect-data/stream")
+def stream_defect_data_api(filters: annotation_schema.DefectDataFilter):
+    def lines():
+        db = SessionLocal()  # 스트림이 끝날 때까지 유지되는 전용 세션
+        try:
+            for item in annotation_crud.iter_defect_data(db, filters):
+                yield json.dumps(jsonable_encoder(item), ensure_ascii=False) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# 결함 레코드 내보내기 (어노테이션 단위, 서버 측 커서로 청크 스트리밍)
+@router.post("/export")
+def export_defect_records_api(
+    filters: annotation_schema.DefectDataFilter,
+    format: str = Query("csv", enum=list(EXPORT_FORMATS))
+):
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="parquet 내보내기에는 pyarrow 설치가 필요합니다.")
+    media_type, extension = EXPORT_FORMATS[format]
+
+    def body():
+        db = SessionLocal()  # 스트림이 끝날 때까지 유지되는 전용 세션
+        try:
+            yield from export_defect_records(db, filters, format)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="defects_{date.today():%Y%m%d}.{extension}"'}
+    )
 
 @router.get("/class-summary", response_model=list[annotation_schema.DefectClassSummaryResponse])
+@cached_endpoint("annotations.class_summary", tags=(TAG_DEFECTS, TAG_CLASSES), response_model=List[annotation_schema.DefectClassSummaryResponse])
 def read_defect_class_summary(db: Session = Depends(get_db)):
     return annotation_crud.get_defect_class_summary(db)
 
+# 실시간 결함 탐지 이력: DB 대신 인메모리 피드의 최근 이벤트로 응답 (최신순)
 @router.get("/realtime-check", response_model=list[annotation_schema.RealtimeCheckResponse])
-def get_realtime_check_list(db: Session = Depends(get_db)):
-    raw_data = annotation_crud.get_recent_defect_checks(db)
-
-    result = []
-    for row in raw_data:
-        result.append({
-            "image_url": row.image_url,
-            "line_name": row.line_name,
-            "camera_id": row.camera_id,
-            "time": row.time.strftime("PM %I:%M:%S"),  # 🕒 시간 포맷 변경
-            "type": row.types.split(",") if row.types else []  # 결함 종류 여러 개
-        })
+def get_realtime_check_list(
+    limit: int = Query(10, ge=1, le=FEED_BUFFER_SIZE),
+    camera_id: Optional[List[int]] = Query(default=None),
+    line_name: Optional[List[str]] = Query(default=None)
+):
+    defect_feed.warm()  # 서버 시작 후 최초 1회만 DB 조회
+    events = defect_feed.snapshot(set(camera_id or []), set(line_name or []), limit=limit)
+    return [to_realtime_item(event) for event in reversed(events)]
 
-    return result
+SSE_HEARTBEAT_SECONDS = 15
+
+def _sse_message(event: dict) -> str:
+    return f"id: {event['seq']}\nevent: defect\ndata: {json.dumps(to_realtime_item(event), ensure_ascii=False)}\n\n"
+
+# 실시간 결함 탐지 피드 (Server-Sent Events)
+# - 연결 시 최근 last건(또는 Last-Event-ID 이후 이벤트)을 먼저 보내고, 이후 새 탐지를 push
+@router.get("/realtime/stream")
+async def stream_realtime_checks(
+    request: Request,
+    camera_id: Optional[List[int]] = Query(default=None),
+    line_name: Optional[List[str]] = Query(default=None),
+    last: int = Query(10, ge=0, le=FEED_BUFFER_SIZE)
+):
+    await run_in_threadpool(defect_feed.warm)
+    camera_ids, line_names = set(camera_id or []), set(line_name or [])
+    last_event_id = request.headers.get("last-event-id")
+
+    async def events():
+        subscriber = defect_feed.subscribe(camera_ids, line_names)  # 누락 없도록 스냅샷보다 먼저 구독
+        try:
+            if last_event_id and last_event_id.isdigit():
+                backlog = defect_feed.snapshot(camera_ids, line_names, limit=0, after_seq=int(last_event_id))
+            else:
+                backlog = defect_feed.snapshot(camera_ids, line_names, limit=last) if last else []
+            sent_seq = 0
+            for event in backlog:
+                sent_seq = max(sent_seq, event["seq"])
+                yield _sse_message(event)
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"  # 프록시 유휴 연결 종료 방지
+                    continue
+                if event["seq"] <= sent_seq:
+                    continue  # 스냅샷에서 이미 보낸 이벤트
+                yield _sse_message(event)
+        finally:
+            defect_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# 실시간 결함 탐지 피드 (WebSocket) — ?camera_id=1&camera_id=2&line_name=A&last=10
+@router.websocket("/realtime/ws")
+async def websocket_realtime_checks(websocket: WebSocket):
+    await websocket.accept()
+    try:
+        camera_ids = {int(v) for v in websocket.query_params.getlist("camera_id")}
+        last = min(int(websocket.query_params.get("last", 10)), FEED_BUFFER_SIZE)
+    except ValueError:
+        await websocket.close(code=4400, reason="camera_id/last는 정수여야 합니다.")
+        return
+    line_names = set(websocket.query_params.getlist("line_name"))
+
+    await run_in_threadpool(defect_feed.warm)
+    subscriber = defect_feed.subscribe(camera_ids, line_names)
+
+    async def wait_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass  # 클라이언트 메시지는 사용하지 않음 (종료 감지용)
+
+    disconnected = asyncio.create_task(wait_disconnect())
+    try:
+        sent_seq = 0
+        for event in defect_feed.snapshot(camera_ids, line_names, limit=last) if last > 0 else []:
+            sent_seq = max(sent_seq, event["seq"])
+            await websocket.send_json({"type": "defect", **to_realtime_item(event)})
+
+        while True:
+            getter = asyncio.create_task(subscriber.queue.get())
+            done, _ = await asyncio.wait({getter, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                getter.cancel()
+                break
+            event = getter.result()
+            if event["seq"] > sent_seq:
+                await websocket.send_json({"type": "defect", **to_realtime_item(event)})
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # 클라이언트가 먼저 연결을 끊은 경우
+    finally:
+        disconnected.cancel()
+        defect_feed.unsubscribe(subscriber)
 
 @router.get("/detail/{image_id}", response_model=annotation_schema.AnnotationDetailResponse)
 def get_annotation_details(image_id: int, db: Session = Depends(get_db)):
@@ -57,100 +203,103 @@ def get_annotation_details(image_id: int, db: Session = Depends(get_db)):
 @router.get("/main/{user_id}", response_model=List[ImageSummary])
 def get_main_screen(
     user_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    data = annotation_crud.get_main_data_filtered(db, user_id)
+    data = annotation_crud.get_main_data_filtered(db, user_id, raw_boxes=True)
     if data is None:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    # DefectClass 정보 가져오기
-    defect_classes = db.query(DefectClass.class_id, DefectClass.class_name, DefectClass.class_color).all()
-    class_color_map = {cls.class_name: cls.class_color for cls in defect_classes}
-    
-    # 결과를 ImageSummary 객체로 변환
-    image_list = []
-    for img in data["image_list"]:
-        # bounding_boxes 파싱 및 class_color 추가
-        if isinstance(img["bounding_boxes"], str):
-            boxes = json.loads(img["bounding_boxes"])
-        else:
-            boxes = img["bounding_boxes"]
-        
-        # 각 박스에 class_color 추가 (is_active는 이미 포함되어 있음)
-        for box in boxes:
-            if "class_name" in box and box["class_name"] in class_color_map:
-                box["class_color"] = class_color_map[box["class_name"]]
-        
-        image_list.append(
-            ImageSummary(
-                camera_id=img["camera_id"],
-                image_id=img["image_id"],
-                file_path=img["file_path"],
-                confidence=img["confidence"],
-                count=img["count"],
-                status=img["status"],
-                width=img["width"],
-                height=img["height"],
-                bounding_boxes=boxes
-            )
-        )
 
-    return image_list
+    # bounding_boxes에는 class_name, class_color, is_active가 이미 포함되어 있음 → 재검증 없이 바로 직렬화
+    return fast_response(request, data["image_list"])
 
 @router.post("/main/filter/{user_id}", response_model=List[ImageSummary])
 def get_filtered_image_list(
     user_id: int,
+    request: Request,
     filters: annotation_schema.FilteredImageListRequest = annotation_schema.FilteredImageListRequest(),
     db: Session = Depends(get_db)
 ):
-    data = annotation_crud.get_main_data_filtered_with_filters(db, user_id, filters)
+    data = annotation_crud.get_main_data_filtered_with_filters(db, user_id, filters, raw_boxes=True)
     if data is None:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    # DefectClass 정보 가져오기
-    defect_classes = db.query(DefectClass.class_id, DefectClass.class_name, DefectClass.class_color).all()
-    class_color_map = {cls.class_name: cls.class_color for cls in defect_classes}
-    
-    # 결과를 ImageSummary 객체로 변환
-    image_list = []
-    for img in data["image_list"]:
-        # bounding_boxes 파싱 및 class_color 추가
-        if isinstance(img["bounding_boxes"], str):
-            boxes = json.loads(img["bounding_boxes"])
-        else:
-            boxes = img["bounding_boxes"]
-        
-        # 각 박스에 class_color 추가 (is_active는 이미 포함되어 있음)
-        for box in boxes:
-            if "class_name" in box and box["class_name"] in class_color_map:
-                box["class_color"] = class_color_map[box["class_name"]]
-        
-        image_list.append(
-            ImageSummary(
-                camera_id=img["camera_id"],
-                image_id=img["image_id"],
-                file_path=img["file_path"],
-                confidence=img["confidence"],
-                count=img["count"],
-                status=img["status"],
-                width=img["width"],
-                height=img["height"],
-                bounding_boxes=boxes
-            )
-        )
 
-    return image_list
+    return fast_response(request, data["image_list"])
+
+# 메인 화면 페이지 단위 조회 (다음 페이지는 응답의 next_cursor를 그대로 전달)
+@router.post("/main/page/{user_id}", response_model=annotation_schema.MainScreenPage)
+def get_main_screen_page(
+    user_id: int,
+    http_request: Request,
+    request: annotation_schema.MainScreenPageRequest = annotation_schema.MainScreenPageRequest(),
+    db: Session = Depends(get_db)
+):
+    page = annotation_crud.get_main_page(db, user_id, request, raw_boxes=True)
+    if page is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return fast_response(http_request, page)
+
+# 작업 큐: 검수할 이미지 N건 임대 (다른 작업자가 임대 중인 이미지는 제외, 본인 리스는 연장되어 함께 반환)
+@router.post("/queue/claim/{user_id}", response_model=annotation_schema.WorkQueueClaim)
+def claim_work_queue(
+    user_id: int,
+    http_request: Request,
+    request: annotation_schema.WorkQueueClaimRequest = annotation_schema.WorkQueueClaimRequest(),
+    db: Session = Depends(get_db)
+):
+    try:
+        claim = annotation_crud.claim_work(db, user_id, request, raw_boxes=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if claim is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return fast_response(http_request, claim)
+
+# 작업 큐: 작업 중인 이미지 리스 연장 (lease_expires_at 전에 주기적으로 호출)
+@router.post("/queue/renew/{user_id}", response_model=annotation_schema.WorkQueueLeaseResult)
+def renew_work_queue(
+    user_id: int,
+    request: annotation_schema.WorkQueueLeaseRequest,
+    db: Session = Depends(get_db)
+):
+    return annotation_crud.renew_work(db, user_id, request.image_ids)
+
+# 작업 큐: 작업하지 않을 이미지 반납
+@router.post("/queue/release/{user_id}", response_model=annotation_schema.WorkQueueLeaseResult)
+def release_work_queue(
+    user_id: int,
+    request: annotation_schema.WorkQueueLeaseRequest,
+    db: Session = Depends(get_db)
+):
+    return annotation_crud.release_work(db, user_id, request.image_ids)
+
+# 메인 화면 변경분 동기화 (cursor 이후 바뀐 이미지만, 첫 호출은 reset=True와 시작 cursor를 반환)
+@router.get("/main/changes/{user_id}", response_model=annotation_schema.MainScreenChanges)
+def get_main_screen_changes(
+    user_id: int,
+    request: Request,
+    cursor: Optional[str] = Query(None, description="이전 응답의 cursor"),
+    limit: int = Query(200, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    changes = annotation_crud.get_main_changes(db, user_id, cursor, limit, raw_boxes=True)
+    if changes is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return fast_response(request, changes)
 
 @router.get("/statistics/defect-type", response_model=List[annotation_schema.DefectTypeStatistics])
+@cached_endpoint("annotations.statistics.defect_type", tags=(TAG_DEFECTS, TAG_CLASSES), response_model=List[annotation_schema.DefectTypeStatistics])
 def read_defect_type_statistics(db: Session = Depends(get_db)):
     return annotation_crud.get_defect_type_statistics(db)
 
 @router.get("/statistics/weekly-defect", response_model=annotation_schema.WeekdayDefectSummaryResponse)
+@cached_endpoint("annotations.statistics.weekly_defect", tags=(TAG_DEFECTS, TAG_CLASSES), response_model=annotation_schema.WeekdayDefectSummaryResponse)
 def read_weekly_defect_summary(db: Session = Depends(get_db)):
     result = annotation_crud.get_weekday_defect_summary(db)
     return {"result": result}
 
 @router.get("/statistics/defect-by-period", response_model=annotation_schema.DefectStatisticsResponse)
+@cached_endpoint("annotations.statistics.defect_by_period", tags=(TAG_DEFECTS, TAG_CLASSES), response_model=annotation_schema.DefectStatisticsResponse)
 def read_defect_statistics_by_period(
     unit: str = Query(..., enum=["week", "month", "year", "custom"]),
     start_date: Optional[date] = Query(None, description="조회 시작 날짜 (custom일 때 필수)"),
@@ -209,6 +358,62 @@ def read_defect_statistics_by_period(
         "data": data
     }
 
+@router.get("/statistics/timeseries", response_model=annotation_schema.DefectTimeSeriesResponse)
+@cached_endpoint("annotations.statistics.timeseries", tags=(TAG_DEFECTS, TAG_CLASSES), response_model=annotation_schema.DefectTimeSeriesResponse)
+def read_defect_time_series(
+    start_date: date = Query(..., description="조회 시작 날짜"),
+    end_date: date = Query(..., description="조회 종료 날짜 (포함)"),
+    granularity: str = Query("day", enum=["hour", "day", "week", "month"]),
+    group_by: Optional[str] = Query(None, enum=["class", "camera", "line"]),
+    defect_type: Optional[List[str]] = Query(default=None),
+    camera_id: Optional[List[int]] = Query(default=None),
+    line_name: Optional[List[str]] = Query(default=None),
+    db: Session = Depends(get_db)
+):
+    try:
+        stats = get_defect_time_series(
+            db,
+            start_date=start_date,
+            end_date=end_date,
+            granularity=granularity,
+            defect_types=defect_type,
+            camera_ids=camera_id,
+            line_names=line_name,
+            group_by=group_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "date_range": {
+            "start": start_date,
+            "end": end_date
+        },
+        "granularity": granularity,
+        "group_by": group_by,
+        "filters": {
+            "defect_type": defect_type,
+            "camera_ids": camera_id,
+            "line_names": line_name
+        },
+        **stats
+    }
+
+# 결함 위치 히트맵 (카메라/결함 유형/기간별)
+@router.get("/heatmap", response_model=annotation_schema.DefectHeatmapResponse)
+def read_defect_heatmap(
+    bins: int = Query(64, ge=1, le=HEATMAP_MAX_BINS),
+    camera_id: Optional[List[int]] = Query(default=None),
+    class_id: Optional[List[int]] = Query(default=None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db)
+):
+    try:
+        return get_defect_heatmap(db, bins, camera_id, class_id, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.delete("/images", response_model=annotation_schema.DeleteImagesResponse)
 def delete_images_api(
     request: annotation_schema.DeleteImagesRequest,
@@ -223,6 +428,14 @@ def update_image_status_api(
 ):
     return annotation_crud.update_image_status(db, request.image_id, request.status)
 
+# 이미지 상태 일괄 변경 (image_ids 또는 filter), 이미지별 결과(updated / unchanged / not_found) 반환
+@router.patch("/image/status/bulk", response_model=annotation_schema.BulkImageStatusResponse)
+def bulk_update_image_status_api(
+    request: annotation_schema.BulkImageStatusRequest,
+    db: Session = Depends(get_db)
+):
+    return annotation_crud.bulk_update_image_status(db, request)
+
 @router.post("/details", response_model=annotation_schema.AnnotationDetailListResponse)
 def get_multiple_annotation_details(
     image_ids: List[int],
@@ -242,14 +455,41 @@ def update_image_annotations(
     user_id: int,
     image_id: int,
     data: AnnotationBulkUpdate,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     annotation_service = AnnotationService(db)
     try:
-        return annotation_service.update_image_annotations(image_id, user_id, data)
+        annotations, version = annotation_service.update_image_annotations(image_id, user_id, data)
+    except HTTPException:
+        raise  # 404, 409(다른 사용자가 먼저 저장)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    response.headers["X-Annotation-Version"] = str(version)  # 다음 저장 시 version으로 전달
+    return annotations
+
+# 어노테이션 변경분 저장 (add / move / resize / reclassify / remove 작업 목록)
+# - 자동 저장 시 전체 목록 대신 사용, 바뀐 행과 새 버전만 응답
+@router.patch("/detail/{user_id}/{image_id}", response_model=annotation_schema.AnnotationPatchResponse)
+def patch_image_annotations(
+    user_id: int,
+    image_id: int,
+    patch: annotation_schema.AnnotationPatch,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    annotation_service = AnnotationService(db)
+    try:
+        result = annotation_service.patch_image_annotations(image_id, user_id, patch)
+    except HTTPException:
+        raise  # 404, 409(다른 사용자가 먼저 저장)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["X-Annotation-Version"] = str(result["version"])
+    return result
+
 @router.get("/tasks/{user_id}", response_model=annotation_schema.TaskSummaryResponse)
 def get_task_summary(
     user_id: int,
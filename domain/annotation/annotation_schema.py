@@ -40,6 +40,16 @@ class DefectDataFilter(BaseModel):
     camera_ids: Optional[List[int]] = None
 
 
+# 결함 데이터 목록 페이지 요청/응답 스키마 (커서 기반)
+class DefectDataPageRequest(DefectDataFilter):
+    cursor: Optional[str] = None  # 이전 응답의 next_cursor (첫 페이지는 생략)
+    limit: int = 50  # 최대 500
+
+class DefectDataPage(BaseModel):
+    items: List[DefectDataItem]
+    next_cursor: Optional[str] = None  # 마지막 페이지면 null
+
+
 # 결함 개요 조회 응답용 스키마
 class DefectClassSummaryResponse(BaseModel):
     class_name: str
@@ -83,6 +93,7 @@ class AnnotationDetailResponse(BaseModel):
     width: int
     height: int
     last_annotation_id: int  # 데이터베이스에서 가장 마지막(최대) annotation_id 값
+    version: int = 0  # 어노테이션 버전 (저장 시 그대로 전달)
     defects: List[DefectDetail]
 
     class Config:
@@ -99,6 +110,7 @@ class ImageSummary(BaseModel):
     width: int
     height: int
     bounding_boxes: List[Dict[str, Any]]
+    priority: int = 0  # 검수 우선순위 (클수록 먼저)
 
     class Config:
         from_attributes = True
@@ -160,6 +172,27 @@ class DefectStatisticsResponse(BaseModel):
     data: List[DefectStatisticsItem]
 
 
+# 시간 버킷 통계 (컬럼 형태: buckets[i] ↔ series[*].counts[i])
+class TimeSeriesFilters(BaseModel):
+    defect_type: Optional[List[str]] = None
+    camera_ids: Optional[List[int]] = None
+    line_names: Optional[List[str]] = None
+
+class DefectTimeSeries(BaseModel):
+    label: Optional[str] = None  # 결함 유형명 / camera_id / line_name (group_by 없으면 null)
+    class_color: Optional[str] = None  # group_by=class일 경우에만 포함
+    counts: List[int]
+    total: int
+
+class DefectTimeSeriesResponse(BaseModel):
+    date_range: DateRange
+    granularity: Literal["hour", "day", "week", "month"]
+    group_by: Optional[Literal["class", "camera", "line"]] = None
+    filters: TimeSeriesFilters
+    buckets: List[str]  # hour: YYYY-MM-DD HH:00, day/week(월요일): YYYY-MM-DD, month: YYYY-MM
+    series: List[DefectTimeSeries]
+
+
 class DeleteImagesRequest(BaseModel):
     image_ids: List[int]
 
@@ -206,6 +239,70 @@ class FilteredImageListResponse(BaseModel):
         orm_mode = True
 
 
+# 메인 화면 페이지 조회 (최신순 keyset 페이지네이션)
+class MainScreenPageRequest(MainScreenFilter):
+    camera_ids: Optional[List[int]] = None  # 할당된 카메라 중 일부만 (생략 시 전체)
+    scored_only: bool = False  # True면 conf_score가 있는 이미지만 (/main/filter와 동일)
+    order: str = "latest"  # latest(최신순) | priority(검수 우선순위 높은 순)
+    cursor: Optional[str] = None  # 이전 응답의 next_cursor (첫 페이지는 생략, 같은 order로만 사용)
+    limit: int = 50  # 최대 200
+
+class MainScreenPage(BaseModel):
+    items: List[ImageSummary]
+    next_cursor: Optional[str] = None  # 마지막 페이지면 null
+
+
+# 일괄 상태 변경 대상 조건 (메인 화면 필터와 동일, 할당 카메라 대신 camera_ids 지정)
+class BulkImageStatusFilter(MainScreenFilter):
+    camera_ids: Optional[List[int]] = None  # 생략 시 전체 카메라
+    review_only: bool = True  # 검수 대상 이미지만
+
+# image_ids 또는 filter 중 하나만 지정
+class BulkImageStatusRequest(BaseModel):
+    status: str  # "pending" 또는 "completed"
+    image_ids: Optional[List[int]] = None
+    filter: Optional[BulkImageStatusFilter] = None
+
+class BulkImageStatusResult(BaseModel):
+    image_id: int
+    outcome: str  # updated | unchanged(이미 같은 상태) | not_found
+
+class BulkImageStatusResponse(BaseModel):
+    new_status: str
+    updated: int
+    unchanged: int
+    not_found: int
+    truncated: bool  # filter 대상이 1회 최대 건수를 넘어 일부만 처리됨 → 같은 요청을 다시 보내면 이어서 처리
+    results: List[BulkImageStatusResult]
+
+
+# 작업 큐 임대 요청
+class WorkQueueClaimRequest(BaseModel):
+    count: int = 10  # 최대 WORK_QUEUE_CLAIM_MAX
+    order: str = "priority"  # priority(검수 우선순위 높은 순) | confidence(최저 confidence 낮은 순) | oldest(오래된 순)
+    camera_ids: Optional[List[int]] = None  # 할당된 카메라 중 일부만 (생략 시 전체)
+
+class WorkQueueClaim(BaseModel):
+    items: List[ImageSummary]  # 본인이 이미 임대 중이던 이미지 먼저, 이어서 새로 임대한 이미지 (각각 요청한 정렬 순, 합쳐서 최대 count건)
+    lease_expires_at: datetime  # 이 시각 전에 renew 하지 않으면 다른 작업자가 가져갈 수 있음
+
+class WorkQueueLeaseRequest(BaseModel):
+    image_ids: List[int]
+
+class WorkQueueLeaseResult(BaseModel):
+    image_ids: List[int]  # 연장/반납된 image_id (리스가 만료되었거나 본인 것이 아니면 제외)
+    lease_expires_at: Optional[datetime] = None
+
+
+# 메인 화면 변경분 동기화 응답
+class MainScreenChanges(BaseModel):
+    reset: bool  # True면 전체 목록을 다시 받아야 함 (첫 호출, 카메라 할당 변경, 삭제 기록 보관 기간보다 오래된 cursor)
+    upserted: List[ImageSummary]  # 새로 들어왔거나 바뀐 이미지 (image_id 기준으로 교체)
+    removed: List[int]  # 삭제되었거나 검수 대상에서 빠진 image_id
+    cursor: str  # 다음 호출에 전달
+    has_more: bool  # True면 바로 다시 호출해 나머지 변경분 수신
+
+
 class AnnotationDetailListResponse(BaseModel):
     details: List[AnnotationDetailResponse]
 
@@ -261,6 +358,29 @@ class AnnotationResponse(AnnotationBase):
 class AnnotationBulkUpdate(BaseModel):
     annotations: List[AnnotationCreate]
     existing_annotations: List[AnnotationUpdate]
+    version: Optional[int] = None  # 불러올 때 받은 이미지 버전 (다르면 409), 생략 시 확인 안 함
+
+# 어노테이션 변경 작업 (PATCH)
+# - add: class_id + bounding_box, ref(임시 키)를 주면 같은 요청의 후속 작업에서 annotation_id 대신 참조 가능
+# - move: 이동/크기 변경 (bounding_box), reclassify: class_id 변경, remove: 삭제
+class AnnotationOperation(BaseModel):
+    op: str
+    annotation_id: Optional[int] = None
+    ref: Optional[str] = None
+    class_id: Optional[int] = None
+    bounding_box: Optional[BoundingBox] = None
+
+class AnnotationPatch(BaseModel):
+    version: Optional[int] = None  # 불러올 때(또는 직전 PATCH 응답에서) 받은 버전, 다르면 409
+    operations: List[AnnotationOperation]
+
+class AnnotationPatchResult(AnnotationResponse):
+    ref: Optional[str] = None  # add 작업의 ref (새 annotation_id와 매칭용)
+
+class AnnotationPatchResponse(BaseModel):
+    version: int  # 반영 후 이미지 버전
+    upserted: List[AnnotationPatchResult]  # 추가/변경된 어노테이션만
+    removed: List[int]  # 삭제된 annotation_id
 
 class TaskSummaryResponse(BaseModel):
     total_images: int
@@ -287,4 +407,13 @@ class ThumbnailAnnotationResponse(BaseModel):
     annotations: List[ThumbnailBoundingBox]
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+# 결함 위치 히트맵 응답 스키마
+class DefectHeatmapResponse(BaseModel):
+    bins: int  # 격자 한 변의 칸 수
+    total: int  # 집계된 박스 수
+    max: int  # 가장 많은 칸의 박스 수
+    watermark: int  # 반영된 마지막 annotation_id
+    grid: List[List[int]]  # grid[y][x], 정규화 좌표 기준 좌상단이 (0, 0)
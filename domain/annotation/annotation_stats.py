@@ -0,0 +1,185 @@
+from datetime import date, timedelta
+from typing import List, Optional
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database.models import Camera, DefectClass, DefectDailyRollup, DefectHourlyRollup
+
+
+# 시간 버킷 통계 엔진
+# - 사전 집계 테이블에서 조회: hour → DefectHourlyRollups, day/week/month → DefectDailyRollups
+# - SQL은 (원본 버킷, 라벨)까지만 집계하고, week/month 묶기와 빈 구간 채우기는 NumPy 밀집 격자로 처리
+# - 필터(결함 유형 × 카메라 × 라인)는 자유롭게 조합 가능
+
+GRANULARITIES = ("hour", "day", "week", "month")
+GROUP_BY_OPTIONS = ("class", "camera", "line")
+MAX_STAT_BUCKETS = 100_000  # 시간 단위 약 11년
+
+# 1970-01-01은 목요일 → 월요일 기준 요일 보정값
+_EPOCH_WEEKDAY = 3
+
+
+# 날짜 배열을 해당 주의 월요일로 내림
+def _to_monday(days: np.ndarray) -> np.ndarray:
+    return days - ((days.astype(np.int64) + _EPOCH_WEEKDAY) % 7).astype("timedelta64[D]")
+
+
+# 기간 시작/종료를 버킷 단위 datetime64로 변환 (종료 포함)
+def _bucket_range(start_date: date, end_date: date, granularity: str):
+    start = np.datetime64(start_date, "D")
+    end = np.datetime64(end_date, "D")
+    if granularity == "hour":
+        return start.astype("datetime64[h]"), (end + 1).astype("datetime64[h]") - 1
+    if granularity == "day":
+        return start, end
+    if granularity == "week":
+        return _to_monday(np.array([start]))[0], _to_monday(np.array([end]))[0]
+    return start.astype("datetime64[M]"), end.astype("datetime64[M]")
+
+
+# 원본 시각 배열 → 버킷 인덱스 배열
+def _bucket_index(timestamps: np.ndarray, first_bucket, granularity: str) -> np.ndarray:
+    if granularity == "hour":
+        return (timestamps.astype("datetime64[h]") - first_bucket).astype(np.int64)
+    days = timestamps.astype("datetime64[D]")
+    if granularity == "day":
+        return (days - first_bucket).astype(np.int64)
+    if granularity == "week":
+        return (_to_monday(days) - first_bucket).astype(np.int64) // 7
+    return (days.astype("datetime64[M]") - first_bucket).astype(np.int64)
+
+
+# 버킷 시작 시각 → 응답용 문자열 (hour: YYYY-MM-DD HH:00, day/week: YYYY-MM-DD, month: YYYY-MM)
+def _bucket_labels(first_bucket, bucket_count: int, granularity: str) -> List[str]:
+    if granularity == "week":
+        buckets = first_bucket + np.arange(bucket_count) * 7
+    else:
+        buckets = first_bucket + np.arange(bucket_count)
+    if granularity == "hour":
+        return np.char.replace(np.datetime_as_string(buckets, unit="m"), "T", " ").tolist()
+    return np.datetime_as_string(buckets).tolist()
+
+
+def get_defect_time_series(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    defect_types: Optional[List[str]] = None,
+    camera_ids: Optional[List[int]] = None,
+    line_names: Optional[List[str]] = None,
+    group_by: Optional[str] = None
+):
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity는 {', '.join(GRANULARITIES)} 중 하나여야 합니다.")
+    if group_by is not None and group_by not in GROUP_BY_OPTIONS:
+        raise ValueError(f"group_by는 {', '.join(GROUP_BY_OPTIONS)} 중 하나여야 합니다.")
+    if start_date > end_date:
+        raise ValueError("start_date는 end_date보다 늦을 수 없습니다.")
+
+    first_bucket, last_bucket = _bucket_range(start_date, end_date, granularity)
+    if granularity == "week":
+        bucket_count = int((last_bucket - first_bucket).astype(np.int64)) // 7 + 1
+    else:
+        bucket_count = int((last_bucket - first_bucket).astype(np.int64)) + 1
+    if bucket_count > MAX_STAT_BUCKETS:
+        raise ValueError(f"조회 구간이 너무 깁니다. (최대 {MAX_STAT_BUCKETS}개 구간)")
+
+    # 1. 원본 집계 테이블 선택 (시간 단위만 시간별 집계 사용, 나머지는 더 작은 일별 집계 사용)
+    if granularity == "hour":
+        rollup = DefectHourlyRollup
+        time_column = DefectHourlyRollup.hour
+        range_filter = [
+            DefectHourlyRollup.hour >= start_date,
+            DefectHourlyRollup.hour < end_date + timedelta(days=1)
+        ]
+    else:
+        rollup = DefectDailyRollup
+        time_column = DefectDailyRollup.day
+        range_filter = [DefectDailyRollup.day >= start_date, DefectDailyRollup.day <= end_date]
+
+    # 2. 라벨 컬럼 결정
+    if group_by == "class":
+        label_column = rollup.class_id
+    elif group_by == "camera":
+        label_column = rollup.camera_id
+    elif group_by == "line":
+        label_column = Camera.line_name
+    else:
+        label_column = None
+
+    columns = [time_column, func.sum(rollup.defect_count).label("defect_count")]
+    if label_column is not None:
+        columns.insert(1, label_column.label("label"))
+    query = db.query(*columns).filter(*range_filter)
+
+    # 3. 필터 조합
+    if defect_types:
+        query = query.join(DefectClass, DefectClass.class_id == rollup.class_id).filter(DefectClass.class_name.in_(defect_types))
+    if camera_ids:
+        query = query.filter(rollup.camera_id.in_(camera_ids))
+    if line_names or group_by == "line":
+        query = query.join(Camera, Camera.camera_id == rollup.camera_id)
+        if line_names:
+            query = query.filter(Camera.line_name.in_(line_names))
+
+    group_columns = [time_column] if label_column is None else [time_column, label_column]
+    rows = query.group_by(*group_columns).all()
+
+    # 4. 라벨 목록 (조회된 라벨 + 같은 차원으로 요청한 필터 값은 데이터가 없어도 0으로 포함)
+    label_keys = set()
+    if label_column is not None:
+        label_keys.update(row.label for row in rows)
+        if group_by == "camera" and camera_ids:
+            label_keys.update(camera_ids)
+        elif group_by == "line" and line_names:
+            label_keys.update(line_names)
+
+    class_meta = {}
+    if group_by == "class":
+        class_query = db.query(DefectClass.class_id, DefectClass.class_name, DefectClass.class_color)
+        if defect_types:
+            class_query = class_query.filter(DefectClass.class_name.in_(defect_types))
+            class_rows = class_query.all()
+            label_keys.update(row.class_id for row in class_rows)
+        else:
+            class_rows = class_query.filter(DefectClass.class_id.in_(label_keys)).all() if label_keys else []
+        class_meta = {row.class_id: row for row in class_rows}
+
+    labels = sorted(label_keys) if label_column is not None else [None]
+    label_index = {label: i for i, label in enumerate(labels)}
+
+    # 5. 밀집 격자 [버킷 × 라벨]에 누적 (빈 구간은 0)
+    grid = np.zeros((bucket_count, len(labels)), dtype=np.int64)
+    if rows:
+        timestamps = np.array([row[0] for row in rows], dtype="datetime64[s]")
+        counts = np.fromiter((row.defect_count for row in rows), dtype=np.int64, count=len(rows))
+        bucket_idx = _bucket_index(timestamps, first_bucket, granularity)
+        if label_column is None:
+            label_idx = np.zeros(len(rows), dtype=np.int64)
+        else:
+            label_idx = np.fromiter((label_index[row.label] for row in rows), dtype=np.int64, count=len(rows))
+        np.add.at(grid, (bucket_idx, label_idx), counts)
+
+    # 6. 응답 구성 (컬럼 형태: buckets 1개 + 라벨별 counts 배열)
+    series = []
+    for i, label in enumerate(labels):
+        color = None
+        if group_by == "class":
+            meta = class_meta.get(label)
+            color = meta.class_color if meta else None
+            label = meta.class_name if meta else str(label)
+        elif label is not None:
+            label = str(label)
+        column = grid[:, i]
+        series.append({
+            "label": label,
+            "class_color": color,
+            "counts": column.tolist(),
+            "total": int(column.sum())
+        })
+
+    return {
+        "buckets": _bucket_labels(first_bucket, bucket_count, granularity),
+        "series": series
+    }
@@ -0,0 +1,170 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta
+from os import getenv
+from typing import Dict, Iterable, List, Sequence
+from sqlalchemy import and_, event, func, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+from database.models import ChangeSequence, Image, ImageTombstone
+
+
+# 메인 화면 변경분 동기화용 변경 시퀀스 (카메라별)
+# - 이미지를 바꾸는 코드는 touch_images / record_tombstones로 바뀐 이미지를 세션에 등록만 해 둠
+# - 커밋 직전(before_commit)에 카메라별로 next_change_seq를 받아 Images/ImageTombstones.change_seq에 기록
+#   → 시퀀스 행 잠금은 커밋 직전부터 커밋까지만 유지되고, 다른 카메라의 쓰기와는 서로 막지 않음
+# - 시퀀스 행은 커밋까지 잠겨 있으므로 카메라 안에서는 커밋 순서와 시퀀스 순서가 같음
+#   → 카메라별 cursor 이후 변경을 빠짐없이 읽을 수 있음
+# - 시퀀스 행은 항상 camera_id 오름차순으로 잠가 트랜잭션끼리 교착되지 않게 함
+# - 삭제 기록(ImageTombstones)은 TOMBSTONE_RETENTION_DAYS가 지나면 purge_tombstones로 지우고,
+#   카메라별로 지운 마지막 시퀀스(horizon)를 남김 → 그보다 오래된 cursor는 reset
+
+TOMBSTONE_RETENTION_DAYS = int(getenv("TOMBSTONE_RETENTION_DAYS", "7"))
+
+_PENDING_KEY = "pending_change_seq"
+
+
+def _sequence_name(camera_id: int) -> str:
+    return f"images:{camera_id}"
+
+
+def _horizon_name(camera_id: int) -> str:
+    return f"tombstones_purged:{camera_id}"
+
+
+# 시퀀스 다음 값 할당 (INSERT ... ON DUPLICATE KEY UPDATE value = LAST_INSERT_ID(value + 1))
+def next_change_seq(db: Session, camera_id: int) -> int:
+    stmt = mysql_insert(ChangeSequence).values(name=_sequence_name(camera_id), value=func.last_insert_id(1))
+    stmt = stmt.on_duplicate_key_update(value=func.last_insert_id(ChangeSequence.value + 1))
+    db.execute(stmt)
+    return db.execute(select(func.last_insert_id())).scalar()
+
+
+def _read_sequences(db: Session, names: Dict[str, int]) -> Dict[int, int]:
+    rows = db.execute(select(ChangeSequence.name, ChangeSequence.value).where(ChangeSequence.name.in_(names))).all()
+    values = {names[row.name]: row.value for row in rows}
+    return {camera_id: values.get(camera_id, 0) for camera_id in names.values()}
+
+
+# 카메라별 커밋된 마지막 시퀀스 (잠금 없이 읽음, 커밋 전 트랜잭션의 값은 항상 이보다 큼)
+def current_change_seqs(db: Session, camera_ids: Iterable[int]) -> Dict[int, int]:
+    return _read_sequences(db, {_sequence_name(camera_id): camera_id for camera_id in set(camera_ids)})
+
+
+# 카메라별로 purge된 삭제 기록의 마지막 시퀀스 (이 값 이하의 cursor는 삭제를 놓쳤을 수 있음)
+def tombstone_horizons(db: Session, camera_ids: Iterable[int]) -> Dict[int, int]:
+    return _read_sequences(db, {_horizon_name(camera_id): camera_id for camera_id in set(camera_ids)})
+
+
+def _pending(db: Session) -> dict:
+    return db.info.setdefault(_PENDING_KEY, {"images": set(), "tombstones": {}})
+
+
+# 이미지가 바뀐 경우 커밋 때 시퀀스를 갱신하도록 등록
+def touch_images(db: Session, image_ids: Iterable[int]):
+    _pending(db)["images"].update(image_ids)
+
+
+# 삭제 직전 호출: 삭제될 이미지의 기록을 남김 (시퀀스는 커밋 때 기록)
+def record_tombstones(db: Session, image_ids: Iterable[int]):
+    image_ids = list(set(image_ids))
+    if not image_ids:
+        return
+    rows = db.execute(select(Image.image_id, Image.camera_id).where(Image.image_id.in_(image_ids))).all()
+    if not rows:
+        return
+    stmt = mysql_insert(ImageTombstone).values([
+        {"image_id": row.image_id, "camera_id": row.camera_id, "change_seq": 0, "deleted_at": datetime.utcnow()}
+        for row in rows
+    ])
+    db.execute(stmt.on_duplicate_key_update(change_seq=stmt.inserted.change_seq, deleted_at=stmt.inserted.deleted_at))
+    _pending(db)["tombstones"].update({row.image_id: row.camera_id for row in rows})
+
+
+# 커밋 직전: 등록된 이미지/삭제 기록에 카메라별 시퀀스 기록
+@event.listens_for(Session, "before_commit")
+def _stamp_change_seqs(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    tombstones = pending["tombstones"]
+    image_ids = pending["images"] - tombstones.keys()
+    by_camera = defaultdict(lambda: ([], []))
+    if image_ids:
+        session.flush()  # autoflush=False이므로 추가한 이미지를 먼저 반영
+        rows = session.execute(select(Image.image_id, Image.camera_id).where(Image.image_id.in_(image_ids))).all()
+        for row in rows:
+            by_camera[row.camera_id][0].append(row.image_id)
+    for image_id, camera_id in tombstones.items():
+        by_camera[camera_id][1].append(image_id)
+
+    for camera_id in sorted(by_camera):
+        changed, deleted = by_camera[camera_id]
+        seq = next_change_seq(session, camera_id)
+        if changed:
+            session.query(Image).filter(Image.image_id.in_(changed)).update(
+                {Image.change_seq: seq}, synchronize_session=False
+            )
+        if deleted:
+            session.query(ImageTombstone).filter(ImageTombstone.image_id.in_(deleted)).update(
+                {ImageTombstone.change_seq: seq}, synchronize_session=False
+            )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_change_seqs(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# 보관 기간이 지난 삭제 기록 정리 (커밋은 호출자가 수행), 지운 건수 반환
+# 카메라별 horizon을 먼저 올린 뒤 지우므로, 지운 기록 이전의 cursor는 항상 reset 대상이 됨
+def purge_tombstones(db: Session, retention_days: int = TOMBSTONE_RETENTION_DAYS, now: datetime = None) -> int:
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    expired = and_(ImageTombstone.deleted_at < cutoff, ImageTombstone.change_seq > 0)
+    horizons = db.execute(
+        select(ImageTombstone.camera_id, func.max(ImageTombstone.change_seq))
+        .where(expired)
+        .group_by(ImageTombstone.camera_id)
+    ).all()
+    if not horizons:
+        return 0
+
+    stmt = mysql_insert(ChangeSequence).values([
+        {"name": _horizon_name(camera_id), "value": seq} for camera_id, seq in horizons
+    ])
+    db.execute(stmt.on_duplicate_key_update(value=func.greatest(ChangeSequence.value, stmt.inserted.value)))
+    return db.query(ImageTombstone).filter(expired).delete(synchronize_session=False)
+
+
+def _after(model, after: tuple):
+    seq, image_id = after
+    return or_(model.change_seq > seq, and_(model.change_seq == seq, model.image_id > image_id))
+
+
+# 카메라별 (change_seq, image_id) cursor 이후 변경된 이미지/삭제 기록을 순서대로 카메라마다 최대 limit건
+# columns: 변경된 이미지에서 함께 읽을 컬럼 (image_id 포함)
+# 반환: {camera_id: [(change_seq, image_id, row 또는 None(삭제))]}
+def fetch_changes(db: Session, cursors: Dict[int, tuple], limit: int, columns: Sequence) -> Dict[int, List[tuple]]:
+    changes = {}
+    for camera_id in sorted(cursors):
+        after = cursors[camera_id]
+        images = db.execute(
+            select(Image.change_seq, *columns)
+            .where(Image.camera_id == camera_id, _after(Image, after))
+            .order_by(Image.change_seq, Image.image_id)
+            .limit(limit)
+        ).all()
+        tombstones = db.execute(
+            select(ImageTombstone.change_seq, ImageTombstone.image_id)
+            .where(ImageTombstone.camera_id == camera_id, _after(ImageTombstone, after))
+            .order_by(ImageTombstone.change_seq, ImageTombstone.image_id)
+            .limit(limit)
+        ).all()
+        merged = heapq.merge(
+            [(row.change_seq, row.image_id, row) for row in images],
+            [(row.change_seq, row.image_id, None) for row in tombstones],
+            key=lambda item: (item[0], item[1])
+        )
+        changes[camera_id] = [item for _, item in zip(range(limit), merged)]
+    return changes
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from database.models import DefectClass
 from fastapi import HTTPException
 from domain.defect_class import defect_class_schema
+from domain.annotation.annotation_review import refresh_class_summaries
+from utils.response_cache import invalidate_after_commit, TAG_CLASSES, TAG_DEFECTS
 
 
 def get_all_defect_classes(db: Session):
@@ -24,6 +26,8 @@ def create_defect_class(db: Session, defect_class: defect_class_schema.DefectCla
         if not existing.is_active:
             existing.is_active = True
             existing.class_color = defect_class.class_color  # 색상도 갱신할 수 있음
+            existing.review_weight = defect_class.review_weight
+            invalidate_after_commit(db, TAG_CLASSES)
             db.commit()
             db.refresh(existing)
             return existing
@@ -34,9 +38,11 @@ def create_defect_class(db: Session, defect_class: defect_class_schema.DefectCla
     db_class = DefectClass(
         class_name=defect_class.class_name,
         class_color=defect_class.class_color,
+        review_weight=defect_class.review_weight,
         is_active=True
     )
     db.add(db_class)
+    invalidate_after_commit(db, TAG_CLASSES)
     db.commit()
     db.refresh(db_class)
     return db_class
@@ -51,7 +57,16 @@ def update_defect_class(db: Session, class_id: int, update_data: defect_class_sc
         db_class.class_name = update_data.class_name
     if update_data.class_color is not None:
         db_class.class_color = update_data.class_color
+    if update_data.review_weight is not None:
+        db_class.review_weight = update_data.review_weight
 
+    # 이미지 검수 요약의 박스 렌더링 정보(class_name, class_color)와 우선순위도 같은 트랜잭션에서 갱신
+    if update_data.class_name is not None or update_data.class_color is not None or update_data.review_weight is not None:
+        appearance_changed = update_data.class_name is not None or update_data.class_color is not None
+        refresh_class_summaries(db, class_id, bump_version=appearance_changed)  # 가중치만 바뀌면 편집 중인 작업자에게 409 없음
+        invalidate_after_commit(db, TAG_DEFECTS)
+
+    invalidate_after_commit(db, TAG_CLASSES)
     db.commit()
     db.refresh(db_class)
     return db_class
@@ -65,6 +80,7 @@ def delete_defect_class(db: Session, class_id: int):
 
     # 소프트 삭제 처리 (updated_at은 자동으로 갱신됨)
     db_class.is_active = False
+    invalidate_after_commit(db, TAG_CLASSES)
     db.commit()
 
     return {"success": True, "message": f"Defect class {class_id} marked as inactive"}
@@ -73,4 +89,9 @@ def delete_defect_class(db: Session, class_id: int):
 # class_id로 class_name을 조회하는 함수
 def get_class_name_by_id(db: Session, class_id: int) -> str:
     obj = db.query(DefectClass).filter_by(class_id=class_id).first()
-    return obj.class_name if obj else "unknown"
\ No newline at end of file
+    return obj.class_name if obj else "unknown"
+
+
+# 전체 class_id → class_name 매핑을 한 번에 조회하는 함수 (박스마다 조회하지 않도록)
+def get_class_name_map(db: Session) -> dict:
+    return {row.class_id: row.class_name for row in db.query(DefectClass.class_id, DefectClass.class_name).all()}
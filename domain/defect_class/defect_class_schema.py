@@ -8,6 +8,7 @@ class DefectClassResponse(BaseModel):
     class_id: int
     class_name: str
     class_color: str
+    review_weight: float = 1.0
     created_at: datetime
     updated_at: datetime
 
@@ -19,12 +20,14 @@ class DefectClassResponse(BaseModel):
 class DefectClassCreate(BaseModel):
     class_name: str = Field(..., example="Scratch")
     class_color: str = Field(..., example="#dbe4ff")
+    review_weight: float = Field(1.0, gt=0, example=1.0)  # 검수 우선순위 가중치 (희귀/치명 결함은 1보다 크게)
 
 
 # 수정 요청용 Pydantic 모델
 class DefectClassUpdate(BaseModel):
     class_name: Optional[str] = Field(None, example="New Name")
     class_color: Optional[str] = Field(None, example="#abcdef")
+    review_weight: Optional[float] = Field(None, gt=0, example=2.0)
 
 
 # 삭제 요청 응답 스키마
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from database.models import Camera, Image
+from domain.annotation.annotation_sync import record_tombstones
 
 # 카메라 유효성 확인 함수
 def get_active_camera(db: Session, camera_id: int):
@@ -34,5 +35,24 @@ def get_image_by_id(db: Session, image_id: int) -> Image:
 
 # 이미지 레코드 삭제 함수
 def delete_image_record(db: Session, image: Image):
+    record_tombstones(db, [image.image_id])  # 메인 화면 동기화용 삭제 기록
     db.delete(image)
     db.commit()
+
+# 이미지 DB 레코드 여러 건을 한 번의 커밋으로 생성하는 함수 (스트리밍 수집용)
+def create_image_records(db: Session, camera_id: int, uploads: list[tuple[str, int, int]], dataset_id: int = 0):
+    images = [
+        Image(
+            file_path=file_path,
+            camera_id=camera_id,
+            dataset_id=dataset_id,
+            width=width,
+            height=height
+        )
+        for file_path, width, height in uploads
+    ]
+    db.add_all(images)
+    db.commit()
+    for image in images:
+        db.refresh(image)
+    return images
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+import asyncio
+import itertools
+from os import getenv
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
-from database.database import get_db
+from database.database import get_db, SessionLocal
 from domain.image import image_crud, image_schema
-from utils.s3 import upload_image_to_s3
+from domain.image.image_service import apply_inference_results, process_frame_batch, decide_status
+from domain.image.image_write_buffer import WRITE_BUFFER_ENABLED, get_write_buffer, build_image_row
+from utils.s3 import upload_image_to_s3, get_presigned_image_url
+from utils.timing import StageTimer
 from domain.yolo.yolo_inference import run_inference
-from domain.yolo.yolo_service import save_inference_results
 
 
 router = APIRouter(
@@ -12,61 +19,182 @@ router = APIRouter(
     tags=["Images"]
 )
 
+# 스트리밍 수집 배치 설정
+INGEST_BATCH_SIZE = int(getenv("INGEST_BATCH_SIZE", "8"))  # 한 번에 추론할 최대 프레임 수
+INGEST_BATCH_WAIT_MS = int(getenv("INGEST_BATCH_WAIT_MS", "50"))  # 첫 프레임 이후 배치를 채우기 위해 기다리는 시간
+INGEST_QUEUE_BATCHES = int(getenv("INGEST_QUEUE_BATCHES", "2"))  # 연결당 대기 가능한 프레임 = 배치 크기 x 이 값
+
 
 @router.post("/upload", response_model=image_schema.ImageUploadResponse)
 async def upload_image(
         file: UploadFile,
+        response: Response,
         camera_id: int = Form(...),
         db: Session = Depends(get_db),
 ):
     print("🔔 [upload_image] 호출됨")
+    timer = StageTimer()  # 단계별 소요 시간 → Server-Timing 헤더
 
     # 1. 카메라 유효성 확인
-    camera = image_crud.get_active_camera(db, camera_id)
+    with timer.stage("camera"):
+        camera = image_crud.get_active_camera(db, camera_id)
     if not camera:
         raise HTTPException(status_code=400, detail="비활성화된 카메라이거나 존재하지 않습니다.")
     print(f"✅ 유효한 카메라: {camera_id}")
 
+    # write-behind 버퍼 사용 시: 업로드/추론 후 INSERT를 다른 요청들과 묶어서 커밋
+    if WRITE_BUFFER_ENABLED:
+        result = await _upload_image_buffered(file, camera_id, db, timer)
+        response.headers["Server-Timing"] = timer.header()
+        return result
+
     # 2. S3 업로드 + width/height 추출
-    s3_url, width, height = upload_image_to_s3(file, camera_id)
+    with timer.stage("storage"):
+        s3_url, width, height = upload_image_to_s3(file, camera_id)
     print(f"✅ S3 업로드 완료: {s3_url} (w: {width}, h: {height})")
 
     # 3. DB에 이미지 정보 저장
-    image = image_crud.create_image_record(
-        db=db,
-        file_path=s3_url,
-        camera_id=camera_id,
-        width=width,
-        height=height,
-        dataset_id=0  # 필요 시 조정
-    )
+    with timer.stage("db_insert"):
+        image = image_crud.create_image_record(
+            db=db,
+            file_path=s3_url,
+            camera_id=camera_id,
+            width=width,
+            height=height,
+            dataset_id=0  # 필요 시 조정
+        )
     print(f"✅ 이미지 DB 저장 완료: image_id={image.image_id}")
 
     # 4. 모델 추론 실행
-    inference_result = run_inference(s3_url, db)  # List[BoundingBox]
+    with timer.stage("inference"):
+        inference_result = run_inference(s3_url, db)  # List[BoundingBox]
     print(f"✅ 모델 추론 결과 개수: {len(inference_result)}")
     if not inference_result:
         print("⚠️ 모델 추론 결과가 비어 있습니다.")
 
-    # 5. 추론 결과 DB 저장
+    # 5. 추론 결과 DB 저장 + 6. confidence score 체크 → status 자동 변경
     print("💾 어노테이션 저장 시작")
-    save_inference_results(db, image.image_id, [r.dict() for r in inference_result])
+    with timer.stage("db_save"):
+        apply_inference_results(db, image, inference_result)
     print("✅ 어노테이션 저장 완료")
 
-    # 6. confidence score 체크 → status 자동 변경
-    if inference_result:  # 추론 결과가 존재하면
-        min_confidence = min(r.confidence for r in inference_result)
-        if min_confidence >= 0.75:
-            image.status = "completed"
-            db.commit()
-            print(f"✅ 이미지 status 'completed'로 자동 업데이트됨 (min_confidence={min_confidence:.3f})")
-        else:
-            print(f"ℹ️ min_confidence={min_confidence:.3f} < 0.75 → status 변경 없음")
-
     # 7. 응답 반환 (추론 결과 포함)
+    response.headers["Server-Timing"] = timer.header()
     return image_schema.ImageUploadResponse(
         image_id=image.image_id,
-        file_path=image.file_path,
+        file_path=get_presigned_image_url(image.file_path),
         date=image.date,
         results=inference_result  # BoundingBox 리스트
-    )
\ No newline at end of file
+    )
+
+
+async def _upload_image_buffered(file: UploadFile, camera_id: int, db: Session, timer: StageTimer) -> image_schema.ImageUploadResponse:
+    # 1. S3 업로드 + 모델 추론 (블로킹 작업은 스레드풀에서 실행해 다른 요청과 겹치도록)
+    with timer.stage("storage"):
+        s3_url, width, height = await run_in_threadpool(upload_image_to_s3, file, camera_id)
+    with timer.stage("inference"):
+        inference_result = await run_in_threadpool(run_inference, s3_url, db)
+    db.close()  # 커넥션은 버퍼 flush 동안 잡고 있지 않음
+
+    # 2. Image/Annotation INSERT를 버퍼에 제출하고, 배치가 커밋될 때까지 대기
+    image_row = build_image_row(s3_url, camera_id, width, height, decide_status(inference_result))
+    with timer.stage("db_commit_wait"):
+        future = get_write_buffer().submit(image_row, [r.dict() for r in inference_result])
+        image_id, captured_at = await asyncio.wrap_future(future)
+    print(f"✅ 버퍼 커밋 완료: image_id={image_id}, 결함 {len(inference_result)}개")
+
+    return image_schema.ImageUploadResponse(
+        image_id=image_id,
+        file_path=get_presigned_image_url(s3_url),
+        date=captured_at,
+        results=inference_result
+    )
+
+
+@router.websocket("/stream")
+async def stream_frames(websocket: WebSocket):
+    """
+    카메라 프레임 스트리밍 수집
+    - 첫 메시지(JSON)로 {"camera_id": N}을 보내 1회 인증 후 camera_id 바인딩
+    - 이후 바이너리 프레임(JPEG/PNG)을 연속 전송 → 배치 추론 결과를 같은 소켓으로 push
+    - 불량 프레임은 {"type": "error", "frame": 연결 내 프레임 번호(0부터), "detail"}로 개별 통보
+    """
+    await websocket.accept()
+    db = SessionLocal()  # 연결 수명 동안 세션 1개 재사용 (커밋 후 커넥션은 풀로 반환됨)
+    # 대기열이 차면 put이 막혀 소켓 읽기가 멈춤 → 추론보다 빠르게 보내는 카메라는 TCP 수준에서 속도가 제한됨
+    frame_queue: asyncio.Queue = asyncio.Queue(maxsize=INGEST_QUEUE_BATCHES * INGEST_BATCH_SIZE)
+    frame_numbers = itertools.count()  # 연결 내 프레임 번호 (오류 응답에서 어떤 프레임인지 표시)
+
+    async def receive_frames():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await frame_queue.put((next(frame_numbers), message["bytes"]))
+        await frame_queue.put(None)  # 연결 종료 신호
+
+    reader = None
+    try:
+        # 1. 카메라 유효성 확인 (연결당 1회만)
+        try:
+            hello = await websocket.receive_json()  # 바이너리/JSON이 아닌 메시지 → KeyError/JSONDecodeError(ValueError)
+            camera_id = int(hello.get("camera_id"))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            await websocket.close(code=4400, reason="camera_id가 필요합니다.")
+            return
+
+        camera = await run_in_threadpool(image_crud.get_active_camera, db, camera_id)
+        db.close()  # 검증용 트랜잭션 종료
+        if not camera:
+            await websocket.close(code=4403, reason="비활성화된 카메라이거나 존재하지 않습니다.")
+            return
+        await websocket.send_json({"type": "ready", "camera_id": camera_id})
+        print(f"✅ 스트리밍 연결: camera_id={camera_id}")
+
+        reader = asyncio.create_task(receive_frames())
+        loop = asyncio.get_running_loop()
+        closed = False
+
+        while not closed:
+            # 2. 첫 프레임 대기 후 짧은 시간 동안 배치 채우기
+            frame = await frame_queue.get()
+            if frame is None:
+                break
+            batch = [frame]
+            deadline = loop.time() + INGEST_BATCH_WAIT_MS / 1000
+            while len(batch) < INGEST_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    frame = await asyncio.wait_for(frame_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if frame is None:
+                    closed = True
+                    break
+                batch.append(frame)
+
+            # 3. 검증 + 업로드 + 배치 추론 + 저장 (블로킹 작업은 스레드풀에서)
+            frame_ids = [frame_id for frame_id, _ in batch]
+            try:
+                responses, errors = await run_in_threadpool(process_frame_batch, db, camera_id, [data for _, data in batch])
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ 스트리밍 배치 처리 실패: {e}")
+                for frame_id in frame_ids:
+                    await websocket.send_json({"type": "error", "frame": frame_id, "detail": str(e)})
+                continue
+
+            # 4. 결과를 같은 소켓으로 push (불량 프레임은 프레임 번호별 오류)
+            for index, detail in errors:
+                await websocket.send_json({"type": "error", "frame": frame_ids[index], "detail": detail})
+            for response in responses:
+                await websocket.send_json({"type": "result", **jsonable_encoder(response)})
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # 클라이언트가 먼저 연결을 끊은 경우
+    finally:
+        if reader is not None:
+            reader.cancel()
+        db.close()
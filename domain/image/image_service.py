@@ -0,0 +1,123 @@
+import io
+from typing import List, Tuple
+from sqlalchemy.orm import Session
+from PIL import Image as PILImage
+from database.models import Image
+from domain.image import image_crud, image_schema
+from domain.yolo.yolo_inference import run_inference_batch
+from domain.yolo.yolo_schema import BoundingBox
+from domain.yolo.yolo_service import save_inference_results
+from domain.annotation.annotation_rollup import add_image_contributions
+from domain.annotation.annotation_review import REVIEW_CONFIDENCE_THRESHOLD
+from domain.annotation.annotation_sync import touch_images
+from domain.annotation.annotation_feed import defect_feed
+from utils.s3 import upload_bytes_to_s3, get_presigned_image_url, delete_stored_image
+from utils.image_probe import IMAGE_FORMAT_TYPES
+
+# 최저 confidence가 이 값 이상이면 리뷰 없이 completed 처리 (검수 대상 기준과 동일)
+AUTO_COMPLETE_CONFIDENCE = REVIEW_CONFIDENCE_THRESHOLD
+
+
+# 추론 결과로 이미지 status 결정 (결과가 있고 최저 confidence가 기준 이상이면 completed)
+def decide_status(inference_result: List[BoundingBox]) -> str:
+    if inference_result and min(r.confidence for r in inference_result) >= AUTO_COMPLETE_CONFIDENCE:
+        return "completed"
+    return "pending"
+
+
+# 추론 결과 저장 + confidence score 기준 status 자동 변경 함수
+def apply_inference_results(db: Session, image: Image, inference_result: List[BoundingBox]):
+    image_id, camera_id, file_path, captured_at = image.image_id, image.camera_id, image.file_path, image.date  # 커밋 후 재조회 방지
+    save_inference_results(db, image_id, [r.dict() for r in inference_result])
+
+    if inference_result:  # 추론 결과가 존재하면
+        min_confidence = min(r.confidence for r in inference_result)
+        if decide_status(inference_result) == "completed":
+            image.status = "completed"
+            add_image_contributions(db, [image.image_id])  # 같은 트랜잭션에서 일별 집계 반영
+            touch_images(db, [image.image_id])
+            db.commit()
+            print(f"✅ 이미지 status 'completed'로 자동 업데이트됨 (min_confidence={min_confidence:.3f})")
+        else:
+            print(f"ℹ️ min_confidence={min_confidence:.3f} < {AUTO_COMPLETE_CONFIDENCE} → status 변경 없음")
+
+    # 커밋이 끝난 탐지 결과를 실시간 피드에 1회 publish
+    defect_feed.publish(image_id, camera_id, file_path, captured_at, [r.class_name for r in inference_result])
+
+
+# 프레임 전체 디코딩 (잘리거나 손상된 프레임은 여기서 예외), JPEG/PNG만 허용
+def _decode_frame(frame: bytes) -> PILImage.Image:
+    try:
+        image = PILImage.open(io.BytesIO(frame))
+        image_format = (image.format or "").lower()
+        if image_format not in IMAGE_FORMAT_TYPES:
+            raise ValueError(f"지원하지 않는 이미지 포맷입니다: {image_format or 'unknown'} (JPEG/PNG만 가능)")
+        return image.convert("RGB")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"프레임 디코딩 실패: {e}") from e
+
+
+# WebSocket으로 받은 프레임 묶음을 검증 → 업로드 → 일괄 추론 → 저장하는 함수
+# 반환: (정상 프레임 결과, [(배치 내 프레임 index, 오류 메시지)]) — 불량 프레임은 업로드/INSERT 없이 제외
+def process_frame_batch(db: Session, camera_id: int, frames: List[bytes]) -> Tuple[List[image_schema.ImageUploadResponse], List[Tuple[int, str]]]:
+    errors = []
+
+    # 1. 먼저 모든 프레임을 디코딩해 검증 (디코딩 결과는 추론 입력으로 재사용)
+    decoded = []
+    for index, frame in enumerate(frames):
+        try:
+            decoded.append((index, frame, _decode_frame(frame)))
+        except ValueError as e:
+            errors.append((index, str(e)))
+
+    # 2. 통과한 프레임만 S3 업로드 + width/height 추출
+    uploaded = []
+    for index, frame, source in decoded:
+        try:
+            uploaded.append((index, upload_bytes_to_s3(frame, camera_id), source))
+        except (ValueError, RuntimeError) as e:
+            errors.append((index, str(e)))
+    if not uploaded:
+        return [], sorted(errors)
+
+    # 3. 이미지 레코드 일괄 생성 (커밋 1회), 실패하면 업로드한 객체 정리
+    uploads = [upload for _, upload, _ in uploaded]
+    try:
+        images = image_crud.create_image_records(db, camera_id, uploads)
+    except Exception:
+        db.rollback()
+        for file_path, _, _ in uploads:
+            delete_stored_image(file_path)
+        raise
+    image_ids = [image.image_id for image in images]  # 이후 커밋/롤백으로 만료되어도 오류 메시지에 사용
+
+    # 4. 한 번의 모델 호출로 배치 추론 (이미지 레코드는 이미 커밋됨 → 실패해도 프레임별 오류로 알림)
+    try:
+        batch_results = run_inference_batch([source for _, _, source in uploaded], db)
+    except Exception as e:
+        db.rollback()
+        errors += [
+            (index, f"추론 실패 (이미지 {image_id}는 결과 없이 저장됨): {e}")
+            for (index, _, _), image_id in zip(uploaded, image_ids)
+        ]
+        return [], sorted(errors)
+
+    # 5. 추론 결과 저장 + status 자동 변경 (이미지별로 커밋되므로 실패한 이미지만 오류로 보고)
+    responses = []
+    for (index, _, _), image_id, image, inference_result in zip(uploaded, image_ids, images, batch_results):
+        try:
+            apply_inference_results(db, image, inference_result)
+        except Exception as e:
+            db.rollback()
+            errors.append((index, f"추론 결과 저장 실패 (이미지 {image_id}): {e}"))
+            continue
+        responses.append(image_schema.ImageUploadResponse(
+            image_id=image_id,
+            file_path=get_presigned_image_url(image.file_path),
+            date=image.date,
+            results=inference_result
+        ))
+
+    return responses, sorted(errors)
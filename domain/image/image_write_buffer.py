@@ -0,0 +1,171 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from os import getenv
+from typing import List, Optional
+from sqlalchemy import insert, select
+from database.database import SessionLocal
+from database.models import Image, Annotation
+from domain.annotation.annotation_rollup import add_image_contributions
+from domain.annotation.annotation_review import refresh_image_summaries
+from domain.annotation.annotation_feed import defect_feed
+
+
+# write-behind 설정 (기본 비활성화)
+WRITE_BUFFER_ENABLED = getenv("WRITE_BUFFER_ENABLED", "false").lower() == "true"
+WRITE_BUFFER_MAX_ROWS = int(getenv("WRITE_BUFFER_MAX_ROWS", "500"))  # 배치당 최대 어노테이션+이미지 행 수
+WRITE_BUFFER_MAX_DELAY_MS = int(getenv("WRITE_BUFFER_MAX_DELAY_MS", "5"))  # 첫 요청 이후 최대 대기 시간
+
+
+class _PendingWrite:
+    def __init__(self, image_row: dict, detections: List[dict]):
+        self.image_row = image_row
+        self.detections = detections
+        self.future: Future = Future()
+
+    @property
+    def row_count(self) -> int:
+        return 1 + len(self.detections)
+
+
+class DetectionWriteBuffer:
+    """
+    여러 업로드 요청의 Image/Annotation INSERT를 모아 한 트랜잭션으로 기록하는 group-commit 버퍼
+    - 첫 요청 이후 max_delay_ms 동안 또는 max_rows 행이 모일 때까지 수집
+    - 테이블별 multi-row INSERT 1회 + 커밋 1회로 flush
+    - 호출자는 자신의 배치가 커밋된 뒤에만 결과(image_id, date)를 받음
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_rows: int = WRITE_BUFFER_MAX_ROWS, max_delay_ms: int = WRITE_BUFFER_MAX_DELAY_MS):
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._queue: "queue.Queue[_PendingWrite]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="detection-write-buffer", daemon=True)
+        self._thread.start()
+
+    # 이미지 1건 + 탐지 결과를 버퍼에 넣고, 커밋 후 (image_id, date)를 돌려줄 Future 반환
+    def submit(self, image_row: dict, detections: List[dict]) -> Future:
+        pending = _PendingWrite(image_row, detections)
+        self._queue.put(pending)
+        return pending.future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]  # 첫 요청이 올 때까지 대기
+            try:
+                rows = batch[0].row_count
+                deadline = time.monotonic() + self.max_delay
+
+                while rows < self.max_rows:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    batch.append(pending)
+                    rows += pending.row_count
+
+                self._flush(batch)
+            except Exception as e:
+                # 어떤 예외도 스레드를 죽이지 않음 (죽으면 이후 submit()의 Future가 영영 끝나지 않음)
+                # 아직 결과를 받지 못한 요청만 실패 처리하고 다음 배치 계속
+                print(f"❌ write buffer flush 실패: {e}")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+    def _flush(self, batch: List[_PendingWrite]):
+        db = None
+        try:
+            db = self.session_factory()
+
+            # 1. Images multi-row INSERT
+            image_rows = [p.image_row for p in batch]
+            result = db.execute(insert(Image).values(image_rows))
+            first_image_id = result.lastrowid  # multi-row INSERT의 첫 번째 AUTO_INCREMENT 값
+
+            # 2. 생성된 image_id 매핑 (PK 범위 + 고유한 file_path로 조회)
+            created = db.execute(
+                select(Image.image_id, Image.file_path)
+                .where(Image.image_id >= first_image_id)
+                .where(Image.file_path.in_([row["file_path"] for row in image_rows]))
+            ).all()
+            image_ids = {row.file_path: row.image_id for row in created}
+            missing = [row["file_path"] for row in image_rows if row["file_path"] not in image_ids]
+            if missing:
+                raise RuntimeError(f"INSERT한 이미지를 찾지 못했습니다: {missing[:5]}")
+
+            # 3. Annotations multi-row INSERT
+            annotation_rows = [
+                {
+                    "image_id": image_ids[p.image_row["file_path"]],
+                    "class_id": det["class_id"],
+                    "conf_score": det["confidence"],
+                    "bounding_box": det["bounding_box"],
+                }
+                for p in batch
+                for det in p.detections
+            ]
+            if annotation_rows:
+                db.execute(insert(Annotation).values(annotation_rows))
+            refresh_image_summaries(db, image_ids.values())  # 검수 요약 (어노테이션이 없는 이미지도 0건으로 기록)
+
+            # 4. completed로 들어온 이미지는 같은 트랜잭션에서 일별 집계 반영
+            completed_ids = [image_ids[p.image_row["file_path"]] for p in batch if p.image_row["status"] == "completed"]
+            add_image_contributions(db, completed_ids)  # 집계가 바뀐 경우에만 응답 캐시 무효화
+
+            db.commit()
+        except Exception as e:
+            if db is not None:
+                db.rollback()
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+        finally:
+            if db is not None:
+                db.close()
+
+        # 5. 커밋이 끝난 뒤에만 호출자에게 응답 → 그 다음 실시간 피드 publish (피드 오류가 응답을 막지 않음)
+        for pending in batch:
+            row = pending.image_row
+            pending.future.set_result((image_ids[row["file_path"]], row["date"]))
+        for pending in batch:
+            row = pending.image_row
+            try:
+                defect_feed.publish(
+                    image_ids[row["file_path"]], row["camera_id"], row["file_path"], row["date"],
+                    [det["class_name"] for det in pending.detections]
+                )
+            except Exception as e:
+                print(f"⚠️ 실시간 피드 publish 실패 (image_id={image_ids[row['file_path']]}): {e}")
+
+
+_write_buffer: Optional[DetectionWriteBuffer] = None
+_write_buffer_lock = threading.Lock()
+
+
+# 업로드 경로에서 사용할 전역 버퍼 (처음 사용할 때 생성)
+def get_write_buffer() -> DetectionWriteBuffer:
+    global _write_buffer
+    with _write_buffer_lock:
+        if _write_buffer is None:
+            _write_buffer = DetectionWriteBuffer()
+        return _write_buffer
+
+
+# 버퍼에 넣을 이미지 행 생성 함수
+def build_image_row(file_path: str, camera_id: int, width: int, height: int, status: str, dataset_id: int = 0) -> dict:
+    return {
+        "file_path": file_path,
+        "camera_id": camera_id,
+        "dataset_id": dataset_id,
+        "width": width,
+        "height": height,
+        "status": status,
+        "date": datetime.utcnow(),
+    }
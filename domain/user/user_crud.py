@@ -3,6 +3,7 @@ from database.models import User, ApprovalStatusEnum, Annotation, Image
 from domain.user.user_schema import UserBase, UserUpdate, UserTypeFilterEnum, UserTypeEnum, WorkerOverviewFilter
 from typing import List, Optional
 from sqlalchemy import or_, func, cast, Date
+from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 
 
@@ -177,11 +178,11 @@ def get_worker_overview_with_filters(db: Session, filters: WorkerOverviewFilter)
     )
 
 
-    # 날짜 필터 (annotation 기준)
+    # 날짜 필터 (annotation 기준, 인덱스를 타도록 컬럼을 가공하지 않는 범위 조건으로 비교)
     if filters.start_date:
-        annotation_query = annotation_query.filter(cast(Annotation.date, Date) >= filters.start_date)
+        annotation_query = annotation_query.filter(Annotation.date >= datetime.combine(filters.start_date, datetime.min.time()))
     if filters.end_date:
-        annotation_query = annotation_query.filter(cast(Annotation.date, Date) <= filters.end_date)
+        annotation_query = annotation_query.filter(Annotation.date < datetime.combine(filters.end_date + timedelta(days=1), datetime.min.time()))
 
     # 사용자 필터
     if filters.user_id:
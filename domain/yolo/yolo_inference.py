@@ -1,7 +1,8 @@
 from typing import List
 from sqlalchemy.orm import Session  # DB 접근용
 from domain.yolo.yolo_schema import BoundingBox, Box  # Pydantic 모델 사용
-from domain.defect_class.defect_class_crud import get_class_name_by_id  # class_name 조회 함수
+from domain.defect_class.defect_class_crud import get_class_name_map  # class_id → class_name 조회 함수
+from utils.s3 import resolve_inference_source  # 로컬 저장소 경로 변환
 
 model = None
 
@@ -9,11 +10,8 @@ def _set_model(yolo):
     global model
     model = yolo
 
-def run_inference(image_path: str, db: Session) -> List[BoundingBox]:  # 반환 타입 명확하게 지정
-    if model is None:
-        raise RuntimeError("YOLO model not initialized. Call _set_model first.")
-
-    results = model(image_path, conf=0.365, imgsz=800)[0]
+# YOLO 결과 1건을 BoundingBox 리스트로 변환하는 함수
+def _to_detections(results, class_names: dict) -> List[BoundingBox]:
     detections = []
 
     if results.boxes is not None:
@@ -23,12 +21,11 @@ def run_inference(image_path: str, db: Session) -> List[BoundingBox]:  # 반환
 
         for box, score, class_id in zip(boxes, scores, class_ids):
             class_id_int = int(class_id)  # 명시적 int 변환
-            class_name = get_class_name_by_id(db, class_id_int)  # DB에서 클래스명 조회
 
             # dict가 아니라 BoundingBox 객체로 생성
             detection = BoundingBox(
                 class_id=class_id_int,  # YOLO가 출력한 class index
-                class_name=class_name,  #  클래스 이름
+                class_name=class_names.get(class_id_int, "unknown"),  #  클래스 이름
                 confidence=float(score),  # 예측 확률
                 bounding_box=Box(
                     x_center=float(box[0]),
@@ -39,4 +36,22 @@ def run_inference(image_path: str, db: Session) -> List[BoundingBox]:  # 반환
             )
             detections.append(detection)
 
-    return detections  # Pydantic 모델 리스트 반환
\ No newline at end of file
+    return detections
+
+def run_inference(image_path: str, db: Session) -> List[BoundingBox]:  # 반환 타입 명확하게 지정
+    if model is None:
+        raise RuntimeError("YOLO model not initialized. Call _set_model first.")
+
+    results = model(resolve_inference_source(image_path), conf=0.365, imgsz=800)[0]
+    return _to_detections(results, get_class_name_map(db))  # Pydantic 모델 리스트 반환
+
+# 여러 프레임을 한 번의 모델 호출로 추론하는 함수 (스트리밍 수집용)
+def run_inference_batch(sources: list, db: Session) -> List[List[BoundingBox]]:
+    if model is None:
+        raise RuntimeError("YOLO model not initialized. Call _set_model first.")
+    if not sources:
+        return []
+
+    results = model(sources, conf=0.365, imgsz=800)
+    class_names = get_class_name_map(db)  # 배치당 1회만 조회
+    return [_to_detections(r, class_names) for r in results]
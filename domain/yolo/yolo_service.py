@@ -2,6 +2,8 @@
 
 from sqlalchemy.orm import Session
 from database.models import Image, Annotation
+from domain.annotation.annotation_rollup import remove_image_contributions
+from domain.annotation.annotation_review import refresh_image_summaries
 
 
 def save_inference_results(db: Session, image_id: int, detections: list):
@@ -11,6 +13,10 @@ def save_inference_results(db: Session, image_id: int, detections: list):
     if image is None:
         raise ValueError(f"Image with ID {image_id} does not exist.")
 
+    # 이미 completed였던 이미지라면 일별 집계에서 먼저 차감
+    if image.status == "completed":
+        remove_image_contributions(db, [image_id])
+
     image.status = "pending"
     db.commit()
 
@@ -25,5 +31,6 @@ def save_inference_results(db: Session, image_id: int, detections: list):
         )
         db.add(ann)
 
+    refresh_image_summaries(db, [image_id])  # 검수 요약도 같은 트랜잭션에서 갱신
     db.commit()
     return image_id
\ No newline at end of file
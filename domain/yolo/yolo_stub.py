@@ -0,0 +1,46 @@
+# domain/yolo_stub.py
+
+import random
+import time
+from os import getenv
+import numpy as np
+
+# 부하 테스트용 YOLO 대체 모델 (YOLO_MODEL=stub)
+# 실제 추론 없이 설정한 지연 시간만큼 대기 후 임의의 박스를 반환
+YOLO_STUB_LATENCY_MS = float(getenv("YOLO_STUB_LATENCY_MS", "30"))  # 이미지 1장당 추론 시간
+YOLO_STUB_MAX_BOXES = int(getenv("YOLO_STUB_MAX_BOXES", "3"))
+# 생성할 class_id 목록 (DefectClasses에 존재하는 id여야 어노테이션 저장이 가능)
+YOLO_STUB_CLASS_IDS = [int(c) for c in getenv("YOLO_STUB_CLASS_IDS", "1,2,3,4").split(",")]
+
+
+class _Tensor:
+    # ultralytics 결과의 .cpu().numpy() 호출 형태를 흉내내는 래퍼
+    def __init__(self, array: np.ndarray):
+        self._array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self) -> np.ndarray:
+        return self._array
+
+
+class _Boxes:
+    def __init__(self, count: int):
+        self.xywhn = _Tensor(np.random.uniform(0.05, 0.95, size=(count, 4)).astype(np.float32))
+        self.conf = _Tensor(np.random.uniform(0.4, 0.99, size=count).astype(np.float32))
+        self.cls = _Tensor(np.random.choice(YOLO_STUB_CLASS_IDS, size=count).astype(np.float32))
+
+
+class _Result:
+    def __init__(self):
+        self.boxes = _Boxes(random.randint(0, YOLO_STUB_MAX_BOXES))
+
+
+class StubYOLO:
+    names = {class_id: f"class_{class_id}" for class_id in YOLO_STUB_CLASS_IDS}
+
+    def __call__(self, source, conf: float = 0.25, imgsz: int = 640):
+        sources = source if isinstance(source, list) else [source]
+        time.sleep(YOLO_STUB_LATENCY_MS * len(sources) / 1000)
+        return [_Result() for _ in sources]
@@ -4,11 +4,13 @@ from domain.annotation import annotation_router
 from domain.defect_class import defect_class_router
 from domain.admin.admin_router import router as admin_router
 from domain.image.image_router import router as image_router
+from domain.analytics.analytics_router import router as analytics_router
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from ultralytics import YOLO
 from domain.yolo.yolo_inference import _set_model
 from domain.yolo.yolo_router import router as yolo_router
+from os import getenv
 
 app = FastAPI()
 
@@ -25,7 +27,12 @@ app.add_middleware(
 @app.on_event("startup")
 async def load_model():
     try:
-        app.state.yolo_model = YOLO("best.pt")
+        model_path = getenv("YOLO_MODEL", "best.pt")
+        if model_path == "stub":  # 부하 테스트용 대체 모델
+            from domain.yolo.yolo_stub import StubYOLO
+            app.state.yolo_model = StubYOLO()
+        else:
+            app.state.yolo_model = YOLO(model_path)
         _set_model(app.state.yolo_model)
     except Exception as e:
         print(f"[ERROR] YOLO 모델 로드 실패: {e}")
@@ -37,6 +44,7 @@ app.include_router(annotation_router.router)
 app.include_router(defect_class_router.router)
 app.include_router(admin_router)
 app.include_router(image_router)
+app.include_router(analytics_router)
 
 # 🔹 정적 파일 서빙 (upload.html 등)
 app.mount("/static", StaticFiles(directory="static"), name="static")
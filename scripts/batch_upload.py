@@ -5,6 +5,7 @@ from domain.image import image_crud
 from utils.s3 import upload_local_file_to_s3
 import os
 from domain.annotation import annotation_crud
+from domain.annotation.annotation_rollup import add_image_contributions
 from domain.yolo.yolo_inference import _set_model, run_inference
 from ultralytics import YOLO
 
@@ -68,6 +69,11 @@ def upload_dummy_images():
                     confidence=box.confidence
                 )
 
+            # 5. completed 이미지는 일별 결함 집계에 반영
+            if status == "completed":
+                add_image_contributions(db, [image.image_id])
+                db.commit()
+
             print(f"✅ 완료: {file_name} (ID: {image.image_id}, 추론 결과: {len(boxes)}개, status: {status})")
 
         except Exception as e:
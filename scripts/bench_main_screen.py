@@ -0,0 +1,107 @@
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from database.database import SessionLocal
+from database.models import Image, annotator_camera_association
+from domain.annotation import annotation_crud
+from domain.annotation.annotation_schema import MainScreenPageRequest
+
+
+# 메인 화면 첫 페이지 지연시간 벤치마크: 백로그가 커져도 첫 페이지 비용이 일정한지 확인
+# - 작업자에게 할당된 카메라에 검수 대상 이미지를 단계별로 추가하며 첫 페이지(limit) / 전체 목록 조회 시간을 측정
+# - 실제 DB에 벤치마크용 행을 쓰고, 끝나면 삭제함 (file_path가 bench/main/로 시작)
+# 사용법: python -m scripts.bench_main_screen --user-id 3 --sizes 1000 10000 100000
+
+SEED_CHUNK = 5000
+BENCH_DATASET_ID = 987655
+
+
+def seed_backlog(db, camera_ids: list, start: int, count: int):
+    now = datetime.utcnow()
+    for offset in range(start, start + count, SEED_CHUNK):
+        size = min(SEED_CHUNK, start + count - offset)
+        db.execute(insert(Image).values([
+            {
+                "file_path": f"bench/main/{offset + i}.jpg",
+                "camera_id": random.choice(camera_ids),
+                "dataset_id": BENCH_DATASET_ID,
+                "status": "pending",
+                "width": 640,
+                "height": 640,
+                "date": now - timedelta(seconds=random.randint(0, 60 * 60 * 24 * 90)),
+                # 검수 요약을 직접 채움 (어노테이션 쓰기 경로에서 갱신되는 값과 같은 형태)
+                "active_annotation_count": 1,
+                "min_conf_score": round(random.uniform(0.3, 0.74), 3),
+                "needs_review": True,
+                "review_boxes": [{
+                    "bounding_box": {"x_center": 0.5, "y_center": 0.5, "w": 0.1, "h": 0.1},
+                    "class_name": "bench",
+                    "class_color": "#FF0000",
+                    "is_active": True,
+                }],
+            }
+            for i in range(size)
+        ]))
+        db.commit()
+
+
+def measure(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def cleanup(db):
+    deleted = db.query(Image).filter(Image.dataset_id == BENCH_DATASET_ID).delete(synchronize_session=False)
+    db.commit()
+    print(f"🗑 벤치마크 이미지 {deleted}건 삭제")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메인 화면 첫 페이지 지연시간 벤치마크")
+    parser.add_argument("--user-id", type=int, required=True, help="카메라가 할당된 작업자")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="누적 백로그 크기")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-full", action="store_true", help="전체 목록 조회(기존 API) 측정 생략")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        camera_ids = db.execute(
+            select(annotator_camera_association.c.camera_id)
+            .where(annotator_camera_association.c.user_id == args.user_id)
+        ).scalars().all()
+        if not camera_ids:
+            raise SystemExit("할당된 카메라가 있는 작업자를 지정해야 합니다.")
+
+        request = MainScreenPageRequest(limit=args.limit)
+        print(f"{'backlog':>10} {'first page':>12} {'second page':>12} {'full list':>12}")
+
+        seeded = 0
+        for size in sorted(args.sizes):
+            seed_backlog(db, camera_ids, seeded, size - seeded)
+            seeded = size
+
+            first = annotation_crud.get_main_page(db, args.user_id, request)
+            second_request = MainScreenPageRequest(limit=args.limit, cursor=first["next_cursor"])
+            first_ms = measure(lambda: annotation_crud.get_main_page(db, args.user_id, request), args.repeat)
+            second_ms = measure(lambda: annotation_crud.get_main_page(db, args.user_id, second_request), args.repeat)
+            full_ms = None if args.skip_full else measure(
+                lambda: annotation_crud.get_main_data_filtered(db, args.user_id), max(1, args.repeat // 10)
+            )
+            full = "-" if full_ms is None else f"{full_ms:10.1f}ms"
+            print(f"{size:>10} {first_ms:10.1f}ms {second_ms:10.1f}ms {full:>12}")
+    finally:
+        cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import gzip
+import json
+import random
+import time
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+from typing import List
+from domain.annotation.annotation_schema import ImageSummary
+from utils import fast_response
+from utils.fast_response import RawJSON, encode_json
+
+
+# 메인 화면 목록 응답 직렬화 비교 (DB 없이 합성 데이터로 측정)
+# - 이미지 1,000건당 CPU ms와 전송 바이트(무압축 / gzip / br)
+# - legacy: 박스 JSON 파싱 + class_color 주입 + ImageSummary 생성 + response_model 재검증 + json.dumps
+# - fast: RawJSON 그대로 orjson(없으면 json) 인코딩, msgpack: Accept: application/msgpack 경로
+# 사용법: python -m scripts.bench_serialization --images 5000 --boxes 4
+
+COLORS = {"scratch": "#FF0000", "dent": "#00FF00", "crack": "#0000FF", "stain": "#FFFF00"}
+
+
+def make_rows(images: int, boxes: int) -> list:
+    rows = []
+    for image_id in range(1, images + 1):
+        box_list = [
+            {
+                "bounding_box": {"x_center": random.random(), "y_center": random.random(), "w": random.uniform(0.01, 0.2), "h": random.uniform(0.01, 0.2)},
+                "class_name": name,
+                "class_color": COLORS[name],
+                "is_active": True,
+            }
+            for name in random.choices(list(COLORS), k=boxes)
+        ]
+        rows.append({
+            "camera_id": random.randint(1, 8),
+            "image_id": image_id,
+            "file_path": f"https://bucket.s3.amazonaws.com/images/{image_id}.jpg?X-Amz-Signature={'a' * 64}",
+            "width": 1920,
+            "height": 1080,
+            "confidence": round(random.uniform(0.3, 0.74), 3),
+            "count": boxes,
+            "status": "pending",
+            "review_boxes": json.dumps(box_list),  # DB에서 읽은 JSON 문자열
+        })
+    return rows
+
+
+def legacy(rows: list) -> bytes:
+    items = []
+    for row in rows:
+        boxes = json.loads(row["review_boxes"])
+        for box in boxes:
+            box["class_color"] = COLORS[box["class_name"]]
+        items.append(ImageSummary(
+            camera_id=row["camera_id"], image_id=row["image_id"], file_path=row["file_path"],
+            confidence=row["confidence"], count=row["count"], status=row["status"],
+            width=row["width"], height=row["height"], bounding_boxes=boxes
+        ))
+    validated = parse_obj_as(List[ImageSummary], [item.dict() for item in items])  # response_model 재검증
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def fast_items(rows: list) -> list:
+    return [
+        {**{k: v for k, v in row.items() if k != "review_boxes"}, "bounding_boxes": RawJSON(row["review_boxes"])}
+        for row in rows
+    ]
+
+
+def measure(label: str, encode, rows: list, repeat: int):
+    started = time.process_time()
+    for _ in range(repeat):
+        body = encode(rows)
+    cpu_ms = (time.process_time() - started) * 1000 / repeat / len(rows) * 1000
+
+    sizes = [len(body), len(gzip.compress(body, compresslevel=fast_response.FAST_RESPONSE_GZIP_LEVEL))]
+    if fast_response.brotli is not None:
+        sizes.append(len(fast_response.brotli.compress(body, quality=fast_response.FAST_RESPONSE_BROTLI_QUALITY)))
+    per_1000 = [size * 1000 // len(rows) for size in sizes]
+    br = f"{per_1000[2]:>10}" if len(per_1000) > 2 else f"{'-':>10}"
+    print(f"{label:<16} {cpu_ms:10.1f} {per_1000[0]:>10} {per_1000[1]:>10} {br}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메인 화면 목록 응답 직렬화 벤치마크")
+    parser.add_argument("--images", type=int, default=5000)
+    parser.add_argument("--boxes", type=int, default=4, help="이미지당 박스 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.images, args.boxes)
+    print(f"encoder: {'orjson' if fast_response.orjson else 'json'}, msgpack: {'yes' if fast_response.msgpack else 'no'}, brotli: {'yes' if fast_response.brotli else 'no'}")
+    print(f"{'path':<16} {'CPU ms/1k':>10} {'bytes/1k':>10} {'gzip/1k':>10} {'br/1k':>10}")
+
+    measure("legacy", legacy, rows, args.repeat)
+    measure("fast json", lambda r: encode_json(fast_items(r)), rows, args.repeat)
+    if fast_response.msgpack_available():
+        measure("fast msgpack", lambda r: fast_response.encode_msgpack(fast_items(r)), rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
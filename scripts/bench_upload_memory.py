@@ -0,0 +1,137 @@
+import argparse
+import io
+import struct
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from threading import Barrier
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+import boto3
+from botocore.awsrequest import AWSResponse
+from PIL import Image as PILImage
+from utils import s3
+
+
+# 업로드 경로별 최대 메모리 사용량 비교 벤치마크
+# 사용법: python -m scripts.bench_upload_memory --concurrency 50 --frame-mb 8
+# - 개선 방식은 실제 utils.s3.upload_image_to_s3 (upload_fileobj + upload_transfer_config)를 그대로 실행
+# - S3 클라이언트는 네트워크 대신 before-send 훅에서 요청 본문을 청크 단위로 읽고 버리는 sink 클라이언트로 교체
+#   (PutObject / 멀티파트 생성·파트 업로드·완료 응답만 흉내냄)
+
+BENCH_BUCKET = "bench-bucket"
+SINK_READ_SIZE = 64 * 1024
+
+
+SPOOL_MAX_SIZE = 1024 * 1024  # Starlette UploadFile과 동일한 spool 기준
+
+
+# 헤더 파싱이 가능한 합성 JPEG 생성 (SOI + SOF0 + SOS + 더미 스캔 데이터)
+def make_synthetic_jpeg(size_bytes: int, width: int = 3840, height: int = 2160) -> bytes:
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 17, 8, height, width, 3) + b"\x01\x22\x00\x02\x11\x01\x03\x11\x01"
+    sos = b"\xff\xda" + struct.pack(">HB", 12, 3) + b"\x01\x00\x02\x11\x03\x11\x00\x3f\x00"
+    header = b"\xff\xd8" + sof0 + sos
+    body = b"\x55" * max(size_bytes - len(header) - 2, 0)
+    return header + body + b"\xff\xd9"
+
+
+class _SinkBody:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def stream(self, **kwargs):
+        yield self.content
+
+
+# 요청 본문을 끝까지 읽고(전송 흉내) 작업별 최소 응답을 돌려주는 before-send 훅
+def _sink_response(request, **kwargs):
+    body = request.body
+    if hasattr(body, "read"):
+        while body.read(SINK_READ_SIZE):
+            pass
+
+    query = parse_qs(urlsplit(request.url).query, keep_blank_values=True)
+    if "uploads" in query:
+        content = f"<InitiateMultipartUploadResult><Bucket>{BENCH_BUCKET}</Bucket><Key>bench</Key><UploadId>bench</UploadId></InitiateMultipartUploadResult>"
+    elif "uploadId" in query and request.method == "POST":
+        content = f'<CompleteMultipartUploadResult><Bucket>{BENCH_BUCKET}</Bucket><Key>bench</Key><ETag>"bench"</ETag></CompleteMultipartUploadResult>'
+    else:
+        content = ""
+    return AWSResponse(request.url, 200, {"ETag": '"bench"'}, _SinkBody(content.encode()))
+
+
+def make_sink_client():
+    client = boto3.client(
+        "s3", region_name="us-east-1", aws_access_key_id="bench", aws_secret_access_key="bench"
+    )
+    client.meta.events.register("before-send.s3", _sink_response)
+    return client
+
+
+def make_upload_spool(frame: bytes) -> SpooledTemporaryFile:
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    spool.write(frame)
+    spool.seek(0)
+    return spool
+
+
+# 기존 방식: 전체 읽기 → PIL 열기 → BytesIO 복사본을 기본 설정으로 업로드
+def legacy_upload(spool) -> tuple[int, int]:
+    file_bytes = spool.read()
+    image = PILImage.open(io.BytesIO(file_bytes))
+    width, height = image.size
+    s3.s3_client.upload_fileobj(io.BytesIO(file_bytes), BENCH_BUCKET, "legacy.jpg", ExtraArgs={"ContentType": "image/jpeg"})
+    return width, height
+
+
+# 개선 방식: 실제 업로드 함수 (헤더 probe → spool에서 upload_transfer_config로 스트리밍)
+def streaming_upload(spool) -> tuple[int, int]:
+    upload = SimpleNamespace(filename="frame.jpg", file=spool, content_type="image/jpeg")  # UploadFile에서 사용하는 속성만
+    _, width, height = s3.upload_image_to_s3(upload, camera_id=0)
+    return width, height
+
+
+def measure(upload_fn, frame: bytes, concurrency: int) -> float:
+    spools = [make_upload_spool(frame) for _ in range(concurrency)]
+    barrier = Barrier(concurrency)
+
+    def worker(spool):
+        barrier.wait()  # 모든 업로드가 동시에 진행되도록 맞춤
+        return upload_fn(spool)
+
+    tracemalloc.start()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, spools))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        for spool in spools:
+            spool.close()
+
+    return peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 경로 메모리 벤치마크")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--frame-mb", type=float, default=8.0)
+    args = parser.parse_args()
+
+    # 업로드 함수가 sink 클라이언트와 벤치 버킷을 사용하도록 교체 (청크 크기는 S3_UPLOAD_CHUNK_SIZE 설정을 따름)
+    s3.s3_client = make_sink_client()
+    s3.S3_BUCKET = BENCH_BUCKET
+    s3.STORAGE_BACKEND = "s3"
+
+    frame = make_synthetic_jpeg(int(args.frame_mb * 1024 * 1024))
+    chunk_mb = s3.UPLOAD_CHUNK_SIZE / (1024 * 1024)
+
+    print(f"📦 프레임 {args.frame_mb}MB x 동시 업로드 {args.concurrency}건 (청크 {chunk_mb:.1f}MB)")
+    legacy_peak = measure(legacy_upload, frame, args.concurrency)
+    print(f"기존 방식 peak: {legacy_peak:8.1f} MB")
+    streaming_peak = measure(streaming_upload, frame, args.concurrency)
+    print(f"스트리밍 peak: {streaming_peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from database.database import SessionLocal
+from database.models import Image
+from domain.image import image_crud
+from domain.image.image_write_buffer import DetectionWriteBuffer, build_image_row
+from domain.yolo.yolo_service import save_inference_results
+
+
+# 업로드당 개별 커밋 vs write-behind group commit 처리량 비교 벤치마크
+# 사용법: python -m scripts.bench_write_buffer --camera-id 1 --uploads 2000 --workers 32
+# 실제 DB에 벤치마크용 행을 쓰고, 끝나면 삭제함 (file_path가 bench/로 시작)
+
+
+def make_detections(count: int, class_ids: list) -> list:
+    return [
+        {
+            "class_id": random.choice(class_ids),
+            "confidence": random.uniform(0.4, 0.99),
+            "bounding_box": {
+                "x_center": random.random(),
+                "y_center": random.random(),
+                "w": random.uniform(0.01, 0.2),
+                "h": random.uniform(0.01, 0.2),
+            },
+        }
+        for _ in range(count)
+    ]
+
+
+# 기존 방식: 이미지 INSERT 커밋 + 상태 커밋 + 어노테이션 커밋
+def per_request_upload(camera_id: int, detections: list):
+    db = SessionLocal()
+    try:
+        image = image_crud.create_image_record(
+            db=db,
+            file_path=f"bench/{uuid.uuid4()}.jpg",
+            camera_id=camera_id,
+            width=1920,
+            height=1080,
+        )
+        save_inference_results(db, image.image_id, detections)
+    finally:
+        db.close()
+
+
+def run(label: str, upload_fn, uploads: int, workers: int, detections_per_image: int, class_ids: list):
+    payloads = [make_detections(detections_per_image, class_ids) for _ in range(uploads)]
+    rows = uploads * (1 + detections_per_image)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(upload_fn, payloads))
+    elapsed = time.perf_counter() - started
+
+    print(f"{label:<14} {uploads}건 / {rows}행  {elapsed:7.2f}s  →  {rows / elapsed:10.0f} rows/s")
+
+
+def cleanup():
+    db = SessionLocal()
+    try:
+        # Annotations는 ON DELETE CASCADE로 함께 삭제됨
+        deleted = db.query(Image).filter(Image.file_path.like("bench/%")).delete(synchronize_session=False)
+        db.commit()
+        print(f"🗑 벤치마크 이미지 {deleted}건 삭제")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="탐지 결과 INSERT 처리량 벤치마크")
+    parser.add_argument("--camera-id", type=int, required=True)
+    parser.add_argument("--class-ids", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--uploads", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--detections", type=int, default=3, help="이미지당 탐지 개수")
+    parser.add_argument("--max-rows", type=int, default=500)
+    parser.add_argument("--max-delay-ms", type=int, default=5)
+    args = parser.parse_args()
+
+    run(
+        "per-request",
+        lambda dets: per_request_upload(args.camera_id, dets),
+        args.uploads, args.workers, args.detections, args.class_ids,
+    )
+
+    buffer = DetectionWriteBuffer(max_rows=args.max_rows, max_delay_ms=args.max_delay_ms)
+
+    def buffered_upload(dets):
+        row = build_image_row(f"bench/{uuid.uuid4()}.jpg", args.camera_id, 1920, 1080, "pending")
+        buffer.submit(row, dets).result()  # 커밋 완료까지 대기 (실제 업로드 경로와 동일)
+
+    run(
+        f"buffered({args.max_rows}/{args.max_delay_ms}ms)",
+        buffered_upload,
+        args.uploads, args.workers, args.detections, args.class_ids,
+    )
+
+    cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import time
+from database.database import SessionLocal
+from domain.analytics.analytics_snapshot import ANALYTICS_DIR, SNAPSHOT_CHUNK_SIZE, build_snapshot
+
+
+# 분석용 컬럼형 스냅샷 생성 (/analytics/* API가 조회하는 Parquet 파일)
+# 사용 예:
+#   python -m scripts.build_analytics_snapshot              # 1회 생성 (cron 등록용)
+#   python -m scripts.build_analytics_snapshot --every 60   # 60분마다 반복 생성
+def main():
+    parser = argparse.ArgumentParser(description="분석용 컬럼형 스냅샷 생성")
+    parser.add_argument("--dir", default=ANALYTICS_DIR)
+    parser.add_argument("--chunk-size", type=int, default=SNAPSHOT_CHUNK_SIZE)
+    parser.add_argument("--every", type=float, help="반복 주기(분)")
+    args = parser.parse_args()
+
+    while True:
+        db = SessionLocal()
+        try:
+            meta = build_snapshot(db, args.dir, args.chunk_size)
+            print(f"✅ 스냅샷 생성: 이미지 {meta['images']}건, 어노테이션 {meta['annotations']}건 ({meta['build_seconds']}초)")
+        except Exception as e:
+            print(f"❌ 스냅샷 생성 실패: {e}")
+            if not args.every:
+                raise
+        finally:
+            db.close()
+
+        if not args.every:
+            break
+        time.sleep(args.every * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import sys
+from sqlalchemy import event, select
+from database.database import SessionLocal, engine
+from database.models import Image
+from domain.annotation import annotation_crud
+
+
+# 배치 조회의 쿼리 수 회귀 검사 (N+1 방지)
+# - 배치 크기를 늘려가며 실행 중 발생한 쿼리 수를 세고, 크기와 관계없이 같아야 통과 (다르면 exit 1)
+# 사용법: python -m scripts.check_query_count --sizes 1 10 100
+
+
+def count_queries(run) -> int:
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    return len(statements)
+
+
+# (이름, 배치 크기 → 실행 함수) 목록
+def batch_queries(db, image_ids: list):
+    return [
+        ("annotation_details", lambda size: annotation_crud.get_annotation_details_by_image_ids(db, image_ids[:size])),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 조회 쿼리 수 회귀 검사")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    failed = False
+    try:
+        image_ids = db.execute(
+            select(Image.image_id).order_by(Image.image_id.desc()).limit(max(args.sizes))
+        ).scalars().all()
+        if len(image_ids) < max(args.sizes):
+            print(f"⚠️ 이미지가 {len(image_ids)}건뿐이라 일부 배치 크기는 실제보다 작게 실행됨")
+
+        for name, run in batch_queries(db, image_ids):
+            counts = {size: count_queries(lambda: run(size)) for size in args.sizes}
+            constant = len(set(counts.values())) == 1
+            failed |= not constant
+            summary = ", ".join(f"{size}건={count}" for size, count in counts.items())
+            print(f"{'✅' if constant else '❌'} {name}: {summary}")
+    finally:
+        db.close()
+
+    if failed:
+        print("\n🚨 배치 크기에 따라 쿼리 수가 늘어나는 조회가 있습니다 (N+1).")
+        sys.exit(1)
+    print("\n✅ 모든 배치 조회의 쿼리 수가 일정합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import argparse
+import random
+import sys
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, insert, select, text
+from database.database import SessionLocal, engine
+from database.models import Annotation, Camera, DefectClass, Image, annotator_camera_association
+from domain.annotation import annotation_crud
+from domain.annotation.annotation_schema import DefectDataFilter, MainScreenPageRequest
+from domain.annotation.annotation_stats import get_defect_time_series
+from domain.user.user_crud import get_worker_overview_with_filters
+from domain.user.user_schema import WorkerOverviewFilter
+
+
+# 주요 조회 쿼리 실행계획(EXPLAIN) 회귀 검사
+# - 실제 crud 함수를 실행하면서 발생한 SELECT를 가로채 같은 파라미터로 EXPLAIN
+# - 대용량 테이블(Images, Annotations)에 full scan(type=ALL)이 있으면 실패(exit 1)
+# - --seed N: 검사 전에 합성 이미지 N건 + 어노테이션을 넣고 ANALYZE, 끝나면 삭제 (운영 DB에서 실행 금지)
+# 사용법:
+#   python -m scripts.migrate_schema
+#   python -m scripts.check_query_plans --seed 200000
+
+LARGE_TABLES = {"Images", "Annotations"}
+SEED_DATASET_ID = 987654  # 합성 데이터 표시용 dataset_id
+SEED_CHUNK = 5000
+
+
+def seed_dataset(db, image_count: int):
+    camera_ids = [row.camera_id for row in db.query(Camera.camera_id).all()]
+    class_ids = [row.class_id for row in db.query(DefectClass.class_id).all()]
+    if not camera_ids or not class_ids:
+        raise RuntimeError("카메라와 결함 클래스가 1개 이상 있어야 합니다.")
+
+    now = datetime.utcnow()
+    for offset in range(0, image_count, SEED_CHUNK):
+        size = min(SEED_CHUNK, image_count - offset)
+        db.execute(insert(Image).values([
+            {
+                "file_path": f"seed/{offset + i}.jpg",
+                "camera_id": random.choice(camera_ids),
+                "dataset_id": SEED_DATASET_ID,
+                "status": random.choice(("pending", "completed")),
+                "width": 640,
+                "height": 640,
+                "date": now - timedelta(minutes=random.randint(0, 60 * 24 * 365)),
+            }
+            for i in range(size)
+        ]))
+        image_ids = db.execute(
+            select(Image.image_id)
+            .where(Image.dataset_id == SEED_DATASET_ID)
+            .where(Image.file_path.in_([f"seed/{offset + i}.jpg" for i in range(size)]))
+        ).scalars().all()
+        db.execute(insert(Annotation).values([
+            {
+                "image_id": image_id,
+                "class_id": random.choice(class_ids),
+                "conf_score": round(random.random(), 3),
+                "bounding_box": {"x_center": 0.5, "y_center": 0.5, "w": 0.1, "h": 0.1},
+                "date": now - timedelta(minutes=random.randint(0, 60 * 24 * 365)),
+                "is_active": random.random() > 0.1,
+            }
+            for image_id in image_ids
+            for _ in range(random.randint(1, 3))
+        ]))
+        db.commit()
+
+    db.execute(text("ANALYZE TABLE Images, Annotations"))
+    print(f"🌱 합성 데이터 {image_count}건 생성")
+
+
+def remove_seed(db):
+    # Annotations는 ON DELETE CASCADE로 함께 삭제
+    db.query(Image).filter(Image.dataset_id == SEED_DATASET_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+# 주요 조회 (이름, 실행 함수) 목록
+def hot_queries(db):
+    today = date.today()
+    week_ago = today - timedelta(days=6)
+    assigned_user = db.execute(select(annotator_camera_association.c.user_id).limit(1)).scalar()
+
+    queries = [
+        ("realtime_check", lambda: annotation_crud.get_recent_defect_checks(db, limit=10)),
+        ("defect_data_list_by_period", lambda: annotation_crud.get_filtered_defect_data_list(
+            db, DefectDataFilter(start_date=week_ago, end_date=today)
+        )),
+        ("defect_data_first_page", lambda: annotation_crud.get_defect_data_page(db, DefectDataFilter(), limit=50)),
+        ("worker_overview_by_period", lambda: get_worker_overview_with_filters(
+            db, WorkerOverviewFilter(start_date=week_ago, end_date=today)
+        )),
+        ("timeseries_hourly", lambda: get_defect_time_series(
+            db, start_date=today - timedelta(days=365), end_date=today, granularity="hour", group_by="class"
+        )),
+    ]
+    if assigned_user is not None:
+        queries.append(("main_screen", lambda: annotation_crud.get_main_data_filtered(db, assigned_user)))
+        queries.append(("main_screen_first_page", lambda: annotation_crud.get_main_page(db, assigned_user, MainScreenPageRequest())))
+        queries.append(("main_screen_priority_page", lambda: annotation_crud.get_main_page(db, assigned_user, MainScreenPageRequest(order="priority"))))
+    else:
+        print("⚠️ 카메라가 할당된 작업자가 없어 main_screen 검사는 건너뜀")
+    return queries
+
+
+# 함수 실행 중 발생한 SELECT 문과 파라미터 수집
+def capture_selects(run):
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    return captured
+
+
+def explain(statement: str, parameters) -> list:
+    with engine.connect() as conn:
+        result = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        return [dict(row._mapping) for row in result]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주요 조회 쿼리 실행계획 회귀 검사")
+    parser.add_argument("--seed", type=int, default=0, help="검사 전에 생성할 합성 이미지 수")
+    parser.add_argument("--keep-seed", action="store_true", help="검사 후 합성 데이터 유지")
+    parser.add_argument("--verbose", action="store_true", help="모든 EXPLAIN 행 출력")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    failures = []
+    try:
+        if args.seed:
+            seed_dataset(db, args.seed)
+
+        for name, run in hot_queries(db):
+            for statement, parameters in capture_selects(run):
+                for row in explain(statement, parameters):
+                    table, access, key = row.get("table"), row.get("type"), row.get("key")
+                    if args.verbose:
+                        print(f"  [{name}] {table}: type={access} key={key} rows={row.get('rows')} extra={row.get('Extra')}")
+                    if table in LARGE_TABLES and access == "ALL":
+                        failures.append((name, table, row.get("rows"), statement))
+            print(f"✅ {name}" if not any(f[0] == name for f in failures) else f"❌ {name}")
+    finally:
+        if args.seed and not args.keep_seed:
+            remove_seed(db)
+        db.close()
+
+    if failures:
+        print("\n🚨 full scan 발견:")
+        for name, table, rows, statement in failures:
+            print(f"- [{name}] {table} (예상 {rows}행)\n  {' '.join(statement.split())[:300]}")
+        sys.exit(1)
+    print("\n✅ 모든 주요 쿼리가 인덱스를 사용합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import select, text
+from database.database import SessionLocal
+from database.models import Image
+from domain.annotation.annotation_main import get_assigned_camera_ids
+from domain.annotation.annotation_queue import QUEUE_ORDERS, claim_images, release_leases
+
+
+# 작업 큐 동시 임대 검사
+# - 작업자 수만큼 스레드가 동시에 claim을 반복하고, 같은 이미지가 두 작업자에게 임대되지 않았는지 확인 (중복 시 exit 1)
+# - claim 1회 지연(ms)과 읽은 행 수(Handler_read_*)의 p50/p95 출력 → 백로그 크기와 무관하게 일정해야 함
+# - --live-leases N: 시작 전에 --lease-holder 사용자가 정렬 순 상위 N건을 임대한 상태로 만듦
+#   → 유효한 리스가 큐 앞쪽에 쌓여 있어도 claim이 읽는 행 수가 N에 비례하지 않아야 함 (p95가 N 이상이면 exit 1)
+# - 끝나면 이번 검사에서 임대한 리스는 모두 반납
+# 사용법:
+#   python -m scripts.check_work_queue --users 3 4 5 --rounds 20 --count 10
+#   python -m scripts.check_work_queue --users 3 4 5 --live-leases 5000 --lease-holder 2
+
+
+# 현재 세션이 지금까지 읽은 인덱스/테이블 행 수 (SHOW SESSION STATUS의 Handler_read_* 합계)
+def rows_read(db) -> int:
+    rows = db.execute(text("SHOW SESSION STATUS LIKE 'Handler_read%'")).all()
+    return sum(int(value) for _, value in rows)
+
+
+# 작업자들의 카메라에서 정렬 순 상위 count건을 holder가 임대한 상태로 만듦, 임대한 image_id 목록 반환
+def hold_leases(holder: int, camera_ids: list, count: int, order: str) -> list:
+    columns, descending = QUEUE_ORDERS[order]
+    db = SessionLocal()
+    try:
+        image_ids = db.execute(
+            select(Image.image_id)
+            .where(
+                Image.camera_id.in_(camera_ids),
+                Image.needs_review == True,
+                Image.status == "pending",
+                Image.lease_expires_at.is_(None)
+            )
+            .order_by(*([column.desc() for column in columns] if descending else columns))
+            .limit(count)
+        ).scalars().all()
+        if image_ids:
+            db.query(Image).filter(Image.image_id.in_(image_ids)).update(
+                {Image.lease_user_id: holder, Image.lease_expires_at: datetime.utcnow() + timedelta(hours=1)},
+                synchronize_session=False
+            )
+        db.commit()
+        return image_ids
+    finally:
+        db.close()
+
+
+def worker(user_id: int, rounds: int, count: int, order: str, claimed: dict, latencies: list, reads: list):
+    db = SessionLocal()
+    try:
+        camera_ids = get_assigned_camera_ids(db, user_id)
+        for _ in range(rounds):
+            started = time.perf_counter()
+            before = rows_read(db)
+            image_ids = claim_images(db, user_id, camera_ids, count, order)
+            reads.append(rows_read(db) - before)
+            db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+            claimed[user_id].update(image_ids)
+    finally:
+        db.close()
+
+
+def _percentiles(values: list):
+    values = sorted(values)
+    return values[len(values) // 2], values[min(len(values) - 1, int(len(values) * 0.95))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 큐 동시 임대 검사")
+    parser.add_argument("--users", type=int, nargs="+", required=True, help="카메라가 할당된 작업자 user_id 목록 (같은 id를 여러 번 주지 말 것)")
+    parser.add_argument("--rounds", type=int, default=20, help="작업자당 claim 횟수")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--order", default="confidence")
+    parser.add_argument("--live-leases", type=int, default=0, help="시작 전에 만들어 둘 다른 사용자의 유효한 리스 수")
+    parser.add_argument("--lease-holder", type=int, default=None, help="--live-leases를 임대할 user_id (--users에 없는 사용자)")
+    args = parser.parse_args()
+    if args.live_leases and (args.lease_holder is None or args.lease_holder in args.users):
+        parser.error("--live-leases에는 --users에 없는 --lease-holder가 필요합니다.")
+
+    held = []
+    if args.live_leases:
+        db = SessionLocal()
+        try:
+            camera_ids = sorted({camera_id for user_id in args.users for camera_id in get_assigned_camera_ids(db, user_id)})
+        finally:
+            db.close()
+        held = hold_leases(args.lease_holder, camera_ids, args.live_leases, args.order)
+        print(f"유효한 리스 {len(held)}건 생성 (user {args.lease_holder})")
+
+    claimed = {user_id: set() for user_id in args.users}
+    latencies, reads = [], []
+    threads = [
+        threading.Thread(target=worker, args=(user_id, args.rounds, args.count, args.order, claimed, latencies, reads))
+        for user_id in args.users
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    owners = Counter(image_id for image_ids in claimed.values() for image_id in image_ids)
+    duplicated = sorted(image_id for image_id, owner_count in owners.items() if owner_count > 1)
+    stolen = sorted(owners.keys() & set(held))  # 유효한 리스를 다른 작업자가 가져감
+
+    reads_p95 = None
+    if latencies:
+        p50, p95 = _percentiles(latencies)
+        print(f"claim {len(latencies)}회: p50 {p50:.1f}ms, p95 {p95:.1f}ms")
+        reads_p50, reads_p95 = _percentiles(reads)
+        print(f"claim 1회 읽은 행 수: p50 {reads_p50}, p95 {reads_p95}")
+    for user_id, image_ids in claimed.items():
+        print(f"  user {user_id}: {len(image_ids)}건 임대")
+
+    db = SessionLocal()
+    try:
+        for user_id, image_ids in claimed.items():
+            release_leases(db, user_id, list(image_ids))
+        if held:
+            release_leases(db, args.lease_holder, held)
+        db.commit()
+    finally:
+        db.close()
+
+    failed = False
+    if duplicated:
+        print(f"\n🚨 두 명 이상에게 임대된 이미지: {duplicated[:20]}")
+        failed = True
+    if stolen:
+        print(f"\n🚨 유효한 리스가 걸린 이미지를 다른 작업자가 임대함: {stolen[:20]}")
+        failed = True
+    if held and reads_p95 is not None and reads_p95 >= len(held):
+        print(f"\n🚨 claim이 읽은 행 수(p95 {reads_p95})가 유효한 리스 수({len(held)}) 이상 → 리스 걸린 행을 훑고 있음")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("\n✅ 중복 임대 없음" + (f", 유효한 리스 {len(held)}건과 무관하게 읽은 행 수 일정" if held else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import sys
+import time
+from datetime import date
+from database.database import SessionLocal
+from domain.annotation.annotation_export import EXPORT_FORMATS, EXPORT_CHUNK_SIZE, export_defect_records, parquet_available
+from domain.annotation.annotation_schema import DefectDataFilter
+
+
+# 결함 레코드 내보내기 CLI (API와 같은 스트리밍 경로, 메모리는 청크 크기만큼만 사용)
+# 사용 예:
+#   python -m scripts.export_defects --format csv --output defects.csv
+#   python -m scripts.export_defects --format parquet --start 2025-01-01 --end 2025-06-30 --class-id 1 2 --output defects.parquet
+def main():
+    parser = argparse.ArgumentParser(description="결함 레코드 내보내기")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--output", help="출력 파일 (미지정 시 표준 출력)")
+    parser.add_argument("--start", type=date.fromisoformat, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="종료 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--class-id", type=int, nargs="+", dest="class_ids")
+    parser.add_argument("--camera-id", type=int, nargs="+", dest="camera_ids")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.format == "parquet" and not parquet_available():
+        sys.exit("❌ parquet 내보내기에는 pyarrow 설치가 필요합니다. (pip install pyarrow)")
+    if bool(args.start) != bool(args.end):
+        sys.exit("❌ --start와 --end는 함께 지정해야 합니다.")
+
+    filters = DefectDataFilter(
+        start_date=args.start,
+        end_date=args.end,
+        class_ids=args.class_ids,
+        camera_ids=args.camera_ids
+    )
+
+    db = SessionLocal()
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    started = time.perf_counter()
+    written = 0
+    try:
+        for data in export_defect_records(db, filters, args.format, args.chunk_size):
+            out.write(data)
+            written += len(data)
+    finally:
+        db.close()
+        if args.output:
+            out.close()
+
+    if args.output:
+        print(f"✅ 내보내기 완료: {args.output} ({written / 1024 / 1024:.1f}MB, {time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
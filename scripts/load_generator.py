@@ -0,0 +1,252 @@
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from scripts.bench_upload_memory import make_synthetic_jpeg
+
+
+# 다중 카메라 부하 생성기 + 종단 간 지연 측정
+# 서버는 로컬 저장소/대체 모델로 실행하는 것을 권장:
+#   STORAGE_BACKEND=local YOLO_MODEL=stub uvicorn main:app
+# 사용 예:
+#   python -m scripts.load_generator --cameras 1 2 3 --fps 2 --duration 30
+#   python -m scripts.load_generator --cameras 1 2 3 4 --ramp 1,2,4,8,16 --slo-ms 1000
+# 전송은 응답과 무관하게 고정 간격 타이머로 예약(open-loop)하고, 지연은 예약 시각부터 측정
+# → 서버가 밀려 요청이 대기하는 시간도 포함됨 (coordinated omission 방지)
+
+
+_SERVER_TIMING_PATTERN = re.compile(r"([\w-]+);dur=([\d.]+)")
+
+
+class LatencyRecorder:
+    """단계별/종단 간 지연(ms), 오류, 처리량 기록"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)  # stage → [ms]
+        self.errors = defaultdict(int)  # 오류 종류 → 건수
+        self.sent = 0
+        self.succeeded = 0
+        self.lag_ms = []  # 예정 시각 대비 실제 전송 시작 지연 (타이머 지연 + 동시 요청 한도 대기)
+
+    def record(self, total_ms: float, stages: dict, error: str | None, lag_ms: float):
+        with self.lock:
+            self.sent += 1
+            self.lag_ms.append(lag_ms)
+            if error:
+                self.errors[error] += 1
+                return
+            self.succeeded += 1
+            self.samples["end_to_end"].append(total_ms)
+            for stage, duration in stages.items():
+                self.samples[stage].append(duration)
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(p / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+# 로그 스케일 버킷 히스토그램 (ms)
+def histogram(values: list, bounds=(5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)) -> list:
+    counts = [0] * (len(bounds) + 1)
+    for value in values:
+        for i, bound in enumerate(bounds):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={b}ms" for b in bounds] + [f">{bounds[-1]}ms"]
+    return list(zip(labels, counts))
+
+
+def parse_server_timing(header: str) -> dict:
+    return {name: float(duration) for name, duration in _SERVER_TIMING_PATTERN.findall(header or "")}
+
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    # 전송 스레드별 세션 (requests.Session은 스레드 간 공유 불가)
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+# 프레임 1건 업로드, 지연은 예약 시각(scheduled_at) 기준
+def send_frame(base_url: str, camera_id: int, frame: bytes, scheduled_at: float, recorder: LatencyRecorder, timeout: float):
+    lag_ms = max(0.0, (time.perf_counter() - scheduled_at) * 1000)
+    error = None
+    stages = {}
+    try:
+        response = _session().post(
+            f"{base_url}/images/upload",
+            files={"file": (f"capture_{camera_id}.jpg", frame, "image/jpeg")},
+            data={"camera_id": camera_id},
+            timeout=timeout,
+        )
+        if response.status_code != 200:
+            error = f"HTTP {response.status_code}"
+        else:
+            stages = parse_server_timing(response.headers.get("Server-Timing"))
+    except requests.Timeout:
+        error = "timeout"
+    except requests.RequestException as e:
+        error = type(e).__name__
+    total_ms = (time.perf_counter() - scheduled_at) * 1000
+    recorder.record(total_ms, stages, error, lag_ms)
+
+
+# 카메라 1대: 응답을 기다리지 않고 고정 간격(open-loop)으로 프레임 전송을 예약
+# - 이전 요청이 끝나지 않았어도 다음 프레임은 예정 시각에 전송 (동시 요청은 max_inflight까지, 초과분은 대기 후 전송)
+def camera_worker(base_url: str, camera_id: int, fps: float, duration: float, frame: bytes, recorder: LatencyRecorder, timeout: float, max_inflight: int):
+    interval = 1.0 / fps
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+        tick = 0
+        while True:
+            scheduled_at = started + tick * interval
+            if scheduled_at - started >= duration:
+                break
+            now = time.perf_counter()
+            if now < scheduled_at:
+                time.sleep(scheduled_at - now)
+            executor.submit(send_frame, base_url, camera_id, frame, scheduled_at, recorder, timeout)
+            tick += 1
+        # with 블록 종료 시 진행 중인 요청이 끝날 때까지 대기
+
+
+def run_step(args, camera_ids: list, frame: bytes) -> dict:
+    recorder = LatencyRecorder()
+    threads = [
+        threading.Thread(
+            target=camera_worker,
+            args=(args.url, camera_id, args.fps, args.duration, frame, recorder, args.timeout, args.max_inflight),
+            daemon=True,
+        )
+        for camera_id in camera_ids
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stage_stats = {}
+    for stage, values in recorder.samples.items():
+        values.sort()
+        stage_stats[stage] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+            "histogram": histogram(values),
+        }
+
+    offered = len(camera_ids) * args.fps
+    return {
+        "cameras": len(camera_ids),
+        "offered_rps": offered,
+        "achieved_rps": recorder.succeeded / elapsed if elapsed else 0.0,
+        "sent": recorder.sent,
+        "succeeded": recorder.succeeded,
+        "error_rate": (recorder.sent - recorder.succeeded) / recorder.sent if recorder.sent else 0.0,
+        "errors": dict(recorder.errors),
+        "max_send_lag_ms": max(recorder.lag_ms, default=0.0),
+        "stages": stage_stats,
+    }
+
+
+def print_step(result: dict, show_histogram: bool):
+    print(
+        f"\n📷 카메라 {result['cameras']}대 | 목표 {result['offered_rps']:.1f} req/s | "
+        f"처리 {result['achieved_rps']:.1f} req/s | 오류율 {result['error_rate'] * 100:.2f}% {result['errors'] or ''}"
+    )
+    print(f"{'stage':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, stats in sorted(result["stages"].items(), key=lambda item: item[0] != "end_to_end"):
+        print(f"{stage:<16}{stats['count']:>8}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>10.1f}")
+    if show_histogram and "end_to_end" in result["stages"]:
+        for label, count in result["stages"]["end_to_end"]["histogram"]:
+            print(f"  {label:>10} {count:>7} {'#' * min(count, 60)}")
+
+
+# 포화 판정: 처리량이 목표에 못 미치거나, p95가 SLO 초과, 또는 오류율 초과
+def is_saturated(result: dict, slo_ms: float, max_error_rate: float) -> str | None:
+    p95 = result["stages"].get("end_to_end", {}).get("p95", float("inf"))
+    if result["error_rate"] > max_error_rate:
+        return f"오류율 {result['error_rate'] * 100:.2f}% > {max_error_rate * 100:.2f}%"
+    if p95 > slo_ms:
+        return f"p95 {p95:.0f}ms > SLO {slo_ms:.0f}ms"
+    if result["achieved_rps"] < result["offered_rps"] * 0.95:
+        return f"처리량 {result['achieved_rps']:.1f} < 목표의 95% ({result['offered_rps']:.1f})"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 카메라 업로드 부하 생성기")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--cameras", type=int, nargs="+", required=True, help="사용할 camera_id 목록 (활성 카메라여야 함)")
+    parser.add_argument("--fps", type=float, default=1.0, help="카메라당 초당 프레임 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--image", help="업로드할 이미지 파일 (미지정 시 합성 JPEG, 실제 모델에는 실제 이미지 필요)")
+    parser.add_argument("--frame-kb", type=int, default=300, help="합성 JPEG 크기")
+    parser.add_argument("--ramp", help="카메라 수 단계 (예: 1,2,4,8) — 포화 지점 탐색")
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="종단 간 p95 목표")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-inflight", type=int, default=64, help="카메라당 최대 동시 요청 수 (초과분은 클라이언트에서 대기하며 지연에 포함)")
+    parser.add_argument("--histogram", action="store_true", help="종단 간 지연 히스토그램 출력")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            frame = f.read()
+    else:
+        frame = make_synthetic_jpeg(args.frame_kb * 1024)
+
+    # 카메라 수 단계 구성 (camera_id 목록을 순환 사용)
+    if args.ramp:
+        steps = [int(n) for n in args.ramp.split(",")]
+    else:
+        steps = [len(args.cameras)]
+
+    results = []
+    saturation = None
+    for count in steps:
+        camera_ids = [args.cameras[i % len(args.cameras)] for i in range(count)]
+        result = run_step(args, camera_ids, frame)
+        results.append(result)
+        print_step(result, args.histogram)
+
+        reason = is_saturated(result, args.slo_ms, args.max_error_rate)
+        if args.ramp and reason:
+            saturation = {"cameras": count, "offered_rps": result["offered_rps"], "reason": reason}
+            break
+
+    if args.ramp:
+        if saturation:
+            last_ok = results[-2]["cameras"] if len(results) > 1 else 0
+            print(f"\n🚨 포화 지점: 카메라 {saturation['cameras']}대 ({saturation['reason']}) → 안정 구간 최대 {last_ok}대")
+        else:
+            print(f"\n✅ 카메라 {steps[-1]}대까지 포화 없음")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"steps": results, "saturation": saturation}, f, indent=2, ensure_ascii=False)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from database.database import engine, Base
+import database.models  # noqa: F401 — 모델을 metadata에 등록
+
+
+# models.py 기준으로 DB 스키마를 맞추는 간단한 마이그레이션
+# - 없는 테이블 생성
+# - 기존 테이블에 없는 컬럼 추가 (ALTER TABLE ... ADD COLUMN)
+# - 없는 인덱스 생성
+# - 다른 인덱스로 대체된 인덱스 삭제 (OBSOLETE_INDEXES)
+# 사용법: python -m scripts.migrate_schema
+
+# 테이블별로 더 이상 쓰지 않는 인덱스 (새 인덱스를 만든 뒤 삭제)
+OBSOLETE_INDEXES = {
+    "Images": [  # → ix_images_lease_queue_* (lease_expires_at 포함)
+        "ix_images_queue_confidence",
+        "ix_images_queue_date",
+        "ix_images_queue_priority",
+    ],
+}
+
+
+def migrate_schema():
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    # 1. 새 테이블 생성
+    new_tables = [t for t in Base.metadata.sorted_tables if t.name not in existing_tables]
+    if new_tables:
+        Base.metadata.create_all(engine, tables=new_tables)
+        for table in new_tables:
+            print(f"✅ 테이블 생성: {table.name}")
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        # 2. 누락된 컬럼 추가
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        with engine.begin() as conn:
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE `{table.name}` ADD COLUMN {column_ddl}"))
+                print(f"✅ 컬럼 추가: {table.name}.{column.name}")
+
+        # 3. 누락된 인덱스 생성
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(engine)
+                print(f"✅ 인덱스 생성: {table.name}.{index.name}")
+
+        # 4. 대체된 인덱스 삭제
+        with engine.begin() as conn:
+            for index_name in OBSOLETE_INDEXES.get(table.name, []):
+                if index_name in existing_indexes:
+                    conn.execute(text(f"DROP INDEX `{index_name}` ON `{table.name}`"))
+                    print(f"✅ 인덱스 삭제: {table.name}.{index_name}")
+
+
+if __name__ == "__main__":
+    migrate_schema()
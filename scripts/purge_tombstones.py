@@ -0,0 +1,23 @@
+import argparse
+from sqlalchemy.orm import Session
+from database.database import SessionLocal
+from domain.annotation.annotation_sync import TOMBSTONE_RETENTION_DAYS, purge_tombstones
+
+
+# 보관 기간이 지난 삭제 기록(ImageTombstones) 정리 (cron 등으로 주기 실행)
+# 정리된 기록보다 오래된 메인 화면 변경분 cursor는 다음 호출에서 reset=True를 받음
+# 사용법:
+#   python -m scripts.purge_tombstones
+#   python -m scripts.purge_tombstones --retention-days 14
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="삭제 기록 정리")
+    parser.add_argument("--retention-days", type=int, default=TOMBSTONE_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        count = purge_tombstones(db, args.retention_days)
+        db.commit()
+        print(f"✅ {args.retention_days}일 지난 삭제 기록 {count}건 정리 완료")
+    finally:
+        db.close()
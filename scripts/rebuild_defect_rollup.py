@@ -0,0 +1,14 @@
+from sqlalchemy.orm import Session
+from database.database import SessionLocal
+from domain.annotation.annotation_rollup import rebuild_defect_rollup
+
+
+# 일별/시간별 결함 집계 테이블(DefectDailyRollups, DefectHourlyRollups) 재생성 (집계 불일치 복구용)
+# 사용법: python -m scripts.rebuild_defect_rollup
+if __name__ == "__main__":
+    db: Session = SessionLocal()
+    try:
+        rows = rebuild_defect_rollup(db)
+        print(f"✅ 결함 집계 재생성 완료: 일별 {rows}행")
+    finally:
+        db.close()
@@ -0,0 +1,28 @@
+import argparse
+from sqlalchemy.orm import Session
+from database.database import SessionLocal
+from domain.annotation.annotation_review import rebuild_review_summaries, refresh_camera_priorities
+
+
+# 이미지별 검수 요약 컬럼(Images.active_annotation_count, min_conf_score, needs_review, review_boxes, review_priority) 재계산
+# 컬럼 추가 직후 백필 또는 불일치 복구용, --camera-id는 라인 가중치(Cameras.review_weight) 변경 후 해당 카메라만 재계산
+# 사용법:
+#   python -m scripts.migrate_schema
+#   python -m scripts.rebuild_review_summary
+#   python -m scripts.rebuild_review_summary --camera-id 3
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검수 요약 재계산")
+    parser.add_argument("--camera-id", type=int, default=None)
+    args = parser.parse_args()
+
+    db: Session = SessionLocal()
+    try:
+        if args.camera_id is not None:
+            refresh_camera_priorities(db, args.camera_id)
+            db.commit()
+            print(f"✅ 카메라 {args.camera_id} 검수 우선순위 재계산 완료")
+        else:
+            count = rebuild_review_summaries(db)
+            print(f"✅ 검수 요약 재계산 완료: 검수 대상 이미지 {count}건")
+    finally:
+        db.close()
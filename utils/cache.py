@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Any, Callable, Hashable
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """
+    프로세스 내 공유 TTL 캐시
+    - 같은 키에 대한 동시 미스는 한 번만 계산 (나머지 요청은 결과를 기다림)
+    - invalidate()로 즉시 무효화 가능
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl = ttl_seconds
+        self._values: dict[Hashable, tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._generation = 0  # 무효화 시 증가 → 계산 중이던 이전 세대 결과는 저장하지 않음
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._values.get(key)
+            if cached and cached[1] > now:
+                return cached[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # 먼저 계산한 요청이 채워 두었는지 다시 확인
+            with self._lock:
+                cached = self._values.get(key)
+                if cached and cached[1] > time.monotonic():
+                    return cached[0]
+                generation = self._generation
+
+            value = compute()
+
+            with self._lock:
+                if generation == self._generation:
+                    self._values[key] = (value, time.monotonic() + self.ttl)
+            return value
+
+    def invalidate(self):
+        with self._lock:
+            self._values.clear()
+            self._generation += 1
+
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+# 현재 트랜잭션이 커밋된 뒤에 콜백 실행 (롤백되면 버려짐)
+def run_after_commit(db: Session, callback: Callable[[], None]):
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session):
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session: Session):
+    session.info.pop(_AFTER_COMMIT_KEY, None)
@@ -0,0 +1,110 @@
+import gzip
+import json
+from datetime import date, datetime
+from os import getenv
+from typing import Any, Optional, Tuple
+from fastapi import Request, Response
+
+
+# 대용량 목록 응답용 직렬화 경로
+# - response_model 검증/jsonable_encoder를 거치지 않고 dict/list를 바로 바이트로 인코딩 (Response를 반환하면 FastAPI가 재검증하지 않음)
+# - JSON: orjson(설치 시) → 표준 json 순, DB에서 읽은 JSON 문자열(RawJSON)은 orjson.Fragment로 다시 파싱하지 않고 그대로 삽입
+# - Accept: application/msgpack 요청은 MessagePack(msgpack 설치 시)으로 응답 (어노테이션 UI용)
+# - 본문이 FAST_RESPONSE_COMPRESS_MIN_BYTES 이상이면 Accept-Encoding에 따라 br(brotli 설치 시) / gzip 압축
+
+FAST_RESPONSE_COMPRESS_MIN_BYTES = int(getenv("FAST_RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+FAST_RESPONSE_GZIP_LEVEL = int(getenv("FAST_RESPONSE_GZIP_LEVEL", "5"))
+FAST_RESPONSE_BROTLI_QUALITY = int(getenv("FAST_RESPONSE_BROTLI_QUALITY", "4"))
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class RawJSON:
+    """DB에서 읽은 JSON 문자열을 파싱하지 않고 응답에 그대로 넣기 위한 표시"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def parse(self):
+        return json.loads(self.text)
+
+
+# 표준 json / msgpack용 변환 (RawJSON은 이 경로에서만 파싱)
+def _default(obj):
+    if isinstance(obj, RawJSON):
+        return obj.parse()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
+def _orjson_default(obj):
+    if isinstance(obj, RawJSON):
+        return orjson.Fragment(obj.text)
+    raise TypeError(f"직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
+def encode_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_orjson_default)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    return msgpack.packb(payload, default=_default, use_bin_type=True)
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _accepted_encodings(header: str) -> set:
+    encodings = set()
+    for part in header.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            encodings.add(name)
+    return encodings
+
+
+# 크기 기준 이상이면 클라이언트가 받는 방식으로 압축 → (본문, Content-Encoding)
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    if len(body) < FAST_RESPONSE_COMPRESS_MIN_BYTES:
+        return body, None
+    encodings = _accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        return brotli.compress(body, quality=FAST_RESPONSE_BROTLI_QUALITY), "br"
+    if "gzip" in encodings:
+        return gzip.compress(body, compresslevel=FAST_RESPONSE_GZIP_LEVEL), "gzip"
+    return body, None
+
+
+# 요청의 Accept / Accept-Encoding에 맞춰 인코딩 + 압축한 응답
+def fast_response(request: Request, payload: Any, status_code: int = 200) -> Response:
+    if msgpack is not None and MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        body, media_type = encode_msgpack(payload), MSGPACK_MEDIA_TYPE
+    else:
+        body, media_type = encode_json(payload), "application/json"
+
+    body, encoding = compress(body, request.headers.get("accept-encoding", ""))
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -0,0 +1,90 @@
+import struct
+from typing import BinaryIO
+from PIL import Image as PILImage
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# 이미지 크기 정보를 담고 있는 JPEG SOF 마커 (DHT=C4, JPG=C8, DAC=CC 제외)
+_JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+# 길이 필드가 없는 단독 마커 (TEM, RST0~RST7, SOI)
+_JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD9)}
+
+# 헤더 탐색 시 최대로 건너뛸 바이트 수 (EXIF 썸네일 등 포함)
+_MAX_HEADER_SCAN = 4 * 1024 * 1024
+
+
+def _probe_jpeg(fp: BinaryIO) -> tuple[int, int]:
+    scanned = 0
+    while scanned < _MAX_HEADER_SCAN:
+        byte = fp.read(1)
+        if not byte:
+            break
+        if byte != b"\xff":
+            scanned += 1
+            continue
+
+        # 0xFF 채움 바이트 건너뛰기
+        marker = fp.read(1)
+        while marker == b"\xff":
+            marker = fp.read(1)
+        if not marker:
+            break
+        code = marker[0]
+
+        if code in _JPEG_STANDALONE_MARKERS:
+            continue
+        if code == 0xD9:  # EOI
+            break
+
+        segment_length = struct.unpack(">H", fp.read(2))[0]
+        if code in _JPEG_SOF_MARKERS:
+            # precision(1) + height(2) + width(2)
+            _, height, width = struct.unpack(">BHH", fp.read(5))
+            return width, height
+
+        fp.seek(segment_length - 2, 1)  # 다음 세그먼트로 이동
+        scanned += segment_length + 2
+
+    raise ValueError("JPEG 헤더에서 이미지 크기를 찾지 못했습니다.")
+
+
+# 포맷 → (저장 확장자, Content-Type)
+IMAGE_FORMAT_TYPES = {
+    "jpeg": ("jpg", "image/jpeg"),
+    "png": ("png", "image/png"),
+}
+
+
+# 파일 전체를 읽지 않고 헤더만으로 (포맷, width, height)를 구하는 함수
+# 포맷은 매직 바이트 기준 "jpeg" / "png", 그 외는 PIL이 판별한 포맷 이름(소문자)
+def probe_image(fp: BinaryIO) -> tuple[str, int, int]:
+    start = fp.tell()
+    try:
+        head = fp.read(24)
+
+        # PNG: 시그니처 바로 뒤 IHDR 청크에 크기가 있음
+        if head[:8] == _PNG_SIGNATURE and head[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", head[16:24])
+            return "png", width, height
+
+        # JPEG: SOF 세그먼트까지 마커 단위로 건너뜀
+        if head[:2] == b"\xff\xd8":
+            fp.seek(start + 2)
+            return ("jpeg", *_probe_jpeg(fp))
+
+        # 그 외 포맷은 PIL의 지연 로딩으로 헤더만 파싱 (픽셀 디코딩 없음)
+        fp.seek(start)
+        with PILImage.open(fp) as image:
+            return (image.format or "").lower(), *image.size
+    finally:
+        fp.seek(start)  # 업로드를 위해 스트림 위치 복원
+
+
+# 헤더만으로 (width, height)를 구하는 함수
+def probe_image_size(fp: BinaryIO) -> tuple[int, int]:
+    _, width, height = probe_image(fp)
+    return width, height
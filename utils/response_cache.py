@@ -0,0 +1,162 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from functools import wraps
+from os import getenv
+from typing import Any, Callable, Iterable, Optional
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, parse_obj_as
+from sqlalchemy.orm import Session
+from utils.cache import run_after_commit
+
+
+# 대시보드/통계 응답 캐시
+# - 키: 엔드포인트 이름 + 정규화된 파라미터 + 오늘 날짜 (today/이번 주 같은 프리셋이 날짜가 바뀌면 자동 만료)
+# - 값: 직렬화가 끝난 JSON 바이트 → 적중 시 DB 조회/검증/직렬화 없이 바로 응답
+# - 무효화: 쓰기 경로가 커밋된 뒤 태그 단위로 삭제 (TTL은 태그가 누락된 경로에 대한 안전장치)
+
+RESPONSE_CACHE_ENABLED = getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = float(getenv("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+
+# 무효화 태그
+TAG_DEFECTS = "defects"  # 이미지/어노테이션/검수 상태 변경
+TAG_CLASSES = "classes"  # 결함 클래스 이름/색상/활성 여부 변경
+TAG_ASSIGNMENTS = "assignments"  # 작업자-카메라 할당 변경
+
+
+class _EndpointStats:
+    __slots__ = ("hits", "misses", "stores", "compute_ms")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.compute_ms = 0.0
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[bytes, tuple, float]] = {}  # key → (body, tags, expires_at)
+        self._tag_keys: dict[str, set] = defaultdict(set)
+        self._tag_versions: dict[str, int] = defaultdict(int)  # 계산 중 무효화된 결과를 저장하지 않기 위한 버전
+        self._stats: dict[str, _EndpointStats] = defaultdict(_EndpointStats)
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            stats = self._stats[key[0]]
+            if entry and entry[2] > time.monotonic():
+                stats.hits += 1
+                return entry[0]
+            stats.misses += 1
+            return None
+
+    def tag_versions(self, tags: Iterable[str]) -> tuple:
+        with self._lock:
+            return tuple(self._tag_versions[tag] for tag in tags)
+
+    def put(self, key: tuple, body: bytes, tags: tuple, versions: tuple, compute_ms: float):
+        with self._lock:
+            stats = self._stats[key[0]]
+            stats.compute_ms += compute_ms
+            if tuple(self._tag_versions[tag] for tag in tags) != versions:
+                return  # 계산하는 동안 무효화됨
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._evict_expired()
+                if len(self._entries) >= self.max_entries:
+                    return
+            self._entries[key] = (body, tags, time.monotonic() + self.ttl)
+            for tag in tags:
+                self._tag_keys[tag].add(key)
+            stats.stores += 1
+
+    def invalidate(self, *tags: str):
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] += 1
+                for key in self._tag_keys.pop(tag, ()):
+                    self._entries.pop(key, None)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, entry in self._entries.items() if entry[2] <= now]:
+            del self._entries[key]
+
+    # 엔드포인트별 적중률 지표
+    def stats(self) -> dict:
+        with self._lock:
+            endpoints = {}
+            for name, stats in self._stats.items():
+                lookups = stats.hits + stats.misses
+                endpoints[name] = {
+                    "hits": stats.hits,
+                    "misses": stats.misses,
+                    "hit_rate": round(stats.hits / lookups, 4) if lookups else 0.0,
+                    "avg_miss_ms": round(stats.compute_ms / stats.misses, 2) if stats.misses else 0.0,
+                }
+            return {"entries": len(self._entries), "endpoints": endpoints}
+
+
+response_cache = ResponseCache()
+
+
+# 쓰기 트랜잭션이 커밋된 뒤 태그 무효화 예약
+def invalidate_after_commit(db: Session, *tags: str):
+    run_after_commit(db, lambda: response_cache.invalidate(*tags))
+
+
+# 파라미터를 순서와 무관한 키로 정규화 (db 세션 등 요청별 객체는 제외)
+def _normalize(value: Any):
+    if isinstance(value, BaseModel):
+        return _normalize(value.dict())
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted((_normalize(v) for v in value), key=repr))
+    return value
+
+
+def _cache_key(name: str, kwargs: dict) -> tuple:
+    params = {k: v for k, v in kwargs.items() if not isinstance(v, (Session, Response))}
+    return name, _normalize(params), date.today().isoformat()
+
+
+def _json_response(body: bytes, status: str) -> Response:
+    return Response(content=body, media_type="application/json", headers={"X-Cache": status})
+
+
+# 동기 GET 엔드포인트용 응답 캐시 데코레이터
+# - response_model을 넘기면 미스 시 한 번만 검증/직렬화해 바이트로 저장
+def cached_endpoint(name: str, tags: Iterable[str], response_model: Any = None):
+    tags = tuple(tags)
+
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not RESPONSE_CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            key = _cache_key(name, kwargs)
+            body = response_cache.get(key)
+            if body is not None:
+                return _json_response(body, "HIT")
+
+            versions = response_cache.tag_versions(tags)
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            if response_model is not None:
+                result = parse_obj_as(response_model, result)
+            body = json.dumps(jsonable_encoder(result), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            response_cache.put(key, body, tags, versions, (time.perf_counter() - started) * 1000)
+            return _json_response(body, "MISS")
+
+        return wrapper
+
+    return decorator
@@ -3,10 +3,16 @@ import uuid
 from fastapi import UploadFile
 from os import getenv
 from dotenv import load_dotenv
-from PIL import Image as PILImage
-import io
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import BotoCoreError, ClientError  # 예외 처리용
 import unicodedata
+import io
+import os
+import shutil
+import threading
+import time
+from urllib.parse import urlparse
+from utils.image_probe import IMAGE_FORMAT_TYPES, probe_image, probe_image_size
 
 
 # .env 로딩
@@ -27,27 +33,115 @@ s3_client = boto3.client(
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
 )
 
+# 업로드 스트리밍 설정: 파트 크기 x 동시성 만큼만 메모리에 올라가도록 제한
+UPLOAD_CHUNK_SIZE = int(getenv("S3_UPLOAD_CHUNK_SIZE", str(5 * 1024 * 1024)))  # S3 최소 파트 크기 5MB
+upload_transfer_config = TransferConfig(
+    multipart_threshold=UPLOAD_CHUNK_SIZE,
+    multipart_chunksize=UPLOAD_CHUNK_SIZE,
+    max_concurrency=2,
+)
+
+# 저장소 설정: "s3"(기본) 또는 "local"(부하 테스트/로컬 개발용, static/uploads에 저장)
+STORAGE_BACKEND = getenv("STORAGE_BACKEND", "s3").lower()
+LOCAL_STORAGE_DIR = os.path.join("static", "uploads")
+LOCAL_STORAGE_URL_PREFIX = "/static/uploads/"
+
+
+# 로컬 저장소에 스트림을 청크 단위로 기록하고 URL 경로를 반환하는 함수
+def _save_to_local_storage(fileobj, key: str) -> str:
+    path = os.path.join(LOCAL_STORAGE_DIR, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, UPLOAD_CHUNK_SIZE)
+    return LOCAL_STORAGE_URL_PREFIX + key
+
+
+# 저장된 file_path를 모델 추론 입력(URL 또는 로컬 파일 경로)으로 변환하는 함수
+def resolve_inference_source(file_path: str) -> str:
+    if file_path.startswith(LOCAL_STORAGE_URL_PREFIX):
+        return os.path.join(LOCAL_STORAGE_DIR, file_path[len(LOCAL_STORAGE_URL_PREFIX):])
+    return file_path
+
+
+# presigned URL 설정
+USE_PRESIGNED_URLS = getenv("USE_PRESIGNED_URLS", "true").lower() == "true"
+PRESIGNED_URL_EXPIRES = int(getenv("PRESIGNED_URL_EXPIRES", "3600"))  # 초 단위 유효기간
+# 업로드된 이미지는 내용이 바뀌지 않으므로 브라우저가 장기간 캐시하도록 허용
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# S3 key → (presigned URL, 재사용 만료 시각) 메모이제이션
+_presigned_url_cache: dict[str, tuple[str, float]] = {}
+_presigned_url_lock = threading.Lock()
+_PRESIGNED_URL_CACHE_MAX = 50000
+
+
+# s3 key 추출 함수
+def extract_s3_key_from_url(url: str) -> str:
+    parsed_url = urlparse(url)
+    return parsed_url.path.lstrip("/")  # 버킷 이름 이후 경로만 추출
+
+
+# 저장된 file_path를 클라이언트용 presigned GET URL로 변환하는 함수
+def get_presigned_image_url(file_path: str) -> str:
+    # S3 URL이 아닌 경우(로컬 경로 등)는 그대로 반환
+    if not USE_PRESIGNED_URLS or not file_path or ".amazonaws.com/" not in file_path:
+        return file_path
+
+    key = extract_s3_key_from_url(file_path)
+    now = time.monotonic()
+
+    with _presigned_url_lock:
+        cached = _presigned_url_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]  # 같은 URL을 재사용해야 브라우저 캐시가 적중함
+
+    url = s3_client.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": S3_BUCKET,
+            "Key": key,
+            "ResponseCacheControl": IMAGE_CACHE_CONTROL,
+        },
+        ExpiresIn=PRESIGNED_URL_EXPIRES,
+    )
+
+    with _presigned_url_lock:
+        # 만료된 항목 정리 (캐시 크기 제한)
+        if len(_presigned_url_cache) >= _PRESIGNED_URL_CACHE_MAX:
+            for k in [k for k, (_, exp) in _presigned_url_cache.items() if exp <= now]:
+                del _presigned_url_cache[k]
+            if len(_presigned_url_cache) >= _PRESIGNED_URL_CACHE_MAX:
+                _presigned_url_cache.clear()
+        # 만료 직전의 URL을 내려주지 않도록 유효기간의 절반까지만 재사용
+        _presigned_url_cache[key] = (url, now + PRESIGNED_URL_EXPIRES / 2)
+
+    return url
+
 
 # 사진 업로드 함수
 def upload_image_to_s3(file: UploadFile, camera_id: int) -> tuple[str, int, int]:  # 반환 타입 tuple[str, int, int]
     ext = file.filename.split(".")[-1]
     key = f"{camera_id}/{uuid.uuid4()}.{ext}"  # S3 내부 저장 경로
 
-    # width, height 추출
-    file_bytes = file.file.read()
+    # width, height 추출 (헤더만 읽음)
+    file.file.seek(0)
     try:
-        image = PILImage.open(io.BytesIO(file_bytes))
-        width, height = image.size
+        width, height = probe_image_size(file.file)
     except Exception as e:
         raise ValueError("이미지 파일 열기에 실패했습니다.") from e
 
-    # S3 업로드
+    # 로컬 저장소 모드
+    if STORAGE_BACKEND == "local":
+        return _save_to_local_storage(file.file, key), width, height
+
+    # S3 업로드 (spool 임시 파일에서 청크 단위로 스트리밍)
     try:
         s3_client.upload_fileobj(
-            io.BytesIO(file_bytes),  # 다시 스트림 형태로 변환
+            file.file,
             S3_BUCKET,
             key,
-            ExtraArgs={"ContentType": file.content_type},
+            ExtraArgs={"ContentType": file.content_type, "CacheControl": IMAGE_CACHE_CONTROL},
+            Config=upload_transfer_config,
         )
     except (BotoCoreError, ClientError) as e:
         raise RuntimeError("S3 업로드에 실패했습니다.") from e
@@ -57,6 +151,48 @@ def upload_image_to_s3(file: UploadFile, camera_id: int) -> tuple[str, int, int]
     return url, width, height  # S3 URL, width, height 반환
 
 
+# 메모리에 있는 프레임(bytes)을 S3에 업로드하는 함수 (WebSocket 수집용)
+# 확장자/Content-Type은 매직 바이트로 판별한 포맷을 따름 (JPEG/PNG 외에는 ValueError)
+def upload_bytes_to_s3(data: bytes, camera_id: int) -> tuple[str, int, int]:
+    try:
+        image_format, width, height = probe_image(io.BytesIO(data))
+    except Exception as e:
+        raise ValueError("이미지 파일 열기에 실패했습니다.") from e
+    if image_format not in IMAGE_FORMAT_TYPES:
+        raise ValueError(f"지원하지 않는 이미지 포맷입니다: {image_format or 'unknown'} (JPEG/PNG만 가능)")
+
+    ext, content_type = IMAGE_FORMAT_TYPES[image_format]
+    key = f"{camera_id}/{uuid.uuid4()}.{ext}"
+
+    if STORAGE_BACKEND == "local":
+        return _save_to_local_storage(io.BytesIO(data), key), width, height
+
+    try:
+        s3_client.put_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=IMAGE_CACHE_CONTROL,
+        )
+    except (BotoCoreError, ClientError) as e:
+        raise RuntimeError("S3 업로드에 실패했습니다.") from e
+
+    url = f"https://{S3_BUCKET}.s3.{AWS_REGION}.amazonaws.com/{key}"
+    return url, width, height
+
+
+# 업로드한 이미지 삭제 (DB 저장 실패 시 정리용), 실패해도 예외를 올리지 않음
+def delete_stored_image(file_path: str):
+    try:
+        if file_path.startswith(LOCAL_STORAGE_URL_PREFIX):
+            os.remove(resolve_inference_source(file_path))
+        else:
+            s3_client.delete_object(Bucket=S3_BUCKET, Key=extract_s3_key_from_url(file_path))
+    except (OSError, BotoCoreError, ClientError) as e:
+        print(f"⚠️ 업로드 이미지 정리 실패: {file_path} ({e})")
+
+
 # 로컬 이미지 파일 경로를 받아 S3에 업로드하는 함수
 def upload_local_file_to_s3(file_path: str, camera_id: int):
     # 🔧 파일 이름에서 확장자 추출
@@ -69,16 +205,15 @@ def upload_local_file_to_s3(file_path: str, camera_id: int):
 
     # 🔧 파일 열기 및 이미지 크기 확인
     with open(file_path, "rb") as f:
-        file_bytes = f.read()
-        image = PILImage.open(io.BytesIO(file_bytes))
-        width, height = image.size
+        width, height = probe_image_size(f)
 
         # 🔧 S3 업로드
         s3_client.upload_fileobj(
-            io.BytesIO(file_bytes),
+            f,
             S3_BUCKET,
             key,
-            ExtraArgs={"ContentType": f"image/{ext}"}
+            ExtraArgs={"ContentType": f"image/{ext}", "CacheControl": IMAGE_CACHE_CONTROL},
+            Config=upload_transfer_config,
         )
 
     # 🔧 정적 URL 생성
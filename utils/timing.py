@@ -0,0 +1,23 @@
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    요청 처리 단계별 소요 시간 측정기
+    - Server-Timing 헤더(예: "storage;dur=12.3, inference;dur=40.1")로 내보내 부하 테스트에서 단계별 지연을 수집
+    """
+
+    def __init__(self):
+        self.stages: list[tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, (time.perf_counter() - started) * 1000))
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={duration:.1f}" for name, duration in self.stages)